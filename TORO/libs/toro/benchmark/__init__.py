@@ -0,0 +1,8 @@
+'''
+Created on 18.10.2026
+
+:Authors:
+         - Alex Bendrick
+'''
+from .generator import SystemGenerator
+from .suite import BenchmarkSuite
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Copyright Notice
+================
+Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+===========
+Generator of synthetic systems for benchmarking TORO. Systems are fully determined by a seed and the
+generator parameters: tasks are activated periodically using an automotive period distribution
+(cf. Kramer et al., "Real World Automotive Benchmarks For Free", WATERS 2015), execution times are
+distributed over the tasks of a resource by UUniFast, resources either follow the LET or the BET
+paradigm and cause-effect chains of a configurable length and maximum period ratio are formed from
+the tasks of one paradigm. Time values are given in microseconds.
+"""
+
+import math
+import random
+
+from pycpa import model
+from pycpa import schedulers
+
+from .. import model as toro_model
+
+Semantic = toro_model.Semantic
+
+
+## automotive periods (ms) and their shares of all periodic tasks
+automotive_periods = {1: 3, 2: 2, 5: 2, 10: 25, 20: 25, 50: 3, 100: 20, 200: 1, 1000: 4}
+
+## time units (microseconds) per millisecond
+ms = 1000
+
+
+
+class SystemGenerator(object):
+    """
+    This class generates random systems (pyCPA System with TORO extTasks and extEffectChains) from a seed.
+    """
+
+    ## maximum number of task sets drawn for a resource until a schedulable one is found
+    max_attempts = 100
+
+    def __init__(self, resources=2, tasks=10, utilization=0.5, chains=4, chain_length=4, max_period_ratio=None,
+                 let_share=0.5, offsets=True, known_wcrts=True, periods=None):
+        """
+        :param resources: int, number of resources
+        :param tasks: int, number of tasks per resource
+        :param utilization: float, utilization of each resource, at most 1 (tasks are scheduled rate-monotonically,
+                            i.e. utilizations up to ln(2) are always schedulable, unschedulable task sets are redrawn)
+        :param chains: int, number of cause-effect chains
+        :param chain_length: int, number of tasks of each chain, at least 2 (chains are shorter if there are not
+                             enough suitable tasks)
+        :param max_period_ratio: int, maximum ratio of the periods of consecutive tasks of a chain (None: any ratio)
+        :param let_share: float, share of LET resources and LET chains (0: BET only, 1: LET only)
+        :param offsets: bool, tasks are released with random offsets (otherwise all offsets are 0)
+        :param known_wcrts: bool, response times of BET tasks are determined by the generator (response time analysis
+                            for rate-monotonic scheduling), otherwise they have to be computed by pyCPA
+        :param periods: dict, periods (ms) -> shares (default: automotive_periods)
+        """
+        assert 0 < utilization <= 1, "Utilization %s of the resources is not within (0, 1]" % str(utilization)
+        assert chain_length >= 2, "Chains consist of at least 2 tasks"
+        self.resources = resources
+        self.tasks = tasks
+        self.utilization = utilization
+        self.chains = chains
+        self.chain_length = chain_length
+        self.max_period_ratio = max_period_ratio
+        self.let_share = let_share
+        self.offsets = offsets
+        self.known_wcrts = known_wcrts
+        self.periods = periods if periods is not None else automotive_periods
+
+
+    def parameters(self):
+        """ returns the generator parameters
+
+        :rtype: dict
+        """
+        return {'resources': self.resources, 'tasks': self.tasks, 'utilization': self.utilization, 'chains': self.chains,
+                'chain_length': self.chain_length, 'max_period_ratio': self.max_period_ratio, 'let_share': self.let_share,
+                'offsets': self.offsets, 'known_wcrts': self.known_wcrts}
+
+
+    def generate(self, seed):
+        """ generates a system. The same seed (and parameters) always lead to the same system.
+
+        :param seed: int
+        :rtype: pyCPA System object, list of TORO extEffectChain objects
+        """
+        rng = random.Random(seed)
+        system = model.System("bench_%d" % seed)
+
+        # resources follow one paradigm each, at least one resource of each paradigm if both are requested
+        semantics = [Semantic.LET if rng.random() < self.let_share else Semantic.BET for _ in range(self.resources)]
+        if (self.resources > 1) and (0 < self.let_share < 1) and (len(set(semantics)) == 1):
+            semantics[-1] = Semantic.BET if semantics[0] == Semantic.LET else Semantic.LET
+
+        tasks = {Semantic.LET: list(), Semantic.BET: list()}
+        for i, semantic in enumerate(semantics):
+            resource = system.bind_resource(model.Resource("core_%d" % i, schedulers.SPPScheduler()))
+            for task in self.__task_set(rng, i, semantic):
+                resource.bind_task(task)
+                tasks[semantic].append(task)
+
+        chains = list()
+        for i in range(self.chains):
+            semantic = Semantic.LET if rng.random() < self.let_share else Semantic.BET
+            if len(tasks[semantic]) == 0:
+                semantic = Semantic.BET if semantic == Semantic.LET else Semantic.LET
+            chain_tasks = self.__chain_tasks(rng, tasks[semantic])
+            chains.append(toro_model.extEffectChain("chain_%d" % i, chain_tasks))
+
+        return system, chains
+
+
+    def __task_set(self, rng, index, semantic):
+        """ generates the task set of a resource
+
+        :param rng: random.Random object
+        :param index: int, index of the resource
+        :param semantic: Semantic
+        :rtype: list of TORO extTasks
+        """
+        for _ in range(self.max_attempts):
+            periods, shares = zip(*sorted(self.periods.items()))
+            periods = [p * ms for p in rng.choices(periods, weights=shares, k=self.tasks)]
+
+            # UUniFast: utilizations of the tasks sum up to the utilization of the resource
+            utilizations = list()
+            remaining = self.utilization
+            for i in range(1, self.tasks):
+                next_remaining = remaining * rng.random() ** (1.0 / (self.tasks - i))
+                utilizations.append(remaining - next_remaining)
+                remaining = next_remaining
+            utilizations.append(remaining)
+
+            # rate-monotonic priorities (pyCPA SPP: smaller values denote higher priorities), ties broken by index
+            order = sorted(range(self.tasks), key=lambda k: (periods[k], k))
+            priorities = {k: p for p, k in enumerate(order)}
+
+            wcets = [max(1, int(round(u * p))) for u, p in zip(utilizations, periods)]
+            wcrts = self.__response_times(periods, wcets, order)
+            if wcrts is not None:
+                break
+        else:
+            raise ValueError("No schedulable task set with utilization %s found for resource %d after %d attempts"
+                             % (str(self.utilization), index, self.max_attempts))
+        bcets = [rng.randint(max(1, w // 2), w) for w in wcets]
+
+        tasks = list()
+        for k in range(self.tasks):
+            name = "T%d_%d" % (index, k)
+            if semantic == Semantic.LET:
+                let = rng.randint(wcets[k], periods[k])
+                offset = rng.randrange(0, periods[k] - let + 1) if self.offsets is True else 0
+                task = toro_model.extTask(name, offset, bcets[k], wcets[k], priorities[k], semantic, let=let)
+            else:
+                wcrt, bcrt = (wcrts[k], bcets[k]) if self.known_wcrts is True else (None, None)
+                offset = rng.randrange(0, periods[k] - wcrts[k] + 1) if self.offsets is True else 0
+                task = toro_model.extTask(name, offset, bcets[k], wcets[k], priorities[k], semantic, wcrt=wcrt, bcrt=bcrt)
+            task.in_event_model = model.PJdEventModel(P=periods[k])
+            tasks.append(task)
+        return tasks
+
+
+    @staticmethod
+    def __response_times(periods, wcets, order):
+        """ response time analysis for static priority preemptive scheduling (periodic tasks, implicit deadlines)
+
+        :param periods: list of ints
+        :param wcets: list of ints
+        :param order: list of task indices, highest priority first
+        :rtype: list of ints or None (a response time exceeds the period, the task set is not schedulable)
+        """
+        wcrts = [None] * len(periods)
+        for i, k in enumerate(order):
+            wcrt, previous = wcets[k], 0
+            while (wcrt != previous) and (wcrt <= periods[k]):
+                previous = wcrt
+                wcrt = wcets[k] + sum(int(math.ceil(previous / periods[j])) * wcets[j] for j in order[:i])
+            if wcrt > periods[k]:
+                return None
+            wcrts[k] = wcrt
+        return wcrts
+
+
+    def __chain_tasks(self, rng, candidates):
+        """ selects the tasks of a chain: a random walk over tasks that are not part of the chain yet,
+        consecutive tasks respect the maximum period ratio. If a walk ends before the chain length
+        is reached, the walk is restarted from another task and the longest walk is returned.
+
+        :param rng: random.Random object
+        :param candidates: list of TORO extTasks
+        :rtype: list of TORO extTasks (at least 2)
+        """
+        starts = list(candidates)
+        rng.shuffle(starts)
+        longest = list()
+        for start in starts:
+            chain_tasks = [start]
+            while len(chain_tasks) < self.chain_length:
+                prev = chain_tasks[-1].in_event_model.P
+                suitable = [t for t in candidates if (t not in chain_tasks) and ((self.max_period_ratio is None) or
+                            (max(prev, t.in_event_model.P) <= self.max_period_ratio * min(prev, t.in_event_model.P)))]
+                if len(suitable) == 0:
+                    break
+                chain_tasks.append(rng.choice(suitable))
+            if len(chain_tasks) > len(longest):
+                longest = chain_tasks
+            if len(longest) == self.chain_length:
+                break
+
+        if len(longest) < 2:
+            raise ValueError("No chain of at least 2 tasks can be formed (maximum period ratio: %s)" % str(self.max_period_ratio))
+        return longest
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Copyright Notice
+================
+Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+===========
+Benchmark suite: analyses generated systems (cf. SystemGenerator) with all requested graph backends and
+times each analysis phase (system generation, response times, graph construction, latency and robustness
+margin calculation). Results are written to a JSON file and can be compared to a baseline to detect
+performance regressions and deviating analysis results.
+"""
+
+import time
+import json
+import platform
+import contextlib
+from io import StringIO
+
+import numpy as np
+
+from .. import system_analysis
+from .. import graph_wrappers
+from .. import chain_analysis as ChainAnalysis
+
+## pseudo backend: chains are analysed line by line without building a graph (cf. ChainAnalysis.stream_analysis())
+streaming = 'streaming'
+
+
+
+class BenchmarkSuite(object):
+    """
+    This class runs benchmarks on generated systems and compares their results to a baseline.
+    """
+
+    ## version of the results format
+    version = 1
+
+    def __init__(self, scenarios, seeds, backends=None, repetitions=1, margins=True):
+        """
+        :param scenarios: dict, scenario name -> SystemGenerator object
+        :param seeds: list of ints, a system is generated for each scenario and seed
+        :param backends: list of strings, graph backends (cf. graph_wrappers.backends) and/or 'streaming'
+                         (default: all available backends and 'streaming')
+        :param repetitions: int, each phase is repeated and the fastest run is reported
+        :param margins: bool, calculate robustness margins as well
+        """
+        self.scenarios = scenarios
+        self.seeds = seeds
+        self.backends = backends if backends is not None else graph_wrappers.available_backends() + [streaming]
+        self.repetitions = repetitions
+        self.margins = margins
+
+        ## results of all systems (system level phases) and chains (chain level phases for each backend)
+        self.systems = list()
+        self.chains = list()
+
+
+    def run(self):
+        """ generates and analyses all systems
+
+        :rtype: dict (cf. results())
+        """
+        for name, generator in self.scenarios.items():
+            for seed in self.seeds:
+                self.__run_system(name, generator, seed)
+        return self.results()
+
+
+    def results(self):
+        """ returns all results in a machine-readable form
+
+        :rtype: dict
+        """
+        return {'version': self.version,
+                'environment': {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+                                'backends': graph_wrappers.available_backends()},
+                'scenarios': {name: generator.parameters() for name, generator in self.scenarios.items()},
+                'seeds': list(self.seeds),
+                'repetitions': self.repetitions,
+                'margins': self.margins,
+                'systems': self.systems,
+                'chains': self.chains}
+
+
+    def write(self, path):
+        """ writes the results to a JSON file
+
+        :param path: string
+        """
+        with open(path, 'w') as f:
+            json.dump(self.results(), f, indent=1, default=self.__to_json)
+
+
+    def toString(self):
+        """ returns a summary: total time of each phase and backend
+
+        :rtype: string
+        """
+        totals = dict()
+        for record in self.chains:
+            for phase, t in record['times'].items():
+                totals[(record['backend'], phase)] = totals.get((record['backend'], phase), 0) + t
+        s = "Benchmark: %d systems, %d chains" % (len(self.systems), len(self.chains) // max(1, len(self.backends)))
+        s += "\n\tgenerate: %.3f s, wcrt: %.3f s" % (sum(r['times']['generate'] for r in self.systems),
+                                                    sum(r['times']['wcrt'] for r in self.systems))
+        for backend in self.backends:
+            s += "\n\t%s: " % backend + ", ".join("%s: %.3f s" % (phase, t) for (b, phase), t in totals.items() if b == backend)
+        return s
+
+
+    @staticmethod
+    def compare(results, baseline, tolerance=0.25, min_time=0.01):
+        """ compares results to a baseline (e.g. the results of a previous TORO version).
+        A phase has regressed if it takes more than (1 + tolerance) times as long as in the baseline
+        and at least min_time seconds longer. Deviating latencies are reported as well.
+
+        :param results: dict, cf. results()
+        :param baseline: dict, cf. results()
+        :param tolerance: float
+        :param min_time: float, seconds
+        :rtype: list of strings (regressions)
+        """
+        regressions = list()
+
+        def check(name, times, baseline_times):
+            for phase, t in times.items():
+                t_base = baseline_times.get(phase)
+                if (t_base is not None) and (t > (1 + tolerance) * t_base) and (t - t_base >= min_time):
+                    regressions.append("%s %s: %.4f s (baseline: %.4f s)" % (name, phase, t, t_base))
+
+        baseline_systems = {(r['scenario'], r['seed']): r for r in baseline['systems']}
+        for record in results['systems']:
+            key = (record['scenario'], record['seed'])
+            if key in baseline_systems:
+                check("%s/%d" % key, record['times'], baseline_systems[key]['times'])
+
+        baseline_chains = {(r['scenario'], r['seed'], r['chain'], r['backend']): r for r in baseline['chains']}
+        for record in results['chains']:
+            key = (record['scenario'], record['seed'], record['chain'], record['backend'])
+            if key in baseline_chains:
+                name = "%s/%d/%s/%s" % key
+                if record['latency'] != baseline_chains[key]['latency']:
+                    regressions.append("%s: latency %s (baseline: %s)" % (name, record['latency'], baseline_chains[key]['latency']))
+                check(name, record['times'], baseline_chains[key]['times'])
+        return regressions
+
+
+    def __run_system(self, name, generator, seed):
+        """ generates a system and analyses all of its chains with all backends
+
+        :param name: string, scenario name
+        :param generator: SystemGenerator object
+        :param seed: int
+        """
+        start = time.perf_counter()
+        system, chains = generator.generate(seed)
+        t_generate = time.perf_counter() - start
+
+        # console output of the analyses is discarded
+        with contextlib.redirect_stdout(StringIO()):
+            start = time.perf_counter()
+            system_analysis.calculate_wcrt(system)
+            t_wcrt = time.perf_counter() - start
+            for chain in chains:
+                chain.determine_semantic()
+
+        self.systems.append({'scenario': name, 'seed': seed, 'system': system.name,
+                             'tasks': sum(len(r.tasks) for r in system.resources), 'chains': len(chains),
+                             'times': {'generate': t_generate, 'wcrt': t_wcrt}})
+
+        for chain in chains:
+            for backend in self.backends:
+                record = {'scenario': name, 'seed': seed, 'chain': chain.name, 'backend': backend,
+                          'semantic': chain.semantic.name, 'length': len(chain.tasks)}
+                record.update(self.__run_chain(chain, backend))
+                self.chains.append(record)
+
+
+    def __run_chain(self, chain, backend):
+        """ analyses a chain using a backend, each phase is repeated and the fastest run is reported
+
+        :param chain: TORO extEffectChain
+        :param backend: string
+        :rtype: dict (jobs, latency, times)
+        """
+        times = dict()
+
+        def timed(phase, func, *args):
+            start = time.perf_counter()
+            res = func(*args)
+            t = time.perf_counter() - start
+            times[phase] = min(times.get(phase, t), t)
+            return res
+
+        for _ in range(self.repetitions):
+            with contextlib.redirect_stdout(StringIO()):
+                if backend == streaming:
+                    analysis = ChainAnalysis.ChainAnalysis(chain)
+                    latency, _ = timed('stream', analysis.stream_analysis, self.margins)
+                else:
+                    analysis = ChainAnalysis.ChainAnalysis(chain, backend=backend)
+                    timed('graph', analysis.build_graph)
+                    latency = timed('latency', analysis.calculate_e2e_lat)
+                    if self.margins is True:
+                        timed('margins', analysis.calculate_robustness_margins)
+
+        # jobs of one hyperperiod of the chain's tasks, independent of the backend
+        return {'jobs': int(analysis._estimate_graph_size()), 'latency': latency, 'times': times}
+
+
+    @staticmethod
+    def __to_json(value):
+        """ converts numpy scalars for JSON serialization """
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError("Object of type %s cannot be stored in benchmark results" % type(value).__name__)
@@ -20,8 +20,11 @@ based latency analysis as implemented here can be found in [4].
 """
 
 import math
+from bisect import bisect_right
 from typing import Dict, List, Union, Tuple
 
+import numpy as np
+
 from .. import model
 Semantics = model.Semantic
 
@@ -32,23 +35,24 @@ from .analysis_bc import GraphNotBuiltException
 
 
 
-Wrapper = "GT" # choose either "NX" or "GT"
-if Wrapper == "NX":
-    Graph = wrappers.networkx_wrapper
-elif Wrapper == "GT":
-    Graph = wrappers.graphtool_wrapper
-else:
-    raise NotImplementedError("Incompatible graph wrapper \"" + Wrapper + "\" selected!")
-
-
 
 class ChainAnalysis(ChainBaseClass):
     """ This class contains function to compute the maximum end-to-end latency and the 
     robustness margins for a given cause-effect chain, that contains time-triggered
     LET or BET tasks only.
     """ 
-    def __init__(self, chain:model.extEffectChain, vis:bool=False):
-        """ constructor """
+    ## task parameters that can be overridden by the scenarios of a sweep (cf. sweep()). Periods are not included,
+    ## as they determine the hyperperiod and thus all lines of the job matrix: a new graph has to be built instead.
+    sweep_parameters = ('wcrt', 'let', 'release_offset')
+
+    def __init__(self, chain:model.extEffectChain, vis:bool=False, backend:str=None, reduce_roots:bool=False):
+        """ constructor
+
+        :param chain: TORO extEffectChain
+        :param vis: bool, enable/disable graph visualisation
+        :param backend: string, graph wrapper used for the analysis (cf. graph_wrappers.backends), "auto" if None
+        :param reduce_roots: bool, only instantiate one representative of each class of equivalent root jobs (latency analysis only)
+        """
 
         ## networkx/graph-tool graph representing the reachability graph
         self.__data_prop_graph = None
@@ -71,6 +75,12 @@ class ChainAnalysis(ChainBaseClass):
         ## flag: enable/disable graph visualisation
         self.__vis = vis
 
+        ## name of the graph wrapper backend (or "auto" policy) used for building the graph
+        self.__backend = backend
+
+        ## flag: only instantiate representative root jobs, cf. __representative_roots()
+        self.__reduce_roots = reduce_roots
+
         ## analysis results: max end-to-end latency of the cec
         self.__max_e2e_lat = None
 
@@ -85,24 +95,47 @@ class ChainAnalysis(ChainBaseClass):
     # build reachability graph #
     ############################
 
-    def build_graph(self) -> None:
-        """ builds an actual graph based on the system information provided in the constructor call """
+    def build_graph(self, graph_data=None) -> None:
+        """ builds an actual graph based on the system information provided in the constructor call.
+        The data paths and edge weights can be restored from arrays previously exported using get_graph_data()
+        (e.g. memory-mapped from an on-disk cache) instead of being determined again. The jobs are always instantiated.
+
+        :param graph_data: dict of np.ndarray, cf. get_graph_data()
+        """
 
-        # create empty graph
+        # calculate hyperperiod of task set used in the cec
+        self.__hyperperiod = self._calc_hyperperiod()
+
+        # create empty graph using the selected backend, the size estimate is used by the "auto" policy
+        Graph = wrappers.get_backend(self.__backend, size=self._estimate_graph_size(), vis=self.__vis)
         self.__data_prop_graph = Graph.Graph()
 
         if (self.__vis is True): # pragma: no cover
             # prepare visualisation of graph
             self.__prepare_visualisation()
-
-        # calculate hyperperiod of task set used in the cec
-        self.__hyperperiod = self._calc_hyperperiod()
         
-        ## __job_mtx: List of lists, each 'line' contains all jobs of the corresponding task from the chain, that could possibly be reached, compare set of jobs S []
+        ## __job_mtx: List of job tables, each 'line' contains all jobs of the corresponding task from the chain, that could possibly be reached, compare set of jobs S []
         self.__job_mtx = list()
+        ## graph nodes are integer job ids: the id of job k of line i is __node_offset[i] + k
+        self.__node_offset = list()
+        ## in and out degree of every job in the graph, one array per line of the job matrix
+        self.__in_degree = list()
+        self.__out_degree = list()
+        ## index (in the next line) of the first job that cannot read data from a job anymore, one array per line
+        self.__succ_end = list()
+        ## edges between consecutive lines as (producer indices, consumer indices) arrays
+        self.__edges = list()
+        ## edge weights between consecutive lines as (weights, edge leads to a dead end) arrays
+        self.__weights = list()
+        ## longest distance from the root nodes to every job, one array per line (only determined for incremental tests)
+        self.__row_dist = None
         
         # instantiate jobs and store them in job matrix
         self._init_relevant_jobs()
+
+        if (graph_data is not None) and self.__restore_dataPaths(graph_data):
+            # data paths and edge weights have been restored
+            return
         
         # perform reachability analysis
         self._determine_dataPaths()
@@ -126,6 +159,25 @@ class ChainAnalysis(ChainBaseClass):
         return hyperperiod
 
 
+    def get_job_count(self):
+        """ returns the number of jobs (nodes) of the data propagation graph, 0 if the graph has not been built yet
+
+        :rtype: int
+        """
+        if (self.__data_prop_graph is None):
+            return 0
+        return sum(len(jobs) for jobs in self.__job_mtx)
+
+
+    def _estimate_graph_size(self):
+        """ estimates the number of jobs (nodes) of the data propagation graph:
+        one hyperperiod worth of jobs for each task of the chain.
+
+        :rtype: int
+        """
+        return sum(self.__hyperperiod // task.in_event_model.P + 1 for task in self.__tasks)
+
+
     def _init_relevant_jobs(self):
         """ create the set of jobs that may be reachable """
 
@@ -137,145 +189,273 @@ class ChainAnalysis(ChainBaseClass):
     
     def __set_jobs(self, task, l):
         """ This function instantiates the set of jobs needed for the reachability analysis
-        and creates a node in the graph for each instantiated job
+        as a job table and creates a node in the graph for each instantiated job
 
         :param self: the object pointer
         :param task TORO: extTask object
         :param l: integer corresponding to job index
         """
-        mtx_line = list()
-        job_number = 1
+        jobs = self.__instantiate_line(task, self.__job_mtx[l-1] if (l > 0) else None)
+        job_cnt = len(jobs)
+
+        # create graph nodes
+        if (l == 0):
+            offset = 0
+        else:
+            offset = self.__node_offset[l-1] + len(self.__job_mtx[l-1])
+        nodes = range(offset, offset + job_cnt)
+        self.__data_prop_graph.add_nodes(nodes)
+
+        # add additional information for graph visualisation if flag is set to True
+        if (self.__vis is True): # pragma: no cover
+            for k in range(job_cnt):
+                self.__data_prop_graph.set_node_position(nodes[k], jobs.job(k))
+
+        # add line of jobs to matrix
+        self.__job_mtx.append(jobs)
+        self.__node_offset.append(offset)
+
 
+    def __instantiate_line(self, task, prev_jobs):
+        """ instantiates the jobs of a task that may be reachable as a job table 
+
+        :param task: TORO extTask object
+        :param prev_jobs: JobTable of the previous task in the chain (None for the first task)
+        :rtype: TORO JobTable
+        """
         if (task.name == self.__first_task_name):
             # root node: instantiate all jobs of the task that lie in the hyperperiod: HP / task period = highest task index
-            for k in range(int(self.__hyperperiod / task.in_event_model.P)):
-                job = task.instantiate_job(job_number=job_number, 
-                                            wcrt=task.wcrt,
-                                            bcrt=task.bcrt)
-                mtx_line.append(job)
-                job_number += 1
-
-                # create graph node
-                self.__data_prop_graph.add_node(job)               
-
-                # add additional information for graph visualisation if flag is set to True
-                if (self.__vis is True): # pragma: no cover
-                    self.__data_prop_graph.set_node_position(job)
-   
-            # add line of jobs to matrix                
-            self.__job_mtx.append(mtx_line)
+            job_cnt = int(self.__hyperperiod / task.in_event_model.P)
         else:
-            # not a root node: instantiate successor(consumer) jobs whose Rmin is smaller or equal to Dmax of the previous task's (producer) last job
-            border = self.__job_mtx[l-1][-1].Dmax
-            while True:
-                job = task.instantiate_job(job_number=job_number,
-                                            wcrt=task.wcrt,
-                                            bcrt=task.bcrt)
-
-                if (job.Rmin < border):
-                    mtx_line.append(job)
-                    job_number += 1
-
-                    # create graph node
-                    self.__data_prop_graph.add_node(job)
-                    
-                    # add additional information for graph visualisation if flag is set to True
-                    if (self.__vis is True): # pragma: no cover
-                        self.__data_prop_graph.set_node_position(job)
-
-                else:
-                    # add line of jobs to matrix 
-                    self.__job_mtx.append(mtx_line)
-                    break
+            # not a root node: instantiate successor(consumer) jobs whose Rmin is smaller than Dmax of the previous task's (producer) last job
+            border = prev_jobs.Dmax[-1]
+            job_cnt = max(0, int(-((task.release_offset - border) // task.in_event_model.P)))
+
+        jobs = task.instantiate_jobs(first_job_number=1, 
+                                     count=job_cnt,
+                                     wcrt=task.wcrt,
+                                     bcrt=task.bcrt)
+
+        if (task.name == self.__first_task_name) and (self.__reduce_roots is True) and (len(self.__tasks) > 1):
+            jobs = self.__representative_roots(jobs, self.__instantiate_line(self.__tasks[1], jobs))
+
+        return jobs
+
+
+    def __representative_roots(self, roots, consumers):
+        """ reduces the root jobs to one representative of each class of equivalent root jobs.
+        As read and data intervals are sorted, the consumers of a root job form a contiguous range 
+        (cf. __connect()) and the ranges of consecutive root jobs are monotonic. Thus, root jobs whose
+        ranges end at the same consumer (i.e. the data of all but the first of them is overwritten before the
+        next consumer reads it) only reach a subset of the consumers of the class' first job. 
+        As the first job is released earlier, the weights of its edges (cf. __weigh()) are larger and
+        paths starting at the other jobs of the class can never be longer. Only the first job is kept.
+        Note: the end-to-end latency is not affected, the robustness margins of the first task are.
+
+        :param roots: TORO JobTable, all root jobs of the hyperperiod
+        :param consumers: TORO JobTable, consumers of all root jobs
+        :rtype: TORO JobTable
+        """
+        last = np.searchsorted(consumers.Rmin, roots.Dmax, side='left')
+        keep = np.ones(len(roots), dtype=bool)
+        keep[1:] = last[1:] != last[:-1]
+        return roots.select(keep)
 
             
 
 
     def _determine_dataPaths(self):
         """ determines data paths between previously instantiated job instances 
-        based on their read and data intervals and connects the nodes in the graph accordingly
+        based on their read and data intervals and connects the nodes in the graph accordingly.
+        A consumer job can read data from a producer job if Rmax(consumer) >= Dmin(producer) and
+        Rmin(consumer) < Dmax(producer), see Eq. (1) of Becker et al. 2016 [1]. As read and data
+        intervals of the jobs in a row of the job matrix are sorted, the consumers of a producer form
+        a contiguous range. The bounds of the ranges of all producers of a row are determined at once
+        using a binary search on the consumers' read intervals.
         """
+        self.__in_degree = [np.zeros(len(self.__job_mtx[0]), dtype=np.int64)]
+        self.__out_degree = list()
+        self.__succ_end = list()
+        self.__edges = list()
+
         for i in range(len(self.__job_mtx) - 1):  # iterate over rows in matrix
-            for k in range(len(self.__job_mtx[i])):  # iterate over columns in row
-                # earliest possible self.__job_mtx[i+1][l] that may read from self.__job_mtx[i][k]
-                # see Eq. (2) of Becker et al. 2016 [1] (adapted for offsets)
-                # note that job index is by 1 smaller than the job number
-                l = math.ceil((self.__job_mtx[i][k].Dmin - self.__job_mtx[i+1][0].offset) / self.__job_mtx[i + 1][0].period) - 1
-                while (l < len(self.__job_mtx[i + 1])):
-                    if (self.__follows(self.__job_mtx[i][k], self.__job_mtx[i + 1][l])):
-                        producer = self.__job_mtx[i][k]
-                        consumer =  self.__job_mtx[i + 1][l]                   
-
-                        # add directed edge to graph signaling, that the consumer can read data from the producer
-                        if (self.__data_prop_graph.get_in_degree(producer) == 0) and (producer.task_name != self.__first_task_name):
-                            # do not add edges between node's, if the producer did not receive any data, because it's read interval did
-                            # not match with any previous task's data intervals, happens especially for the first couple of tasks.
-                            pass
-                        else:
-                            self.__data_prop_graph.add_edge(producer, consumer)
-                    l += 1
+            src, dst, out_degree, succ_end, in_degree = self.__connect(self.__job_mtx[i], self.__job_mtx[i + 1], self.__in_degree[i], i == 0)
+
+            self.__out_degree.append(out_degree)
+            self.__succ_end.append(succ_end)
+            self.__in_degree.append(in_degree)
+            self.__edges.append((src, dst))
+
+            # add directed edges to graph signaling, that the consumers can read data from the producers
+            self.__data_prop_graph.add_edges(src + self.__node_offset[i], dst + self.__node_offset[i + 1])
+
+        # jobs of the last task in the chain do not have any successors
+        self.__out_degree.append(np.zeros(len(self.__job_mtx[-1]), dtype=np.int64))
+        self.__succ_end.append(np.zeros(len(self.__job_mtx[-1]), dtype=np.int64))
+
+
+    def __connect(self, producers, consumers, producer_in_degree, first_row):
+        """ determines the data paths between the jobs of two consecutive rows of the job matrix
+
+        :param producers: TORO JobTable
+        :param consumers: TORO JobTable
+        :param producer_in_degree: np.ndarray, in degree of the producers
+        :param first_row: bool, producers are the first row of the job matrix
+        :rtype: np.ndarray (producer indices), np.ndarray (consumer indices), np.ndarray (out degree of the producers),
+                np.ndarray (index of first unreachable consumer), np.ndarray (in degree of the consumers)
+        """
+        # consumers[first:last] can read data from the producers
+        # first consumer whose read interval does not end before the producer's data interval starts
+        first = np.searchsorted(consumers.Rmax, producers.Dmin, side='left')
+        # first consumer that is released after the producer's data interval ended
+        last = np.searchsorted(consumers.Rmin, producers.Dmax, side='left')
+        count = np.maximum(last - first, 0)
+
+        if not first_row:
+            # do not add edges between node's, if the producer did not receive any data, because it's read interval did
+            # not match with any previous task's data intervals, happens especially for the first couple of tasks.
+            count[producer_in_degree == 0] = 0
+
+        # enumerate all (producer, consumer) pairs
+        total = int(count.sum())
+        src = np.repeat(np.arange(len(producers)), count)
+        dst = np.repeat(first - (np.cumsum(count) - count), count) + np.arange(total)
+
+        return src, dst, count, last, np.bincount(dst, minlength=len(consumers))
 
 
     def _add_weights(self):
         """ This functions adds weights to each edge of the graph:
         The weight is equivalent to the change in response time/LET compared
-        to the job predecessor.
+        to the job predecessor. The weights of all edges between two rows of the job matrix are calculated at once.
         cf. [4] Equation (4.3) and (4.4)
         """
-        
-        edges = self.__data_prop_graph.get_edges()
-
-        for e in edges:
-            producer = e[0]
-            consumer = e[1]
-
-            if ((self.__data_prop_graph.get_out_degree(consumer) == 0) and (consumer.task_name != self.__last_task_name)):
-                # if an edge will definitely not lead to a job instance of the last task in the chain, set edge weight to -infinity to avoid problems with longest/shortest path search
-                weight = -math.inf
-
-            elif (self.__data_prop_graph.get_in_degree(producer) == 0):
-                # producer is an instance of the first task in the cec
-                # [4] Equation (4.3) and (4.4) option: i = 0
-                if(consumer.semantic == Semantics.LET):
-                    tmp = consumer.let
-                elif(consumer.semantic == Semantics.BET):
-                    tmp = consumer.wcrt
-                    
-                # weight defined by the difference between the elapse of the consecutive job's WCRT or LET to the first job's activation instant (here defined by Rmin)
-                weight = (consumer.Rmin + tmp) - (producer.Rmin)
-            else:
-                # producer is NOT an instance of the first task in the cec
-                # [4] Equation (4.3) and (4.4) option: i > 0
-                # modified to check producer and consumer separately to allow for analyzing 'heterogeneous' BET and LET CECs without prior decomposition
-                if(consumer.semantic == Semantics.LET):                    
-                    tmp_consumer = consumer.let                    
-                elif(consumer.semantic == Semantics.BET):
-
-                    tmp_consumer = consumer.wcrt
-                if(producer.semantic == Semantics.LET): 
-                    tmp_producer = producer.let
-                elif(producer.semantic == Semantics.BET):
-                    tmp_producer = producer.wcrt
-
-                # weight defined as change (increase OR decrease) in max latency compared to latency from root to producer
-                weight = (consumer.Rmin + tmp_consumer) - (producer.Rmin + tmp_producer)
-            # add weight to corresponding edge (also as a value with inverted sign!)
-            self.__data_prop_graph.set_edge_weight(producer, consumer, weight)
-
-
-    def __follows(self, prod_job, cons_job):
-        """ Check reachability between jobs using Eq. 1 of Becker et al. 2016 [1].
-
-        :param prod_job: TORO Job object
-        :param cons_job: TORO Job object
-        :rtype: bool 
-        """
-        if ((cons_job.Rmax >= prod_job.Dmin) and (cons_job.Rmin < prod_job.Dmax)):
-            return True
-        else:
+        self.__weights = list()
+        for i in range(len(self.__edges)):
+            src, dst = self.__edges[i]
+            self.__weights.append(self.__weigh(self.__job_mtx[i], self.__job_mtx[i + 1], src, dst, self.__in_degree[i], self.__out_degree[i + 1]))
+
+        self.__set_edge_weights()
+
+
+    def __set_edge_weights(self):
+        """ adds the previously calculated weights to the corresponding edges of the graph """
+        if (len(self.__weights) == 0):
+            return
+
+        # convert to python scalars, weights remain integers if all task parameters are integers
+        weights = np.concatenate([x[0] for x in self.__weights]).tolist()
+        for e in np.flatnonzero(np.concatenate([x[1] for x in self.__weights])).tolist():
+            weights[e] = -math.inf
+
+        # add weights to corresponding edges
+        src_nodes = np.concatenate([self.__edges[i][0] + self.__node_offset[i] for i in range(len(self.__edges))])
+        dst_nodes = np.concatenate([self.__edges[i][1] + self.__node_offset[i + 1] for i in range(len(self.__edges))])
+        self.__data_prop_graph.set_edge_weights(src_nodes, dst_nodes, weights)
+
+
+    def get_graph_data(self):
+        """ exports the data paths and edge weights of the data propagation graph as flat arrays,
+        so that the graph can be restored by build_graph() without determining them again:
+        line_length (number of jobs per line), edge_count (number of edges between consecutive lines), 
+        src and dst (producer and consumer indices of all edges), weight and dead_end (cf. __weigh()) 
+        and succ_end (cf. __connect(), all jobs of all lines)
+
+        :rtype: dict of np.ndarray
+        """
+        if (self.__data_prop_graph is None):
+            raise GraphNotBuiltException('Data propagation graph has not been build yet! Call build_graph() before calling get_graph_data().')
+
+        def concat(arrays, dtype):
+            if (len(arrays) == 0):
+                return np.zeros(0, dtype=dtype)
+            return np.concatenate(arrays)
+
+        return {'line_length': np.array([len(jobs) for jobs in self.__job_mtx], dtype=np.int64),
+                'edge_count': np.array([len(src) for src, _ in self.__edges], dtype=np.int64),
+                'src': concat([src for src, _ in self.__edges], np.int64),
+                'dst': concat([dst for _, dst in self.__edges], np.int64),
+                'weight': concat([weight for weight, _ in self.__weights], np.int64),
+                'dead_end': concat([dead_end for _, dead_end in self.__weights], bool),
+                'succ_end': concat(self.__succ_end, np.int64)}
+
+
+    def __restore_dataPaths(self, graph_data):
+        """ restores the data paths and edge weights exported by get_graph_data() and adds them to the graph.
+        Nothing is restored if the exported graph does not match the instantiated jobs.
+
+        :param graph_data: dict of np.ndarray
+        :rtype: bool, data paths and edge weights have been restored
+        """
+        line_length = [len(jobs) for jobs in self.__job_mtx]
+        if (list(graph_data['line_length']) != line_length) or (len(graph_data['edge_count']) != len(line_length) - 1):
             return False
 
+        edge_end = np.cumsum(graph_data['edge_count']).tolist()
+        job_end = np.cumsum(line_length).tolist()
+
+        self.__in_degree = [np.zeros(line_length[0], dtype=np.int64)]
+        self.__out_degree = list()
+        self.__succ_end = list()
+        self.__edges = list()
+        self.__weights = list()
+        for i in range(len(line_length)):
+            self.__succ_end.append(np.asarray(graph_data['succ_end'][job_end[i] - line_length[i]:job_end[i]]))
+            if (i == len(line_length) - 1):
+                # jobs of the last task in the chain do not have any successors
+                self.__out_degree.append(np.zeros(line_length[i], dtype=np.int64))
+                break
+
+            e = slice(edge_end[i] - graph_data['edge_count'][i], edge_end[i])
+            src = np.asarray(graph_data['src'][e])
+            dst = np.asarray(graph_data['dst'][e])
+            self.__edges.append((src, dst))
+            self.__weights.append((np.asarray(graph_data['weight'][e]), np.asarray(graph_data['dead_end'][e])))
+            self.__out_degree.append(np.bincount(src, minlength=line_length[i]))
+            self.__in_degree.append(np.bincount(dst, minlength=line_length[i + 1]))
+
+            self.__data_prop_graph.add_edges(src + self.__node_offset[i], dst + self.__node_offset[i + 1])
+
+        self.__set_edge_weights()
+        return True
+
+
+    def __weigh(self, producers, consumers, src, dst, producer_in_degree, consumer_out_degree):
+        """ calculates the weights of the edges between the jobs of two consecutive rows of the job matrix.
+        Edges that lead to a dead end are flagged, their weight is -infinity.
+
+        :param producers: TORO JobTable
+        :param consumers: TORO JobTable
+        :param src: np.ndarray, producer indices
+        :param dst: np.ndarray, consumer indices
+        :param producer_in_degree: np.ndarray, in degree of the producers
+        :param consumer_out_degree: np.ndarray, out degree of the consumers
+        :rtype: np.ndarray (weights), np.ndarray (bool, edge leads to a dead end)
+        """
+        # modified to check producer and consumer separately to allow for analyzing 'heterogeneous' BET and LET CECs without prior decomposition
+        if(consumers.semantic == Semantics.LET):
+            tmp_consumer = consumers.let
+        elif(consumers.semantic == Semantics.BET):
+            tmp_consumer = consumers.wcrt
+        if(producers.semantic == Semantics.LET): 
+            tmp_producer = producers.let
+        elif(producers.semantic == Semantics.BET):
+            tmp_producer = producers.wcrt
+
+        # weight defined as change (increase OR decrease) in max latency compared to latency from root to producer
+        # [4] Equation (4.3) and (4.4) option: i > 0
+        # if the producer is an instance of the first task in the cec (option: i = 0), the weight is defined by the difference 
+        # between the elapse of the consecutive job's WCRT or LET to the first job's activation instant (here defined by Rmin)
+        root = (producer_in_degree[src] == 0)
+        weight = (consumers.Rmin[dst] + tmp_consumer) - (producers.Rmin[src] + np.where(root, 0, tmp_producer))
+
+        # if an edge will definitely not lead to a job instance of the last task in the chain, set edge weight to -infinity to avoid problems with longest/shortest path search
+        if (consumers.task_name != self.__last_task_name):
+            dead_end = (consumer_out_degree[dst] == 0)
+        else:
+            dead_end = np.zeros(len(dst), dtype=bool)
 
+        return weight, dead_end
 
 
 
@@ -290,9 +470,10 @@ class ChainAnalysis(ChainBaseClass):
 
     def calculate_e2e_lat(self, print_all=False) -> int:
         """ This functions calculcates the cause-effect-chain's maximum end-to-end latency
-        by finding the longest path in the data propagation graph. A Bellman-Ford algorithm is
-        exploited for this purpose, specifically using the inverted weights to find the longest
-        path in the data propagation graph (cf. [4] Equation (4.6)).  
+        by finding the longest path in the data propagation graph. The NetworkX and graph-tool wrappers
+        exploit a Bellman-Ford algorithm for this purpose, specifically using the inverted weights to find
+        the longest path in the data propagation graph (cf. [4] Equation (4.6)). The DAG and NumPy wrappers
+        make use of the graph being layered and find the longest path using a topological sweep instead.
 
         :param print_all: bool
         :rtype: int
@@ -301,16 +482,16 @@ class ChainAnalysis(ChainBaseClass):
         if (self.__data_prop_graph is None):
             raise GraphNotBuiltException('Data propagation graph has not been build yet! Call build_graph() before calling calculate_e2e_lat().')
         
-        root_nodes = [x for x in self.__data_prop_graph.get_nodes() if self.__data_prop_graph.get_in_degree(x)==0 and x.task_name == self.__first_task_name]
-        leaf_nodes = [x for x in self.__data_prop_graph.get_nodes() if self.__data_prop_graph.get_out_degree(x)==0 and x.task_name == self.__last_task_name]
+        root_nodes = self.__select_nodes(self.__first_task_name, in_degree=False)
+        leaf_nodes = self.__select_nodes(self.__last_task_name, out_degree=False)
 
         length = self.__data_prop_graph.get_longest_path_length(root_nodes=root_nodes, leaf_nodes=leaf_nodes)
         
         if (print_all is True): # pragma: no cover
             # print list of all data path of the cec and the corresponding latency
             # by finding all possible paths from all root and leaf nodes of the data propagation graph
-            startNodes = [x for x in self.__data_prop_graph.get_nodes() if self.__data_prop_graph.get_out_degree(x)!=0 and self.__data_prop_graph.get_in_degree(x)==0 and x.task_name == self.__first_task_name]
-            endNodes = [x for x in self.__data_prop_graph.get_nodes() if self.__data_prop_graph.get_out_degree(x)==0 and self.__data_prop_graph.get_in_degree(x)!=0 and x.task_name == self.__last_task_name]
+            startNodes = self.__select_nodes(self.__first_task_name, in_degree=False, out_degree=True)
+            endNodes = self.__select_nodes(self.__last_task_name, in_degree=True, out_degree=False)
  
             for start in startNodes:
                 for end in endNodes:
@@ -320,10 +501,10 @@ class ChainAnalysis(ChainBaseClass):
                     for path in paths:
                         
                         s = ""
-                        for job in path[0]:
+                        for node in path[0]:
                             if s != "":
                                 s += " -> "
-                            s += job.name
+                            s += self.__get_node_job(node).name
                         print(s + "  | latency: " + str(path[1]))
 
         # store latency in instance
@@ -348,7 +529,35 @@ class ChainAnalysis(ChainBaseClass):
         """
         if (self.__data_prop_graph is None):
             raise GraphNotBuiltException('Data propagation graph has not been build yet! Call build_graph() before calling calculate_e2e_lat().')
+        assert self.__reduce_roots is False, "Robustness margins cannot be calculated if only representative root jobs have been instantiated!"
+
+        margins = self.__init_margins()
+
+        # calculate robustness margin for each job, all jobs of a line in the job matrix are handled at once.
+        # Task parameters are shared by all jobs of a line, thus margins only depending on those parameters are added once per line.
+        for i in range(len(self.__job_mtx)):
+            jobs = self.__job_mtx[i]
+            consumers = self.__job_mtx[i + 1] if (jobs.task_name != self.__last_task_name) else None
+
+            if not self.__line_margins(margins, jobs, consumers, self.__in_degree[i], self.__out_degree[i], self.__succ_end[i]):
+                continue
+
+            if (jobs.task_name == self.__last_task_name):
+                # calculate maximum slack q, based on the e2e deadline of the cec and the previously calculated max. latency
+                if (self.__max_e2e_lat is None): # pragma: no cover
+                    print("The max. e2e latency of the chain has not been calculated before.\
+                        \nUse calculate_e2e_lat() to calculate that value for more precise results.")
+                    continue
+                self.__last_task_margins(margins, jobs, self.__max_e2e_lat)
+
+        return self.__min_margins(margins)
 
+
+    def __init_margins(self):
+        """ returns empty lists of robustness margins, delta let values and slack for each task of the chain
+
+        :rtype: dict, dict, dict
+        """
         # dictionaries to store results in
         tasks_rm = dict()
         tasks_delta_let = dict()
@@ -360,114 +569,127 @@ class ChainAnalysis(ChainBaseClass):
             tasks_delta_let[task.name] = list()
             tasks_slack[task.name] = list()
 
-        # calculate robustness margin for each job
-        jobs = list(self.__data_prop_graph.get_nodes())
-        
-        for job in jobs:
-            task_name = job.task_name
+        return tasks_rm, tasks_delta_let, tasks_slack
 
-            # skip nodes, that have no predecessor and are no instance of the first task in the cec
-            if(job.task_name != self.__first_task_name and self.__data_prop_graph.get_in_degree(job) == 0 ):
-                continue
 
+    def __line_margins(self, margins, jobs, consumers, in_degree, out_degree, succ_end):
+        """ adds the robustness margins, delta let values and slack of all jobs of a line of the job matrix
+        that do not depend on the max. e2e latency of the cec (first and second option, cf. calculate_robustness_margins())
 
+        :param margins: dict, dict, dict (lists of margins, delta let values and slack of each task)
+        :param jobs: TORO JobTable
+        :param consumers: TORO JobTable of the next line, None for jobs of the last task
+        :param in_degree: np.ndarray, in degree of the jobs
+        :param out_degree: np.ndarray, out degree of the jobs
+        :param succ_end: np.ndarray, index of the first consumer that cannot read data from a job
+        :rtype: bool, the line contains valid jobs
+        """
+        tasks_rm, tasks_delta_let, tasks_slack = margins
+        task_name = jobs.task_name
 
-            # FIRST OPTION: compare let/wcrt against a task's own deadline - can be done for every task/job! 
-            if(job.semantic == Semantics.BET):
-                # if a deadline for a task exist use that deadline instead of the period
-                if job.deadline is not None:
-                    tasks_rm[task_name].append(job.deadline - job.offset - job.wcrt)
-                    tasks_slack[task_name].append(job.deadline - job.offset - job.wcrt)
-                else:
-                    # d_tau_k^c - WCRT(tau_k^c), adjusted by offset
-                    tasks_rm[task_name].append(job.period - job.offset - job.wcrt)
-                    tasks_slack[task_name].append(job.period - job.offset - job.wcrt)
-
-            elif(job.semantic == Semantics.LET):
-                if not(job.wcrt is None or job.wcrt == 'unknown' or job.wcrt == 'n/a'):
-                    # robustness of let task: let - wcrt
-                    # [4] Equation (2.13) as adopted from [3] theorem 2
-                    tasks_rm[task_name].append(job.let - job.wcrt)
-
-                if (job.ic_task is False):
-                    # following formula is not valid of (SL) LET interconnect tasks 
-                    # as the LET may significantly exceeds a task's period
-                    tasks_delta_let[task_name].append(job.period - job.offset - job.let)
-                    tasks_slack[task_name].append(job.period - job.offset - job.let)
-                tasks_delta_let[task_name].append(job.period)
-
-
-
-            # SECOND OPTION: job is not an instance of last task
-            # Slack Theta: Calculate margin in a way, that there will be no new instance of a
-            # consumer task that can read data from the job.
-            # cf. [4] Equation (2.10) that is adopted from theta-term as used in theorem 3 and 4 [3] 
-            if (job.task_name != self.__last_task_name):
-                consumers = self.__data_prop_graph.get_successors(job)
-
-                # get highest job_number of every task reading data from the job
-                highest_index = 0
-                for consumer in consumers:
-                    if consumer.job_number > highest_index:
-                        highest_index = consumer.job_number
-                        task_name_suc = consumer.task_name
-
-                # get first consumer job, that could not read data from the current job before and shall not be able to do so after adding the margin
-                if (highest_index == 0):
-                    # job has no consumers atm
-                    # get next task (consumer) from chain and generate the first instance, that might be able to read data from the current job
-                    # if the job's wcrt (and by doing so the upper bound of the data inter) is increased 
-                    i = 0
-                    for task in self.__cec.tasks:
-                        i += 1
-                        if (task.name == job.task_name):
-                            break
-                    
-                    unreachable_job = self.__get_job2(job, self.__cec.tasks[i])
-                else:
-                    unreachable_job = self.__get_job(task_name_suc, highest_index + 1)
-                    # n = 1
-                    # while (unreachable_job.Rmin - job.Dmax) < 0:
-                    #     unreachable_job = self.__get_job(task_name_suc, highest_index + 1 + n)
-                    #     n += 1
-
-                # calculate max. slack theta and add to list of the corresponding task's robustness margins / delta let values
-                theta = unreachable_job.Rmin - job.Dmax
-                assert theta >= 0, ('per definition theta must not be < 0, but here theta = %d' %theta)
-                job.set_slack(theta)
-                # tasks_slack[task_name].append(theta)
-                if(job.semantic == Semantics.BET):
-                    tasks_rm[task_name].append(theta)
-                    
-                elif(job.semantic == Semantics.LET):
-                    tasks_delta_let[task_name].append(theta)
-
-
-
-            # THIRD OPTION: job is an instance of last task
-            # compare task wcrt or LET to chain deadlines
-            else:
-                # calculate maximum slack q, based on the e2e deadline of the cec and the previously calculated max. latency
-                if (self.__max_e2e_lat is None): # pragma: no cover
-                    print("The max. e2e latency of the chain has not been calculated before.\
-                        \nUse calculate_e2e_lat() to calculate that value for more precise results.")
-                    continue
+        # skip nodes, that have no predecessor and are no instance of the first task in the cec
+        if (task_name != self.__first_task_name):
+            valid = (in_degree != 0)
+        else:
+            valid = np.ones(len(jobs), dtype=bool)
+
+        if not valid.any():
+            return False
 
-                if (self.__max_e2e_lat is not None) and (self.__cec.e2e_deadline is not None):
-                    if(job.semantic == Semantics.BET):
-                        tasks_rm[task_name].append(self.__cec.e2e_deadline - self.__max_e2e_lat)
-                    elif(job.semantic == Semantics.LET):
-                        tasks_delta_let[task_name].append(self.__cec.e2e_deadline - self.__max_e2e_lat)
+
+
+        # FIRST OPTION: compare let/wcrt against a task's own deadline - can be done for every task/job! 
+        if(jobs.semantic == Semantics.BET):
+            # if a deadline for a task exist use that deadline instead of the period
+            if jobs.deadline is not None:
+                tasks_rm[task_name].append(jobs.deadline - jobs.offset - jobs.wcrt)
+                tasks_slack[task_name].append(jobs.deadline - jobs.offset - jobs.wcrt)
+            else:
+                # d_tau_k^c - WCRT(tau_k^c), adjusted by offset
+                tasks_rm[task_name].append(jobs.period - jobs.offset - jobs.wcrt)
+                tasks_slack[task_name].append(jobs.period - jobs.offset - jobs.wcrt)
+
+        elif(jobs.semantic == Semantics.LET):
+            if not(jobs.wcrt is None or jobs.wcrt == 'unknown' or jobs.wcrt == 'n/a'):
+                # robustness of let task: let - wcrt
+                # [4] Equation (2.13) as adopted from [3] theorem 2
+                tasks_rm[task_name].append(jobs.let - jobs.wcrt)
+
+            if (jobs.ic_task is False):
+                # following formula is not valid of (SL) LET interconnect tasks 
+                # as the LET may significantly exceeds a task's period
+                tasks_delta_let[task_name].append(jobs.period - jobs.offset - jobs.let)
+                tasks_slack[task_name].append(jobs.period - jobs.offset - jobs.let)
+            tasks_delta_let[task_name].append(jobs.period)
+
+
+
+        # SECOND OPTION: job is not an instance of last task
+        # Slack Theta: Calculate margin in a way, that there will be no new instance of a
+        # consumer task that can read data from the job.
+        # cf. [4] Equation (2.10) that is adopted from theta-term as used in theorem 3 and 4 [3] 
+        if (task_name != self.__last_task_name):
+            theta = list()
+
+            # the consumers of a job form a contiguous range in the next line, the first consumer job, that could not read data 
+            # from the current job before and shall not be able to do so after adding the margin directly follows the range
+            has_consumers = valid & (out_degree != 0)
+            if has_consumers.any():
+                unreachable_Rmin = consumers.release(consumers.job_number[0] + succ_end[has_consumers])
+                theta = (unreachable_Rmin - jobs.Dmax[has_consumers]).tolist()
+
+            no_consumers = valid & (out_degree == 0)
+            if no_consumers.any():
+                # jobs have no consumers atm
+                # determine the first instance of the next task (consumer), that might be able to read data from the current job
+                # if the job's wcrt (and by doing so the upper bound of the data inter) is increased 
+                theta.extend(self.__unreachable_theta(jobs.Dmin[no_consumers], jobs.Dmax[no_consumers], consumers).tolist())
+
+            # calculate max. slack theta and add to list of the corresponding task's robustness margins / delta let values
+            theta = min(theta)
+            assert theta >= 0, ('per definition theta must not be < 0, but here theta = %d' %theta)
+            if(jobs.semantic == Semantics.BET):
+                tasks_rm[task_name].append(theta)
                 
-                # take transition deadlines into account as well:
-                if(job.semantic == Semantics.BET):
-                    if hasattr(self.__cec, "transition_deadline"):
-                        # NOTE: adopted from updated "old" TORO implementation
-                        if self.__cec.transition_deadline != None and self.__cec.transition_deadline != 0:
-                            tasks_rm[task_name].append(self.__cec.transition_deadline - job.period - job.wcrt + job.bcrt)
+            elif(jobs.semantic == Semantics.LET):
+                tasks_delta_let[task_name].append(theta)
+
+        return True
+
+
+    def __last_task_margins(self, margins, jobs, max_e2e_lat):
+        """ adds the robustness margins and delta let values of the jobs of the last task of the cec:
+        compare task wcrt or LET to chain deadlines (third option, cf. calculate_robustness_margins())
+
+        :param margins: dict, dict, dict (lists of margins, delta let values and slack of each task)
+        :param jobs: TORO JobTable
+        :param max_e2e_lat: int, max. e2e latency of the cec
+        """
+        tasks_rm, tasks_delta_let, _ = margins
+        task_name = jobs.task_name
+
+        if (max_e2e_lat is not None) and (self.__cec.e2e_deadline is not None):
+            if(jobs.semantic == Semantics.BET):
+                tasks_rm[task_name].append(self.__cec.e2e_deadline - max_e2e_lat)
+            elif(jobs.semantic == Semantics.LET):
+                tasks_delta_let[task_name].append(self.__cec.e2e_deadline - max_e2e_lat)
+        
+        # take transition deadlines into account as well:
+        if(jobs.semantic == Semantics.BET):
+            if hasattr(self.__cec, "transition_deadline"):
+                # NOTE: adopted from updated "old" TORO implementation
+                if self.__cec.transition_deadline != None and self.__cec.transition_deadline != 0:
+                    tasks_rm[task_name].append(self.__cec.transition_deadline - jobs.period - jobs.wcrt + jobs.bcrt)
 
 
+    def __min_margins(self, margins):
+        """ determines the robustness margin, delta let value and slack of each task 
+        as the min. (non-negative) value out of all values calculated for its jobs
 
+        :param margins: dict, dict, dict (lists of margins, delta let values and slack of each task)
+        :rtype: dict, dict, dict
+        """
+        tasks_rm, tasks_delta_let, tasks_slack = margins
 
         # the max. robustness margin of a task equals the min. value out of every value calculate above for all instances of the task
         for task_name, rm_list in tasks_rm.items():
@@ -516,61 +738,136 @@ class ChainAnalysis(ChainBaseClass):
         return tasks_rm, tasks_delta_let, tasks_slack
 
 
-    ###################################
-    # chain analysis helper functions #
-    ###################################
+    ######################
+    # streaming analysis #
+    ######################
 
-    def __get_job(self, task_name, job_number):
-        """ return the job matching both the task name and the job number 
-        
-        :param task_name: string
-        :param job_number: int
-        :rtype: TORO job object
+    def stream_analysis(self, margins=True):
+        """ calculates the max. end-to-end latency (and the robustness margins) of the cec without building the 
+        data propagation graph. As edges only connect jobs of consecutive lines of the job matrix, jobs, data paths 
+        and edge weights are determined line by line: the longest distances to the jobs of a line are propagated to 
+        the next line and the previous line is dropped afterwards. Thus, the peak memory consumption only depends on 
+        the two largest consecutive lines instead of the whole graph.
+        Results are identical to calling build_graph(), calculate_e2e_lat() and calculate_robustness_margins().
+
+        :param margins: bool, calculate robustness margins, delta let values and slack as well
+        :rtype: int, (dict, dict, dict) or None
         """
+        assert (margins is False) or (self.__reduce_roots is False), "Robustness margins cannot be calculated if only representative root jobs have been instantiated!"
 
-        jobs = list(self.__data_prop_graph.get_nodes())
+        self.__hyperperiod = self._calc_hyperperiod()
+        tasks = self.__cec.tasks
+        line_margins = self.__init_margins() if margins else None
+        # jobs of the last task whose margins depend on the max. e2e latency
+        last_task_lines = list()
+        leaf_dist = list()
+
+        jobs = self.__instantiate_line(tasks[0], None)
+        in_degree = np.zeros(len(jobs), dtype=np.int64)
+        dist = np.zeros(len(jobs), dtype=np.float64)
+        for i in range(len(tasks)):
+            if (i < len(tasks) - 1):
+                consumers = self.__instantiate_line(tasks[i + 1], jobs)
+                src, dst, out_degree, succ_end, consumer_in_degree = self.__connect(jobs, consumers, in_degree, i == 0)
+            else:
+                # jobs of the last task in the chain do not have any successors
+                consumers = None
+                out_degree = np.zeros(len(jobs), dtype=np.int64)
+                succ_end = np.zeros(len(jobs), dtype=np.int64)
 
-        ret = None
-        # first check whether job already exists
-        for job in jobs:
-            if (job.task_name == task_name and job.job_number == job_number):
-                ret = job
-            
-        # job not found in graph, instantiate new job
-        if (ret is None):
-            # find corresponding task in chain
-            for task in self.__cec.tasks:
-                if (task.name == task_name):
-                    break
-            # instantiante a new job of the corresponding task
-            job = task.instantiate_job(job_number=job_number, 
-                                        wcrt=task.wcrt, 
-                                        bcrt=task.bcrt)
-            ret = job
+            if (jobs.task_name == self.__last_task_name):
+                # leaf nodes: jobs of the last task with predecessors but without successors
+                leaf_dist.append(dist[(in_degree != 0) & (out_degree == 0)])
 
-        return ret
+            if margins and self.__line_margins(line_margins, jobs, consumers if (jobs.task_name != self.__last_task_name) else None, 
+                                               in_degree, out_degree, succ_end):
+                if (jobs.task_name == self.__last_task_name):
+                    last_task_lines.append(jobs)
 
+            if (consumers is None):
+                break
 
-    def __get_job2(self, producer_job, consumer_task):
-        """ calculate index of first possible successor and return a corresponding job 
-        
-        :param producer_job: TORO Job object
-        :param consumer_task: TORO extTask object
+            # edges leading to a dead end (weight -infinity) never lead to a leaf node and do not affect the latency
+            weights = self.__weigh(jobs, consumers, src, dst, in_degree, np.ones(len(consumers), dtype=np.int64))
+            dist = self.__propagate(dist, (src, dst), weights, len(consumers))
+
+            # continue with the next line, the previous one is dropped
+            jobs = consumers
+            in_degree = consumer_in_degree
+
+        self.__max_e2e_lat = self.__max_latency(leaf_dist)
+
+        if self.__cec.e2e_deadline is not None:
+            assert self.__max_e2e_lat <= self.__cec.e2e_deadline, "The end-to-end deadline of CEC " + self.__cec.name + " has been violated (latency : " + str(self.__max_e2e_lat) + ", deadline: " + str(self.__cec.e2e_deadline) + ")"
+
+        if not margins:
+            return self.__max_e2e_lat, None
+
+        for jobs in last_task_lines:
+            self.__last_task_margins(line_margins, jobs, self.__max_e2e_lat)
+        return self.__max_e2e_lat, self.__min_margins(line_margins)
+
+
+
+
+
+
+
+
+    ###################################
+    # chain analysis helper functions #
+    ###################################
+
+    def __get_node_job(self, node):
+        """ materialise the job represented by a node of the graph
+
+        :param node: int
         :rtype: TORO job object
         """
+        i = bisect_right(self.__node_offset, node) - 1
+        return self.__job_mtx[i].job(node - self.__node_offset[i])
 
-        # earliest possible self.__job_mtx[i+1][l] that may read from self.__job_mtx[i][k]
-        # see Eq. 2 of Becker et al. 2016 [1] (adapted for offsets)
-        l = math.ceil((producer_job.Dmin - consumer_task.release_offset)/consumer_task.in_event_model.P)
-        while True:           
-            job = self.__get_job(consumer_task.name, l)
 
-            if (job.Rmin > producer_job.Dmax):
-                return job
-            else:
-                l += 1
+    def __select_nodes(self, task_name, in_degree=None, out_degree=None):
+        """ returns the nodes of all jobs of a task, optionally filtered by 
+        whether the jobs have predecessors (in_degree) or successors (out_degree) 
+
+        :param task_name: string
+        :param in_degree: None or bool
+        :param out_degree: None or bool
+        :rtype: list of int
+        """
+        nodes = list()
+        for i in range(len(self.__job_mtx)):
+            if (self.__job_mtx[i].task_name != task_name):
+                continue
+            selected = np.ones(len(self.__job_mtx[i]), dtype=bool)
+            if in_degree is not None:
+                selected &= ((self.__in_degree[i] != 0) == in_degree)
+            if out_degree is not None:
+                selected &= ((self.__out_degree[i] != 0) == out_degree)
+            nodes.extend((np.flatnonzero(selected) + self.__node_offset[i]).tolist())
+        return nodes
+
+
+    @staticmethod
+    def __unreachable_theta(Dmin, Dmax, consumers):
+        """ calculates the slack theta of producer jobs without consumers: the earliest consumer job that may read data 
+        from a producer job (see Eq. 2 of Becker et al. 2016 [1], adapted for offsets) or, if that job is released before
+        the producer's data interval ends, the first consumer job released afterwards cannot read data from the producer.
+        Theta is the time between the end of the data interval and the release of that consumer job.
+
+        :param Dmin: np.ndarray, lower bounds of the producers' data intervals
+        :param Dmax: np.ndarray, upper bounds of the producers' data intervals
+        :param consumers: TORO JobTable, jobs of the consumer task
+        :rtype: np.ndarray
+        """
+        # job number of the earliest possible consumer job: ceil((Dmin - offset) / period)
+        earliest = -((consumers.offset - Dmin) // consumers.period)
+        # job number of the first consumer job released after the data interval ended
+        released_after = (Dmax - consumers.offset) // consumers.period + 2
+        return consumers.release(np.maximum(earliest, released_after)) - Dmax
 
-        
 
          
 
@@ -628,49 +925,394 @@ class ChainAnalysis(ChainBaseClass):
     ## verify correctness of robustness margins ##
     ##############################################
 
-    def test(self, robustness_margins, delta_let=None):
+    def test(self, robustness_margins, delta_let=None, incremental=True):
         """ Verify whether perviously calculated robustness margins actually do not 
-        lead to cec deadline misses, by updating task wcrts and lets. Builds a new
-        graph and redetermines the max e2e latency of the cec using the updated tasks.
+        lead to cec deadline misses, by updating task wcrts and lets and redetermining the
+        max e2e latency of the cec using the updated tasks.
+        By default, the graph is updated incrementally: only jobs of updated tasks (and of lines
+        whose number of jobs changes as a consequence) are reinstantiated, edges and weights are only
+        recalculated between affected lines and the longest path search is only repeated for the lines
+        following the first modified one. The previously built graph remains untouched.
+        If incremental is False, a new graph is built from scratch. If no graph has been built before 
+        (streaming analysis, cf. stream_analysis()), the latency is recalculated line by line without building a graph.
         Returns True if deadline constraint is not violated, else returns False.
 
         :param robustness_margins: dict
         :param delta_let: dict
+        :param incremental: bool
         :rtype: bool
         """
         assert bool(robustness_margins) is True or bool(delta_let) is True
 
+        if delta_let is None:
+            delta_let = dict()
+
+        ## names of tasks whose parameters have been changed
+        changed = set()
+
         # first update WCRT and LET values of tasks part of this chain
         for task in self.__cec.tasks:
             # update wcrt using the previously calculated robustness margins (for both LET and BET tasks)
             if task.name in robustness_margins.keys():
                 task.wcrt += robustness_margins[task.name]
+                if robustness_margins[task.name] != 0:
+                    changed.add(task.name)
 
             # update LET of LET tasks using the delta let values
             if task.semantic is Semantics.LET:
                 if task.name in delta_let.keys():
                     task.let += delta_let[task.name]
+                    if delta_let[task.name] != 0:
+                        changed.add(task.name)
+
+        try:
+            if (incremental is True) and (self.__data_prop_graph is not None):
+                # update affected lines of the job matrix and recalculate the latency using the updated WCRT and LET values
+                lat = self.__update_e2e_lat(changed)
+
+                if self.__cec.e2e_deadline is not None:
+                    assert lat <= self.__cec.e2e_deadline, "The end-to-end deadline of CEC " + self.__cec.name + " has been violated (latency : " + str(lat) + ", deadline: " + str(self.__cec.e2e_deadline) + ")"
+            elif (self.__data_prop_graph is None):
+                # no graph has been built (streaming analysis): recalculate the latency line by line using the updated WCRT and LET values
+                lat, _ = self.stream_analysis(margins=False)
+            else:
+                # build new data propagation graph using the updated WCRT and LET values
+                self.build_graph()
+                # calculate chain latency using the updated WCRTs and LETs
+                lat = self.calculate_e2e_lat()
+
+        finally:
+            # undo updated wcrts and lets. Necessary as others chains use the same task objects
+            # -> else leads to updating WCRTs/LETs multiple times if a task is part of more than one cec
+            for task in self.__cec.tasks:
+                if task.name in robustness_margins.keys():
+                    task.wcrt -= robustness_margins[task.name]
+                if task.semantic is Semantics.LET:
+                    if task.name in delta_let.keys():
+                        task.let -= delta_let[task.name]
 
+        if lat <= self.__cec.e2e_deadline:
+            return True, lat
+        else:
+            return False, lat
 
-        # build new data propagation graph using the updated WCRT and LET values
-        self.build_graph()
-        # calculate chain latency using the updated WCRTs and LETs
-        lat = self.calculate_e2e_lat()
 
+    def sweep(self, scenarios, margins=False):
+        """ what-if analysis: determines the max. e2e latency (and the robustness margins) of the cec for each scenario 
+        of a sweep. A scenario overrides parameters of some of the chain's tasks (absolute values, cf. sweep_parameters), 
+        e.g. {'T1': {'wcrt': 5}, 'T3': {'release_offset': 2, 'let': 4}}.
+        The graph is built once (if that has not been done before) and remains untouched: for each scenario, only the lines
+        of the job matrix affected by the overrides are reinstantiated and reconnected, distances are only propagated from 
+        the first modified line on (cf. __update_lines()). The task parameters are restored afterwards.
 
-        # undo updated wcrts and lets. Necessary as others chains use the same task objects
-        # -> else leads to updating WCRTs/LETs multiple times if a task is part of more than one cec
-        for task in self.__cec.tasks:
-            if task.name in robustness_margins.keys():
-                task.wcrt -= robustness_margins[task.name]
-            if task.semantic is Semantics.LET:
-                if task.name in delta_let.keys():
-                    task.let -= delta_let[task.name]
+        :param scenarios: list of dicts, task name -> dict (parameter name -> value)
+        :param margins: bool, calculate robustness margins, delta let values and slack for each scenario as well
+        :rtype: list of dicts, one row for each scenario (keys: scenario, latency, deadline_met 
+                [, robustness_margins, delta_let, slack]). Latency is None if no data path connects the first and the last task.
+        """
+        assert (margins is False) or (self.__reduce_roots is False), "Robustness margins cannot be calculated if only representative root jobs have been instantiated!"
 
-        if self.__max_e2e_lat <= self.__cec.e2e_deadline:
-            return True, lat
+        if (self.__data_prop_graph is None):
+            self.build_graph()
+
+        tasks = {task.name: task for task in self.__cec.tasks}
+
+        table = list()
+        for scenario in scenarios:
+            # original values of all overridden parameters: (task name, parameter name) -> value
+            original = dict()
+            try:
+                for task_name, overrides in scenario.items():
+                    assert task_name in tasks.keys(), "Task " + str(task_name) + " is not part of CEC " + self.__cec.name
+                    for parameter, value in overrides.items():
+                        assert parameter in self.sweep_parameters, "Parameter " + str(parameter) + " cannot be swept, choose one of " + str(self.sweep_parameters)
+                        original.setdefault((task_name, parameter), getattr(tasks[task_name], parameter))
+                        setattr(tasks[task_name], parameter, value)
+
+                changed = set(task_name for (task_name, parameter), value in original.items() if getattr(tasks[task_name], parameter) != value)
+                table.append(self.__evaluate_scenario(scenario, changed, margins))
+            finally:
+                for (task_name, parameter), value in original.items():
+                    setattr(tasks[task_name], parameter, value)
+
+        return table
+
+
+    def __evaluate_scenario(self, scenario, changed, margins):
+        """ determines the latency (and margins) of the cec for the current task parameters, cf. sweep()
+
+        :param scenario: dict
+        :param changed: set of task names
+        :param margins: bool
+        :rtype: dict
+        """
+        job_mtx, in_degree, out_degree, succ_end, dist = self.__update_lines(changed)
+        try:
+            latency = self.__leaf_latency(job_mtx, in_degree, out_degree, dist)
+        except ValueError:
+            # none of the leaf nodes can be reached
+            latency = None
+
+        row = {'scenario': scenario, 'latency': latency, 'deadline_met': None}
+        if (latency is not None) and (self.__cec.e2e_deadline is not None):
+            row['deadline_met'] = (latency <= self.__cec.e2e_deadline)
+
+        if margins:
+            line_margins = self.__init_margins()
+            for i in range(len(job_mtx)):
+                jobs = job_mtx[i]
+                consumers = job_mtx[i + 1] if (jobs.task_name != self.__last_task_name) else None
+                if self.__line_margins(line_margins, jobs, consumers, in_degree[i], out_degree[i], succ_end[i]):
+                    if (jobs.task_name == self.__last_task_name):
+                        self.__last_task_margins(line_margins, jobs, latency)
+            row['robustness_margins'], row['delta_let'], row['slack'] = self.__min_margins(line_margins)
+
+        return row
+
+
+    def exact_margins(self):
+        """ determines the exact robustness margin (max. WCRT increase) of each BET task and the exact delta let value 
+        (max. LET increase) of each LET task of the cec by binary search. Each probe reanalyses the chain incrementally 
+        with the parameter of a single task increased (cf. sweep()). As by calculate_robustness_margins(), increases are 
+        bounded by the task's own deadline and by transition deadlines of subchains, but the e2e deadline of the cec is 
+        checked by the probes instead of the closed-form terms. The latency of the cec does not decrease if a WCRT or LET 
+        is increased, thus the largest increase that does not violate the e2e deadline is found using a logarithmic 
+        number of probes.
+        Other than the closed-form values, each exact margin is only guaranteed if all other tasks keep their parameters.
+        The robustness margins of LET tasks (LET - WCRT) do not affect the latency and remain unchanged.
+
+        :rtype: dict, dict
+        """
+        assert self.__reduce_roots is False, "Robustness margins cannot be calculated if only representative root jobs have been instantiated!"
+
+        tasks_rm = dict()
+        tasks_delta_let = dict()
+        for task in self.__tasks:
+            if (task.semantic == Semantics.BET):
+                tasks_rm[task.name] = self.__max_increase(task, 'wcrt', self.__margin_bound(task, 'wcrt'))
+            elif (task.semantic == Semantics.LET):
+                if not (task.wcrt is None or task.wcrt == 'unknown' or task.wcrt == 'n/a'):
+                    tasks_rm[task.name] = max(task.let - task.wcrt, 0)
+                tasks_delta_let[task.name] = self.__max_increase(task, 'let', self.__margin_bound(task, 'let'))
+
+        return tasks_rm, tasks_delta_let
+
+
+    def __margin_bound(self, task, parameter):
+        """ upper bound on the increase of a task's WCRT or LET that does not depend on the e2e deadline of the cec
+        (first and third option, cf. __line_margins() and __last_task_margins()). As by __min_margins(), 
+        negative terms are ignored.
+
+        :param task: TORO extTask
+        :param parameter: string, 'wcrt' or 'let'
+        :rtype: int or None (no non-negative term)
+        """
+        period = task.in_event_model.P
+        if (parameter == 'wcrt'):
+            deadline = task.deadline if (task.deadline is not None) else period
+            terms = [deadline - task.release_offset - task.wcrt]
+            if (task.name == self.__last_task_name) and (getattr(self.__cec, 'transition_deadline', None) not in [None, 0]):
+                terms.append(self.__cec.transition_deadline - period - task.wcrt + task.bcrt)
         else:
-            return False, lat
+            terms = [period]
+            if not hasattr(task, 'sl_ic_task'):
+                # not valid for (SL) LET interconnect tasks, cf. __line_margins()
+                terms.append(period - task.release_offset - task.let)
+
+        terms = [x for x in terms if x >= 0]
+        if (len(terms) == 0):
+            return None
+        return min(terms)
+
+
+    def __max_increase(self, task, parameter, bound):
+        """ binary search for the largest increase (0 <= increase <= bound) of a task parameter
+        that does not lead to a violation of the e2e deadline of the cec
+
+        :param task: TORO extTask
+        :param parameter: string, 'wcrt' or 'let'
+        :param bound: int or None, upper bound of the increase
+        :rtype: int
+        """
+        if (self.__cec.e2e_deadline is None):
+            return bound if (bound is not None) else 0
+        if (bound is None):
+            # every data path contains a job of the task, thus its WCRT or LET cannot exceed the e2e deadline
+            bound = self.__cec.e2e_deadline
+
+        def deadline_met(increase):
+            scenario = {task.name: {parameter: getattr(task, parameter) + increase}}
+            return self.sweep([scenario])[0]['deadline_met'] is True
+
+        if deadline_met(bound):
+            return bound
+        if not deadline_met(0):
+            return 0
+
+        # invariant: increasing the parameter by lower is safe, increasing it by upper is not
+        lower, upper = 0, bound
+        while (upper - lower > 1):
+            increase = (lower + upper) // 2
+            if deadline_met(increase):
+                lower = increase
+            else:
+                upper = increase
+        return lower
+
+
+    def __update_e2e_lat(self, changed):
+        """ redetermines the max e2e latency of the cec after the parameters of some tasks have been changed
+        without modifying the graph, cf. __update_lines()
+
+        :param changed: set of task names
+        :rtype: int
+        """
+        job_mtx, in_degree, out_degree, _, dist = self.__update_lines(changed)
+        return self.__leaf_latency(job_mtx, in_degree, out_degree, dist)
+
+
+    def __update_lines(self, changed):
+        """ redetermines the lines of the job matrix and the longest distances to all jobs after the parameters 
+        of some tasks have been changed without modifying the graph: lines of the job matrix, edges and weights 
+        are copied and only updated if they are affected by the changes.
+
+        :param changed: set of task names
+        :rtype: list of JobTables, in degree, out degree, index of the first unreachable consumer and distances (lists of np.ndarray)
+        """
+        if (self.__row_dist is None):
+            # longest distances to all jobs in the unmodified graph, reused for all lines before the first modified one
+            self.__row_dist = self.__distances(self.__job_mtx, self.__edges, self.__weights)
+
+        rows = len(self.__job_mtx)
+        job_mtx = list(self.__job_mtx)
+        in_degree = list(self.__in_degree)
+        out_degree = list(self.__out_degree)
+        succ_end = list(self.__succ_end)
+        edges = list(self.__edges)
+        weights = list(self.__weights)
+
+        # reinstantiate jobs of updated tasks, the number of jobs of the following line may change as well
+        line_changed = [False] * rows
+        for l in range(rows):
+            task = job_mtx[l].task
+            # representative root jobs depend on the consumers of the root jobs as well
+            representatives_changed = (l == 0) and (self.__reduce_roots is True) and (rows > 1) and (job_mtx[1].task_name in changed)
+            if (task.name in changed) or ((l > 0) and line_changed[l - 1]) or representatives_changed:
+                jobs = self.__instantiate_line(task, job_mtx[l - 1] if (l > 0) else None)
+                line_changed[l] = not self.__equal_jobs(jobs, job_mtx[l])
+                job_mtx[l] = jobs
+        in_degree[0] = np.zeros(len(job_mtx[0]), dtype=np.int64)
+        out_degree[-1] = np.zeros(len(job_mtx[-1]), dtype=np.int64)
+        succ_end[-1] = np.zeros(len(job_mtx[-1]), dtype=np.int64)
+
+        # redetermine data paths between affected lines, changed degrees propagate to the following line
+        pair_changed = [False] * (rows - 1)
+        out_degree_changed = [False] * rows
+        in_degree_changed = [False] * rows
+        for i in range(rows - 1):
+            if line_changed[i] or line_changed[i + 1] or in_degree_changed[i]:
+                src, dst, out_deg, succ_end[i], in_deg = self.__connect(job_mtx[i], job_mtx[i + 1], in_degree[i], i == 0)
+                out_degree_changed[i] = not np.array_equal(out_deg, out_degree[i])
+                in_degree_changed[i + 1] = not np.array_equal(in_deg, in_degree[i + 1])
+                out_degree[i] = out_deg
+                in_degree[i + 1] = in_deg
+                edges[i] = (src, dst)
+                pair_changed[i] = True
+
+        # recalculate weights of affected edges: weights depend on whether the consumer leads to a dead end
+        first_changed = None
+        for i in range(rows - 1):
+            if pair_changed[i] or out_degree_changed[i + 1]:
+                weights[i] = self.__weigh(job_mtx[i], job_mtx[i + 1], edges[i][0], edges[i][1], in_degree[i], out_degree[i + 1])
+                if first_changed is None:
+                    first_changed = i
+
+        # longest distances only have to be redetermined for lines following the first modified edges
+        if first_changed is None:
+            dist = self.__row_dist
+        else:
+            dist = self.__row_dist[:first_changed + 1]
+            # distances to the root jobs are always 0, but the number of (representative) root jobs may have changed
+            dist[0] = np.zeros(len(job_mtx[0]), dtype=np.float64)
+            for i in range(first_changed, rows - 1):
+                dist.append(self.__propagate(dist[i], edges[i], weights[i], len(job_mtx[i + 1])))
+
+        return job_mtx, in_degree, out_degree, succ_end, dist
+
+
+    def __distances(self, job_mtx, edges, weights):
+        """ determines the longest distance from the root nodes (jobs of the first line) to every job
+        by propagating distances line by line
+
+        :param job_mtx: list of TORO JobTables
+        :param edges: list of (np.ndarray, np.ndarray)
+        :param weights: list of (np.ndarray, np.ndarray)
+        :rtype: list of np.ndarray
+        """
+        dist = [np.zeros(len(job_mtx[0]), dtype=np.float64)]
+        for i in range(len(job_mtx) - 1):
+            dist.append(self.__propagate(dist[i], edges[i], weights[i], len(job_mtx[i + 1])))
+        return dist
+
+
+    @staticmethod
+    def __propagate(dist, edges, weights, size):
+        """ determines the longest distances to the jobs of a line from the distances to the jobs of the previous line,
+        jobs that cannot be reached are assigned -infinity
+
+        :param dist: np.ndarray, distances to the producers
+        :param edges: (np.ndarray, np.ndarray), producer and consumer indices
+        :param weights: (np.ndarray, np.ndarray), edge weights and edges leading to a dead end
+        :param size: int, number of consumers
+        :rtype: np.ndarray
+        """
+        src, dst = edges
+        weight = np.where(weights[1], -np.inf, weights[0].astype(np.float64))
+        new_dist = np.full(size, -np.inf, dtype=np.float64)
+        np.maximum.at(new_dist, dst, dist[src] + weight)
+        return new_dist
+
+
+    def __leaf_latency(self, job_mtx, in_degree, out_degree, dist):
+        """ returns the longest distance to any of the leaf nodes (jobs of the last task with predecessors but without successors)
+
+        :param job_mtx: list of TORO JobTables
+        :param in_degree: list of np.ndarray
+        :param out_degree: list of np.ndarray
+        :param dist: list of np.ndarray
+        :rtype: int
+        """
+        leaf_dist = [dist[i][(in_degree[i] != 0) & (out_degree[i] == 0)] for i in range(len(job_mtx)) if job_mtx[i].task_name == self.__last_task_name]
+        return self.__max_latency(leaf_dist)
+
+
+    @staticmethod
+    def __max_latency(leaf_dist):
+        """ returns the longest distance to any of the leaf nodes
+
+        :param leaf_dist: list of np.ndarray, distances to the leaf nodes
+        :rtype: int
+        """
+        leaf_dist = np.concatenate(leaf_dist)
+        if leaf_dist.size == 0:
+            # same behaviour as the graph wrappers
+            raise ValueError("None of the leaf nodes can be reached from the root nodes.")
+
+        length = float(leaf_dist.max())
+        if length.is_integer():
+            return int(length)
+        return length
+
+
+    def __equal_jobs(self, jobs1, jobs2):
+        """ compares the read and data intervals as well as the WCRTs and LETs (edge weights) of two job tables
+
+        :param jobs1: TORO JobTable
+        :param jobs2: TORO JobTable
+        :rtype: bool
+        """
+        return (len(jobs1) == len(jobs2) and jobs1.semantic == jobs2.semantic and jobs1.wcrt == jobs2.wcrt and jobs1.let == jobs2.let and np.array_equal(jobs1.Rmin, jobs2.Rmin) and np.array_equal(jobs1.Rmax, jobs2.Rmax)
+                and np.array_equal(jobs1.Dmin, jobs2.Dmin) and np.array_equal(jobs1.Dmax, jobs2.Dmax))
 
 
 
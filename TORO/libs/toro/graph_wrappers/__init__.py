@@ -3,6 +3,76 @@ Created on 22.10.2020
 
 :Authors:
          - Alex Bendrick
+
+Registry of all graph wrappers. Wrappers are only imported once they are requested,
+so TORO can be used on hosts where not every graph library (e.g. graph-tool) is installed.
 '''
-from .networkx_wrapper import Graph
-from .graphtool_wrapper import Graph
\ No newline at end of file
+import importlib
+
+## registry of all graph wrappers: backend name -> wrapper module
+backends = {
+    "NX": "networkx_wrapper",
+    "GT": "graphtool_wrapper",
+    "DAG": "dag_wrapper",
+    "NP": "numpy_wrapper",
+}
+
+## backend that is used if none has been selected explicitly
+default_backend = "auto"
+
+## the "auto" policy uses the NumPy wrapper for graphs with at least this many nodes
+auto_np_threshold = 500
+
+
+def get_backend(name=None, size=None, vis=False):
+    """ returns the (lazily imported) wrapper module of a graph backend.
+    The "auto" policy selects the NetworkX wrapper if the graph shall be plotted (only
+    wrapper supporting visualisation), the NumPy wrapper for large graphs and the DAG
+    wrapper otherwise, depending on the backends being available.
+
+    :param name: string, one of the keys in backends or "auto"
+    :param size: int, (estimated) number of nodes of the graph
+    :param vis: bool, graph will be plotted
+    :rtype: graph wrapper module
+    """
+    if name is None:
+        name = default_backend
+
+    if name == "auto":
+        if vis is True:
+            candidates = ["NX"]
+        elif (size is not None) and (size >= auto_np_threshold):
+            candidates = ["NP", "DAG"]
+        else:
+            candidates = ["DAG"]
+
+        for candidate in candidates:
+            if is_available(candidate):
+                return get_backend(candidate)
+        raise ImportError("None of the graph backends " + str(candidates) + " can be imported!")
+
+    if name not in backends.keys():
+        raise NotImplementedError("Incompatible graph wrapper \"" + str(name) + "\" selected! Choose one of " + str(list(backends.keys())) + " or \"auto\".")
+
+    return importlib.import_module("." + backends[name], __name__)
+
+
+def is_available(name):
+    """ checks whether a graph backend can be imported on this host
+
+    :param name: string
+    :rtype: bool
+    """
+    try:
+        get_backend(name)
+    except ImportError:
+        return False
+    return True
+
+
+def available_backends():
+    """ returns the names of all backends that can be imported on this host
+
+    :rtype: list
+    """
+    return [name for name in backends.keys() if is_available(name)]
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+-----------
+A dependency free graph wrapper specialised on directed acyclic graphs (DAG).
+Data propagation graphs are layered DAGs: jobs are added row by row (task by task) and
+edges only connect jobs of consecutive rows. Thus, the order in which the nodes are added
+already is a topological order and longest/shortest paths can be determined using a single
+sweep over all nodes in O(V+E) instead of running Bellman-Ford in O(V*E) for each root node.
+"""
+
+from .graph_wrapper import GraphWrapper as wrapper
+
+from typing import Dict, List, Union, Tuple
+from .. import model
+
+
+class Graph(wrapper):
+    """ This class implements a lightweight DAG wrapper that does not depend on any graph library """
+
+    def __init__(self) -> None:
+        """ constructor """
+
+        ## list of all nodes (TORO jobs) in insertion order
+        self.__nodes = list()
+        ## dictionary for mapping TORO jobs to their index in self.__nodes
+        self.__node_to_index = dict()
+
+        ## adjacency lists: successor indices of each node
+        self.__successors = list()
+        ## edge weights stored in parallel to self.__successors
+        self.__weights = list()
+        ## position of each successor in the adjacency list of a node: successor index -> position
+        self.__positions = list()
+        ## adjacency lists: predecessor indices of each node
+        self.__predecessors = list()
+
+        ## flag: the insertion order of the nodes is a topological order (all edges point 'forward')
+        self.__ordered = True
+
+
+
+    #################
+    ## build graph ##
+    #################
+
+    def add_node(self, node:model.Job) -> None:
+        """ add a job to the graph
+
+        :param node: TORO Job object
+        """
+        self.__node_to_index[node] = len(self.__nodes)
+        self.__nodes.append(node)
+        self.__successors.append(list())
+        self.__weights.append(list())
+        self.__positions.append(dict())
+        self.__predecessors.append(list())
+
+
+    def add_edge(self, node1:model.Job, node2:model.Job) -> None:
+        """ connects two nodes of the graph using a directed edge
+
+        :param node1: TORO Job object
+        :param node1: TORO Job object
+        """
+        u = self.__node_to_index[node1]
+        v = self.__node_to_index[node2]
+
+        if v in self.__positions[u]:
+            # no parallel edges (same behaviour as the NetworkX wrapper)
+            return
+
+        if v <= u:
+            # edge points 'backwards', a topological order has to be determined before searching for paths
+            self.__ordered = False
+
+        self.__positions[u][v] = len(self.__successors[u])
+        self.__successors[u].append(v)
+        self.__weights[u].append(0)
+        self.__predecessors[v].append(u)
+
+
+    def set_edge_weight(self, node1:model.Job, node2:model.Job, weight:float, name:str='default') -> None:
+        """ annotates the edge between the two nodes with a weight (of an arbitrary name)
+
+        :param node1: TORO Job object
+        :param node1: TORO Job object
+        :param weight: int
+        :param name: weight name
+        """
+        u = self.__node_to_index[node1]
+        v = self.__node_to_index[node2]
+
+        if(name == 'default'):
+            self.__weights[u][self.__positions[u][v]] = weight
+        else:
+            print("set_edge_weight, name != default not implemented in dag_wrapper.py")
+
+
+
+
+    ##########################
+    ## access graph objects ##
+    ##########################
+
+    def get_nodes(self) -> List[model.Job]:
+        """ returns a list of all nodes (TORO jobs) that are currently being stored in the graph
+
+        :rtype: list
+        """
+        return self.__nodes
+
+
+    def get_edges(self) -> List[List[model.Job]]:
+        """ returns a list of all edges of the graph.
+        An edge itself is described as a list of two TORO jobs: [predecessor, successor]
+
+        :rtype: list
+        """
+        nodes = self.__nodes
+        return [(nodes[u], nodes[v]) for u in range(len(nodes)) for v in self.__successors[u]]
+
+
+    def get_predecessors(self, node:model.Job) -> List[model.Job]:
+        """ returns a list of all predecessors (TORO jobs) of a given node
+
+        :param node: TORO Job object
+        :rtype: list
+        """
+        return [self.__nodes[u] for u in self.__predecessors[self.__node_to_index[node]]]
+
+
+    def get_successors(self, node:model.Job) -> List[model.Job]:
+        """ returns a list of all successors (TORO jobs) of a given node
+
+        :param node: TORO Job object
+
+        :rtype: list
+        """
+        return [self.__nodes[v] for v in self.__successors[self.__node_to_index[node]]]
+
+
+    def get_in_degree(self, node:model.Job) -> int:
+        """ returns the number of predecessors (args = 'in') of a given node (TORO job)
+
+        :param node: TORO Job object
+        :rtype: int
+        """
+        return len(self.__predecessors[self.__node_to_index[node]])
+
+
+    def get_out_degree(self, node:model.Job) -> int:
+        """ returns the number of successors (args = 'out) of a given node (TORO job)
+
+        :param node: TORO Job object
+        :rtype: int
+        """
+        return len(self.__successors[self.__node_to_index[node]])
+
+
+
+
+    ####################
+    ## graph analysis ##
+    ####################
+
+    def get_longest_path_length(self, start:Union[None, model.Job]=None, end:Union[None, model.Job]=None,
+                                root_nodes:Union[None, List[model.Job]]=None, leaf_nodes:Union[None, List[model.Job]]=None) -> int:
+        """ Calculates the length of the longest path that connects two nodes (start and end)
+        or just the longest path that can be found in the graph between any of the root and leaf nodes.
+        A single sweep over the topologically ordered nodes starting from all roots at once is used.
+
+        :param start: TORO Job object
+        :param end: TORO Job object
+        :param root_nodes: list of TORO Job objects
+        :param leaf_nodes: list of TORO Job objects
+        :rtype: int
+        """
+        if not ((start is not None) and (end is not None)):
+            roots = [self.__node_to_index[x] for x in root_nodes if self.get_out_degree(x) != 0]
+            leaves = [self.__node_to_index[x] for x in leaf_nodes if self.get_in_degree(x) != 0]
+
+            dist = self.__sweep(roots, longest=True)
+
+            # max() raises a ValueError if no leaf is reachable (same behaviour as the NetworkX wrapper)
+            return max([dist[v] for v in leaves if dist[v] is not None])
+        else:
+            dist = self.__sweep([self.__node_to_index[start]], longest=True)
+            length = dist[self.__node_to_index[end]]
+            if length is None:
+                raise ValueError("No path between " + str(start) + " and " + str(end) + " exists.")
+            return length
+
+
+    def get_shortest_path_length(self, start:model.Job, end:model.Job) -> int:
+        """ calculates the length of the shortest path that connects two nodes (start and end)
+
+        :param start: TORO Job object
+        :param end: TORO Job object
+        :rtype: int
+        """
+        dist = self.__sweep([self.__node_to_index[start]], longest=False)
+        length = dist[self.__node_to_index[end]]
+        if length is None:
+            raise ValueError("No path between " + str(start) + " and " + str(end) + " exists.")
+        return length
+
+
+    def get_all_paths(self, start:model.Job, end:model.Job) -> List[Tuple[Tuple[model.Job, model.Job], int]]:
+        """ returns a list of all paths that connect start and end as well as the corresponding path length
+        A path is a list of edges: edge = [predecnessor, successor]
+
+        :param start: TORO Job object
+        :param end: TORO Job object
+        :rtype: list of paths and lengths
+        """
+        s = self.__node_to_index[start]
+        t = self.__node_to_index[end]
+
+        p_list = list()
+
+        # iterative depth first search, each stack entry holds a partial path and its length
+        stack = [([s], 0)]
+        while stack:
+            path, length = stack.pop()
+            u = path[-1]
+            if u == t:
+                p_list.append(([self.__nodes[x] for x in path], length))
+                continue
+            for v, w in zip(self.__successors[u], self.__weights[u]):
+                stack.append((path + [v], length + w))
+
+        return p_list
+
+
+
+    def __topological_order(self) -> List[int]:
+        """ returns the node indices in topological order. If all edges point 'forward'
+        with respect to the insertion order (the case for data propagation graphs) the insertion
+        order is used directly, otherwise Kahn's algorithm is applied.
+
+        :rtype: list
+        """
+        if self.__ordered:
+            return range(len(self.__nodes))
+
+        in_degree = [len(pred) for pred in self.__predecessors]
+        queue = [u for u in range(len(self.__nodes)) if in_degree[u] == 0]
+        order = list()
+        while queue:
+            u = queue.pop()
+            order.append(u)
+            for v in self.__successors[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    queue.append(v)
+
+        assert len(order) == len(self.__nodes), "The graph contains cycles, paths can only be determined for DAGs!"
+        return order
+
+
+    def __sweep(self, sources:List[int], longest:bool=True) -> List[Union[None, float]]:
+        """ determines the longest (or shortest) distance from any of the sources to every node
+        by relaxing the outgoing edges of all nodes in topological order.
+        Nodes that cannot be reached from any source are assigned None.
+
+        :param sources: list of node indices
+        :param longest: bool
+        :rtype: list
+        """
+        dist = [None] * len(self.__nodes)
+        for s in sources:
+            dist[s] = 0
+
+        successors = self.__successors
+        weights = self.__weights
+        for u in self.__topological_order():
+            d = dist[u]
+            if d is None:
+                continue
+            for v, w in zip(successors[u], weights[u]):
+                candidate = d + w
+                current = dist[v]
+                if (current is None) or (longest and candidate > current) or (not longest and candidate < current):
+                    dist[v] = candidate
+
+        return dist
+
+
+
+    ###########################
+    ## plot helper functions ##
+    ###########################
+
+    def prepare_visualisation(self, hierarchy): # pragma: no cover
+        """ """
+        raise NotImplementedError("The DAG implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def set_node_position(self, node, job=None): # pragma: no cover
+        """ place a node in a coordinate system and assign a label
+
+        :param node: TORO Job object or node id
+        :param job: TORO Job object represented by the node
+        """
+        raise NotImplementedError("The DAG implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def draw_reachability_graph(self, **kwargs): # pragma: no cover
+        """ draw the reachability graph generated for a given cause-effect-chain """
+        raise NotImplementedError("The DAG implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def draw_intervals(self): # pragma: no cover
+        """ draw read and data intervals """
+        raise NotImplementedError("The DAG implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def plot(self): # pragma: no cover
+        """ plot reachability graph """
+        raise NotImplementedError("The DAG implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
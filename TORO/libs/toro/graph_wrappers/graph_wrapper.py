@@ -63,6 +63,37 @@ class GraphWrapper(ABC): # pragma: no cover
         """
         pass
 
+    # bulk variants of the methods above: nodes may be any hashable objects (e.g. TORO jobs or integer job ids).
+    # The default implementations add/annotate one node or edge after another, array based wrappers override them.
+
+    def add_nodes(self, nodes:List) -> None:
+        """ add several nodes to the graph
+
+        :param nodes: iterable of nodes
+        """
+        for node in _as_list(nodes):
+            self.add_node(node)
+
+    def add_edges(self, nodes1:List, nodes2:List) -> None:
+        """ connects nodes1[i] and nodes2[i] using a directed edge for every i
+
+        :param nodes1: iterable of nodes (predecessors)
+        :param nodes2: iterable of nodes (successors)
+        """
+        for node1, node2 in zip(_as_list(nodes1), _as_list(nodes2)):
+            self.add_edge(node1, node2)
+
+    def set_edge_weights(self, nodes1:List, nodes2:List, weights:List, name:str = 'default') -> None:
+        """ annotates the edges between nodes1[i] and nodes2[i] with weights[i] for every i
+
+        :param nodes1: iterable of nodes (predecessors)
+        :param nodes2: iterable of nodes (successors)
+        :param weights: iterable of int
+        :param name: weight name
+        """
+        for node1, node2, weight in zip(_as_list(nodes1), _as_list(nodes2), _as_list(weights)):
+            self.set_edge_weight(node1, node2, weight, name)
+
 
     ##########################
     ## access graph objects ##
@@ -176,10 +207,11 @@ class GraphWrapper(ABC): # pragma: no cover
         pass
 
     @abstractmethod
-    def set_node_position(self, node:model.Job) -> None:
+    def set_node_position(self, node:model.Job, job:model.Job = None) -> None:
         """ place a node in a coordinate system and assign a label
 
-        :param node: TORO Job object
+        :param node: TORO Job object or node id
+        :param job: TORO Job object represented by the node (if the node itself is not a job)
         """
         pass
 
@@ -196,4 +228,16 @@ class GraphWrapper(ABC): # pragma: no cover
     @abstractmethod
     def plot(self) -> None:
         """ plot reachability graph """
-        pass
\ No newline at end of file
+        pass
+
+
+
+def _as_list(values) -> List:
+    """ converts NumPy arrays to lists of python scalars, other iterables are returned as is
+
+    :param values: iterable
+    :rtype: iterable
+    """
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return values
@@ -271,10 +271,11 @@ class Graph(wrapper):
         raise NotImplementedError("The graph-tool implementation does not support plooting the reachability graph yet!")
 
     
-    def set_node_position(self, node): # pragma: no cover
+    def set_node_position(self, node, job=None): # pragma: no cover
         """ place a node in a coordinate system and assign a label
 
-        :param node: TORO Job object
+        :param node: TORO Job object or node id
+        :param job: TORO Job object represented by the node
         """
         raise NotImplementedError("The graph-tool implementation does not support plooting the reachability graph yet!")
 
@@ -266,6 +266,8 @@ class Graph(wrapper):
         self.__nx_labels = dict()
         ## dictionary for storing a node's position
         self.__job_position = dict()
+        ## dictionary for mapping nodes to the TORO jobs they represent
+        self.__jobs = dict()
         ## dictionary: store order of tasks in the caue-effect-chain
         self.__node_hierarchy = hierarchy
         ## offset for y-spacing of nodes when drawing reachability graph
@@ -280,15 +282,19 @@ class Graph(wrapper):
                 self.__last_task_name = task_name       
 
 
-    def set_node_position(self, node): # pragma: no cover
+    def set_node_position(self, node, job=None): # pragma: no cover
         """ place a node in a coordinate system and assign a label
 
-        :param node: TORO Job object
+        :param node: TORO Job object or node id
+        :param job: TORO Job object represented by the node (if the node itself is not a job)
         """
+        if job is None:
+            job = node
+        self.__jobs[node] = job
 
-        #self.__nx_labels[node] = node.task_name + "_" + str(node.job_number)
-        self.__nx_labels[node] = str(node.job_number)
-        self.__job_position[node] = ((node.job_number - 1) * node.period + node.offset, self.__node_hierarchy[node.task_name]*self.__hierarchy_offset)
+        #self.__nx_labels[node] = job.task_name + "_" + str(job.job_number)
+        self.__nx_labels[node] = str(job.job_number)
+        self.__job_position[node] = ((job.job_number - 1) * job.period + job.offset, self.__node_hierarchy[job.task_name]*self.__hierarchy_offset)
 
 
     def draw_reachability_graph(self, **kwargs): # pragma: no cover
@@ -334,9 +340,10 @@ class Graph(wrapper):
 
     def draw_intervals(self): # pragma: no cover
         """ draw read and data intervals """
-        jobs = list(self.__graph.nodes)
+        nodes = list(self.__graph.nodes)
            
-        for job in jobs:
+        for node in nodes:
+            job = self.__jobs.get(node, node)
 
             if (job.semantic is Semantics.BET):
                 tmp = (job.job_number - 1) * job.period + job.offset + job.wcrt
@@ -351,7 +358,7 @@ class Graph(wrapper):
                 y_drawingOffset = 2
 
 
-            if (job.task_name != self.__first_task_name) and (self.get_in_degree(job) == 0):
+            if (job.task_name != self.__first_task_name) and (self.get_in_degree(node) == 0):
                 continue
 
             if (job.task_name != self.__first_task_name):
@@ -0,0 +1,536 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+-----------
+The graph wrapper based on NumPy arrays. TORO jobs are mapped to integer ids, edges are
+buffered while the graph is built and compressed into a CSR (compressed sparse row) adjacency
+with a float weight vector once the graph is queried. Nodes, edges and weights can also be
+added in bulk from arrays, integer nodes (e.g. job ids) are used as ids directly. Paths are searched using a level
+synchronous topological sweep that relaxes all edges leaving a level at once.
+"""
+
+from .graph_wrapper import GraphWrapper as wrapper
+from .graph_wrapper import _as_list
+
+import numpy as np
+from bisect import bisect_left
+
+from typing import Dict, List, Union, Tuple
+from .. import model
+
+
+class Graph(wrapper):
+    """ This class implements the array based graph wrapper """
+
+    def __init__(self, dtype=np.float64) -> None:
+        """ constructor
+
+        :param dtype: NumPy float type used for edge weights (np.float32 or np.float64)
+        """
+
+        ## list of all nodes (TORO jobs), a job's id is its index in this list
+        self.__nodes = list()
+        ## dictionary for mapping TORO jobs to their id
+        self.__node_to_id = dict()
+
+        ## flag: every node is an integer that equals its id (e.g. job ids), no mapping needed for bulk operations
+        self.__identity_ids = True
+
+        ## edge buffers (job ids and weights) filled while adding single edges
+        self.__buffer_src = list()
+        self.__buffer_dst = list()
+        self.__buffer_weights = list()
+        ## edge buffers as list of (source ids, target ids, weights) array chunks, filled by bulk operations
+        self.__chunks = list()
+
+        ## in/out degree of every node, kept up to date while building the graph so that
+        ## degree queries in between adding edges do not require rebuilding the CSR arrays
+        self.__in_degree = list()
+        self.__out_degree = list()
+
+        ## data type of the weight vector
+        self.__dtype = dtype
+
+        ## flag: CSR arrays do not reflect the edge buffers anymore
+        self.__dirty = True
+
+        ## sorted edge keys (source id * number of nodes + target id) in CSR order
+        self.__keys = None
+        ## CSR adjacency: successors of node u are __indices[__indptr[u]:__indptr[u+1]] (sorted by id)
+        self.__indptr = None
+        self.__indices = None
+        ## edge weights in CSR order
+        self.__weights = None
+        ## position of a CSR edge in the (single, compressed) edge buffer chunk
+        self.__buffer_pos = None
+        ## CSR adjacency of the transposed graph (predecessors)
+        self.__in_indptr = None
+        self.__in_indices = None
+        ## python list copies of the CSR arrays, used for fast scalar edge lookups
+        self.__indptr_list = None
+        self.__indices_list = None
+
+
+
+    #################
+    ## build graph ##
+    #################
+
+    def add_node(self, node:model.Job) -> None:
+        """ add a job to the graph
+
+        :param node: TORO Job object
+        """
+        node_id = len(self.__nodes)
+        self.__node_to_id[node] = node_id
+        self.__nodes.append(node)
+        self.__in_degree.append(0)
+        self.__out_degree.append(0)
+        if not (type(node) is int and node == node_id):
+            self.__identity_ids = False
+        self.__invalidate()
+
+
+    def add_nodes(self, nodes:List) -> None:
+        """ add several nodes to the graph
+
+        :param nodes: iterable of nodes
+        """
+        if isinstance(nodes, range) and (nodes.step == 1) and (nodes.start == len(self.__nodes)):
+            # node ids continue the current numbering, keep the identity mapping
+            for node in nodes:
+                self.__node_to_id[node] = node
+            self.__nodes.extend(nodes)
+            self.__in_degree.extend([0] * len(nodes))
+            self.__out_degree.extend([0] * len(nodes))
+            self.__invalidate()
+        else:
+            for node in _as_list(nodes):
+                self.add_node(node)
+
+
+    def add_edge(self, node1:model.Job, node2:model.Job) -> None:
+        """ connects two nodes of the graph using a directed edge
+
+        :param node1: TORO Job object
+        :param node1: TORO Job object
+        """
+        u = self.__node_to_id[node1]
+        v = self.__node_to_id[node2]
+        self.__buffer_src.append(u)
+        self.__buffer_dst.append(v)
+        self.__buffer_weights.append(0)
+        # parallel edges are counted until the edges are compressed, that does not affect whether a degree is zero
+        self.__out_degree[u] += 1
+        self.__in_degree[v] += 1
+        self.__invalidate()
+
+
+    def add_edges(self, nodes1:List, nodes2:List) -> None:
+        """ connects nodes1[i] and nodes2[i] using a directed edge for every i
+
+        :param nodes1: iterable of nodes (predecessors)
+        :param nodes2: iterable of nodes (successors)
+        """
+        src = self.__to_ids(nodes1)
+        dst = self.__to_ids(nodes2)
+        assert src.shape == dst.shape
+
+        self.__invalidate()
+        self.__flush()
+        self.__chunks.append((src, dst, np.zeros(src.size, dtype=self.__dtype)))
+
+        n = len(self.__nodes)
+        self.__out_degree = (np.asarray(self.__out_degree, dtype=np.intp) + np.bincount(src, minlength=n)).tolist()
+        self.__in_degree = (np.asarray(self.__in_degree, dtype=np.intp) + np.bincount(dst, minlength=n)).tolist()
+
+
+    def set_edge_weight(self, node1:model.Job, node2:model.Job, weight:float, name:str='default') -> None:
+        """ annotates the edge between the two nodes with a weight (of an arbitrary name)
+
+        :param node1: TORO Job object
+        :param node1: TORO Job object
+        :param weight: int
+        :param name: weight name
+        """
+        if(name == 'default'):
+            edge = self.__edge_id(self.__node_to_id[node1], self.__node_to_id[node2])
+            self.__weights[edge] = weight
+        else:
+            print("set_edge_weight, name != default not implemented in numpy_wrapper.py")
+
+
+    def set_edge_weights(self, nodes1:List, nodes2:List, weights:List, name:str='default') -> None:
+        """ annotates the edges between nodes1[i] and nodes2[i] with weights[i] for every i
+
+        :param nodes1: iterable of nodes (predecessors)
+        :param nodes2: iterable of nodes (successors)
+        :param weights: iterable of int
+        :param name: weight name
+        """
+        if(name == 'default'):
+            self.__compress()
+            keys = self.__to_ids(nodes1) * len(self.__nodes) + self.__to_ids(nodes2)
+            edges = np.searchsorted(self.__keys, keys)
+            assert np.all(edges < self.__keys.size) and np.array_equal(self.__keys[edges], keys), "Edge does not exist!"
+            self.__weights[edges] = np.asarray(_as_list(weights), dtype=self.__dtype)
+        else:
+            print("set_edge_weights, name != default not implemented in numpy_wrapper.py")
+
+
+
+
+    ##########################
+    ## access graph objects ##
+    ##########################
+
+    def get_nodes(self) -> List[model.Job]:
+        """ returns a list of all nodes (TORO jobs) that are currently being stored in the graph
+
+        :rtype: list
+        """
+        return self.__nodes
+
+
+    def get_edges(self) -> List[List[model.Job]]:
+        """ returns a list of all edges of the graph.
+        An edge itself is described as a list of two TORO jobs: [predecessor, successor]
+
+        :rtype: list
+        """
+        self.__compress()
+
+        src = np.repeat(np.arange(len(self.__nodes)), np.diff(self.__indptr))
+        nodes = self.__nodes
+        return [(nodes[u], nodes[v]) for u, v in zip(src.tolist(), self.__indices.tolist())]
+
+
+    def get_predecessors(self, node:model.Job) -> List[model.Job]:
+        """ returns a list of all predecessors (TORO jobs) of a given node
+
+        :param node: TORO Job object
+        :rtype: list
+        """
+        self.__compress()
+
+        v = self.__node_to_id[node]
+        return [self.__nodes[u] for u in self.__in_indices[self.__in_indptr[v]:self.__in_indptr[v + 1]].tolist()]
+
+
+    def get_successors(self, node:model.Job) -> List[model.Job]:
+        """ returns a list of all successors (TORO jobs) of a given node
+
+        :param node: TORO Job object
+
+        :rtype: list
+        """
+        self.__compress()
+
+        u = self.__node_to_id[node]
+        return [self.__nodes[v] for v in self.__indices[self.__indptr[u]:self.__indptr[u + 1]].tolist()]
+
+
+    def get_in_degree(self, node:model.Job) -> int:
+        """ returns the number of predecessors (args = 'in') of a given node (TORO job)
+
+        :param node: TORO Job object
+        :rtype: int
+        """
+        return self.__in_degree[self.__node_to_id[node]]
+
+
+    def get_out_degree(self, node:model.Job) -> int:
+        """ returns the number of successors (args = 'out) of a given node (TORO job)
+
+        :param node: TORO Job object
+        :rtype: int
+        """
+        return self.__out_degree[self.__node_to_id[node]]
+
+
+
+
+    ####################
+    ## graph analysis ##
+    ####################
+
+    def get_longest_path_length(self, start:Union[None, model.Job]=None, end:Union[None, model.Job]=None,
+                                root_nodes:Union[None, List[model.Job]]=None, leaf_nodes:Union[None, List[model.Job]]=None) -> int:
+        """ Calculates the length of the longest path that connects two nodes (start and end)
+        or just the longest path that can be found in the graph between any of the root and leaf nodes.
+
+        :param start: TORO Job object
+        :param end: TORO Job object
+        :param root_nodes: list of TORO Job objects
+        :param leaf_nodes: list of TORO Job objects
+        :rtype: int
+        """
+        self.__compress()
+
+        if not ((start is not None) and (end is not None)):
+            roots = np.fromiter((self.__node_to_id[x] for x in root_nodes), dtype=np.intp, count=len(root_nodes))
+            leaves = np.fromiter((self.__node_to_id[x] for x in leaf_nodes), dtype=np.intp, count=len(leaf_nodes))
+            # only consider roots and leaves that are actually connected to other nodes
+            roots = roots[np.diff(self.__indptr)[roots] != 0]
+            leaves = leaves[np.diff(self.__in_indptr)[leaves] != 0]
+
+            dist, reached = self.__sweep(roots, longest=True)
+
+            leaves = leaves[reached[leaves]]
+            if leaves.size == 0:
+                # same behaviour as max() of an empty list in the NetworkX wrapper
+                raise ValueError("None of the leaf nodes can be reached from the root nodes.")
+            return self.__to_scalar(dist[leaves].max())
+        else:
+            dist, reached = self.__sweep(np.array([self.__node_to_id[start]], dtype=np.intp), longest=True)
+            v = self.__node_to_id[end]
+            if not reached[v]:
+                raise ValueError("No path between " + str(start) + " and " + str(end) + " exists.")
+            return self.__to_scalar(dist[v])
+
+
+    def get_shortest_path_length(self, start:model.Job, end:model.Job) -> int:
+        """ calculates the length of the shortest path that connects two nodes (start and end)
+
+        :param start: TORO Job object
+        :param end: TORO Job object
+        :rtype: int
+        """
+        self.__compress()
+
+        dist, reached = self.__sweep(np.array([self.__node_to_id[start]], dtype=np.intp), longest=False)
+        v = self.__node_to_id[end]
+        if not reached[v]:
+            raise ValueError("No path between " + str(start) + " and " + str(end) + " exists.")
+        return self.__to_scalar(dist[v])
+
+
+    def get_all_paths(self, start:model.Job, end:model.Job) -> List[Tuple[Tuple[model.Job, model.Job], int]]:
+        """ returns a list of all paths that connect start and end as well as the corresponding path length
+        A path is a list of edges: edge = [predecnessor, successor]
+
+        :param start: TORO Job object
+        :param end: TORO Job object
+        :rtype: list of paths and lengths
+        """
+        self.__compress()
+
+        s = self.__node_to_id[start]
+        t = self.__node_to_id[end]
+
+        indptr = self.__indptr.tolist()
+        indices = self.__indices.tolist()
+        weights = self.__weights.tolist()
+
+        p_list = list()
+
+        # iterative depth first search, each stack entry holds a partial path and its length
+        stack = [([s], 0)]
+        while stack:
+            path, length = stack.pop()
+            u = path[-1]
+            if u == t:
+                p_list.append(([self.__nodes[x] for x in path], self.__to_scalar(length)))
+                continue
+            for e in range(indptr[u], indptr[u + 1]):
+                stack.append((path + [indices[e]], length + weights[e]))
+
+        return p_list
+
+
+
+    ##############################
+    ## array management helpers ##
+    ##############################
+
+    def __to_ids(self, nodes:List) -> np.ndarray:
+        """ maps nodes to their ids
+
+        :param nodes: iterable of nodes
+        :rtype: np.ndarray
+        """
+        if self.__identity_ids:
+            ids = np.asarray(nodes, dtype=np.intp)
+            assert (ids.size == 0) or (ids.min() >= 0 and ids.max() < len(self.__nodes)), "Node does not exist!"
+            return ids
+        return np.fromiter((self.__node_to_id[x] for x in _as_list(nodes)), dtype=np.intp)
+
+
+    def __flush(self) -> None:
+        """ moves single edges from the edge buffer lists to a chunk """
+        if self.__buffer_src:
+            self.__chunks.append((np.asarray(self.__buffer_src, dtype=np.intp),
+                                  np.asarray(self.__buffer_dst, dtype=np.intp),
+                                  np.asarray(self.__buffer_weights, dtype=self.__dtype)))
+            self.__buffer_src = list()
+            self.__buffer_dst = list()
+            self.__buffer_weights = list()
+
+
+    def __invalidate(self) -> None:
+        """ mark the CSR arrays as outdated after nodes or edges have been added """
+        if not self.__dirty:
+            # write weights that have been set on the CSR arrays back to the edge buffers
+            if self.__chunks:
+                self.__chunks[0][2][self.__buffer_pos] = self.__weights
+            self.__dirty = True
+
+
+    def __compress(self) -> None:
+        """ (re)builds the CSR arrays from the edge buffers, parallel edges are merged """
+        if not self.__dirty:
+            return
+
+        # merge all edge buffers into a single chunk
+        self.__flush()
+        if len(self.__chunks) > 1:
+            self.__chunks = [tuple(np.concatenate(x) for x in zip(*self.__chunks))]
+        if self.__chunks:
+            src, dst, buffer_weights = self.__chunks[0]
+        else:
+            src = dst = np.zeros(0, dtype=np.intp)
+            buffer_weights = np.zeros(0, dtype=self.__dtype)
+
+        n = len(self.__nodes)
+
+        # sort edges by (source, target), np.unique also drops parallel edges
+        keys, pos = np.unique(src * n + dst, return_index=True)
+        src = keys // n if n > 0 else keys
+        dst = keys - src * n
+
+        self.__keys = keys
+        self.__buffer_pos = pos
+        self.__indices = dst
+        self.__weights = buffer_weights[pos]
+        self.__indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(src, minlength=n), out=self.__indptr[1:])
+
+        # transposed adjacency for predecessor queries and in-degrees
+        order = np.lexsort((src, dst))
+        self.__in_indices = src[order]
+        self.__in_indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(dst, minlength=n), out=self.__in_indptr[1:])
+
+        self.__indptr_list = self.__indptr.tolist()
+        self.__indices_list = self.__indices.tolist()
+
+        # exact degrees (without parallel edges)
+        self.__out_degree = np.diff(self.__indptr).tolist()
+        self.__in_degree = np.diff(self.__in_indptr).tolist()
+
+        self.__dirty = False
+
+
+    def __edge_id(self, u:int, v:int) -> int:
+        """ returns the CSR position of the edge (u, v)
+
+        :param u: int
+        :param v: int
+        :rtype: int
+        """
+        self.__compress()
+
+        end = self.__indptr_list[u + 1]
+        pos = bisect_left(self.__indices_list, v, self.__indptr_list[u], end)
+        assert pos < end and self.__indices_list[pos] == v, "Edge does not exist!"
+        return pos
+
+
+    def __sweep(self, sources:np.ndarray, longest:bool=True) -> Tuple[np.ndarray, np.ndarray]:
+        """ determines the longest (or shortest) distance from any of the sources to every node.
+        Nodes are processed level by level in topological order (Kahn's algorithm), all edges
+        leaving the current level are relaxed at once.
+
+        :param sources: array of node ids
+        :param longest: bool
+        :rtype: np.ndarray (distances), np.ndarray (bool, node has been reached)
+        """
+        n = len(self.__nodes)
+        dist = np.full(n, -np.inf if longest else np.inf, dtype=np.float64)
+        reached = np.zeros(n, dtype=bool)
+        dist[sources] = 0
+        reached[sources] = True
+
+        indptr = self.__indptr
+        weights = self.__weights.astype(np.float64, copy=False)
+        relax = np.maximum if longest else np.minimum
+
+        # np.diff returns a new array that can be modified in place
+        in_degree = np.diff(self.__in_indptr)
+        frontier = np.flatnonzero(in_degree == 0)
+        while frontier.size > 0:
+            # gather all edges leaving the current level
+            counts = indptr[frontier + 1] - indptr[frontier]
+            total = int(counts.sum())
+            if total == 0:
+                break
+            edges = np.repeat(indptr[frontier] - np.cumsum(counts) + counts, counts) + np.arange(total)
+            src = np.repeat(frontier, counts)
+            dst = self.__indices[edges]
+
+            valid = reached[src]
+            relax.at(dist, dst[valid], dist[src[valid]] + weights[edges[valid]])
+            reached[dst[valid]] = True
+
+            # nodes whose predecessors have all been processed form the next level
+            targets, cnt = np.unique(dst, return_counts=True)
+            in_degree[targets] -= cnt
+            frontier = targets[in_degree[targets] == 0]
+
+        return dist, reached
+
+
+    @staticmethod
+    def __to_scalar(value) -> Union[int, float]:
+        """ convert a path length back to a python scalar, integral values are returned as int
+
+        :param value: float
+        :rtype: int or float
+        """
+        value = float(value)
+        if value.is_integer():
+            return int(value)
+        return value
+
+
+
+    ###########################
+    ## plot helper functions ##
+    ###########################
+
+    def prepare_visualisation(self, hierarchy): # pragma: no cover
+        """ """
+        raise NotImplementedError("The NumPy implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def set_node_position(self, node, job=None): # pragma: no cover
+        """ place a node in a coordinate system and assign a label
+
+        :param node: TORO Job object or node id
+        :param job: TORO Job object represented by the node
+        """
+        raise NotImplementedError("The NumPy implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def draw_reachability_graph(self, **kwargs): # pragma: no cover
+        """ draw the reachability graph generated for a given cause-effect-chain """
+        raise NotImplementedError("The NumPy implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def draw_intervals(self): # pragma: no cover
+        """ draw read and data intervals """
+        raise NotImplementedError("The NumPy implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
+
+
+    def plot(self): # pragma: no cover
+        """ plot reachability graph """
+        raise NotImplementedError("The NumPy implementation does not support plotting the reachability graph, use the NetworkX wrapper instead!")
@@ -6,4 +6,7 @@ Created on 22.10.2020
 '''
 from .io import PrintOuts
 from .io import FileManagement
-from .results_writer import ResultsWriter
\ No newline at end of file
+from .results_writer import ResultsWriter
+from .results_cache import ResultsCache
+from .system_snapshot import SystemSnapshot
+from .results_stream import ResultsStream
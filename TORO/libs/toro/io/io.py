@@ -77,6 +77,29 @@ class FileManagement(object):
             return input(_s)    
     
     
+    def __select_systems(self, names, selection):
+        """ selects systems without prompting the user
+
+        :param names: list of system names (folder or file names)
+        :param selection: string, comma-separated list of system IDs (1 is the first system, 0 selects all systems) or names
+        :rtype: list of indices
+        """
+        indices = list()
+        for item in selection.split(","):
+            item = item.strip()
+            if item in ["0", "all"]:
+                return list(range(len(names)))
+            elif item in names:
+                indices.append(names.index(item))
+            elif item.isdigit() and (1 <= int(item) <= len(names)):
+                indices.append(int(item) - 1)
+            else:
+                print("ERROR: " + item + " is an invalid system selection!")
+                print("Toro terminates.")
+                quit()
+        return sorted(set(indices))
+
+
     def get_system_dirs(self,args):
         print("=======================================================================================")
         print("Searching for systems to analyze in: ") 
@@ -104,7 +127,11 @@ class FileManagement(object):
                     if valid:
                         folders.append(folder)
         
-            if len(folders) == 1:
+            if (len(folders) > 0) and ((getattr(args, 'systems', None) is not None) or (getattr(args, 'headless', False) is True)):
+                # non-interactive selection (all systems by default)
+                for n in self.__select_systems(folders, getattr(args, 'systems', None) or '0'):
+                    dirs.append(os.path.join(args.path + '/csv', folders[n]))
+            elif len(folders) == 1:
                 dirs.append(os.path.join(args.path + '/csv', folders[0]))
             elif len(folders) > 1:
                 print("The following systems have been found:")
@@ -181,6 +208,21 @@ class FileManagement(object):
                     print("  " + str(i) + ": " + tmp[len(tmp) - 1])
                     i += 1
                     
+                if getattr(args, 'systems', None) is not None:
+                    # non-interactive selection of a single system
+                    selection = self.__select_systems([f.split('/')[-1] for f in file_list], args.systems)
+                    if len(selection) != 1:
+                        print("ERROR: Select exactly one Amalthea model.")
+                        print("Toro terminates.")
+                        quit()
+                    return file_list[selection[0]]
+                elif getattr(args, 'headless', False) is True:
+                    if len(file_list) == 1:
+                        return file_list[0]
+                    print("ERROR: Several Amalthea models have been found, select one of them using --systems (headless mode).")
+                    print("Toro terminates.")
+                    quit()
+
                 if len(file_list) == 1:
                     valid_inputs = [1]
                 else:
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Copyright Notice
+================
+Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+Description
+===========
+Persistent on-disk cache of chain analysis results and data propagation graphs.
+Each entry is stored in a directory named after the hash of the analysed content
+(chain parameters and analysis options), thus an entry is invalidated automatically
+as soon as any of the parameters changes. Results are stored as JSON, the graph is
+stored as binary NumPy arrays (.npy) that are memory-mapped when they are loaded.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+
+import numpy as np
+
+
+
+class ResultsCache(object):
+    """
+    This class stores and loads chain analysis results and graphs in/from a cache directory.
+    """
+
+    ## version of the cache format, part of every key: entries written by other versions are never loaded
+    version = 1
+
+    def __init__(self, directory):
+        """
+        :param directory: string, path of the cache directory (created if it does not exist)
+        """
+        ## path of the cache directory
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+        ## cache statistics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+
+    def key(self, *content):
+        """ returns the key of the cache entry of the given content (e.g. chain fingerprint and analysis options).
+        The content must have a deterministic representation (repr()).
+
+        :param content: objects the cached results depend on
+        :rtype: string
+        """
+        return hashlib.sha256(repr((self.version, ) + content).encode('utf-8')).hexdigest()
+
+
+    def contains(self, key):
+        """ checks whether an entry has been stored for a key (does not affect the statistics)
+
+        :param key: string
+        :rtype: bool
+        """
+        return os.path.isdir(self.__path(key))
+
+
+    def load(self, key):
+        """ loads the results and the graph arrays stored for a key.
+        The graph arrays are memory-mapped (read-only).
+
+        :param key: string
+        :rtype: (dict, dict of np.ndarray) or None if there is no (complete) entry for the key
+        """
+        path = self.__path(key)
+        try:
+            with open(os.path.join(path, "results.json"), 'r') as f:
+                results = json.load(f)
+            graph_data = dict()
+            for name in results.pop('graph_arrays'):
+                graph_data[name] = np.load(os.path.join(path, name + ".npy"), mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            # missing or incomplete entry
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return results, graph_data
+
+
+    def store(self, key, results, graph_data=None):
+        """ stores the results and the graph arrays for a key.
+        The entry is written to a temporary directory first and renamed afterwards, thus
+        concurrent processes never load incomplete entries.
+
+        :param key: string
+        :param results: dict, JSON serializable (numpy scalars are converted)
+        :param graph_data: dict of np.ndarray
+        """
+        if graph_data is None:
+            graph_data = dict()
+
+        path = self.__path(key)
+        tmp_path = path + ".tmp%d" % os.getpid()
+        os.makedirs(tmp_path, exist_ok=True)
+        try:
+            for name, array in graph_data.items():
+                np.save(os.path.join(tmp_path, name + ".npy"), np.ascontiguousarray(array))
+
+            entry = dict(results)
+            entry['graph_arrays'] = sorted(graph_data.keys())
+            with open(os.path.join(tmp_path, "results.json"), 'w') as f:
+                json.dump(entry, f, default=self.__to_json)
+
+            os.rename(tmp_path, path)
+        except OSError:
+            # entry has been stored by another process in the meantime
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        self.stores += 1
+
+
+    def clear(self):
+        """ removes all entries from the cache directory """
+        for name in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+    def toString(self):
+        """ print cache statistics to string
+
+        :rtype: string
+        """
+        return ("Results cache %s: %d hits, %d misses, %d stored" % (self.directory, self.hits, self.misses, self.stores))
+
+
+    def __path(self, key):
+        """ returns the path of the directory of a cache entry
+
+        :param key: string
+        :rtype: string
+        """
+        return os.path.join(self.directory, key)
+
+
+    @staticmethod
+    def __to_json(value):
+        """ converts numpy scalars for JSON serialization """
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError("Object of type %s cannot be stored in the results cache" % type(value).__name__)
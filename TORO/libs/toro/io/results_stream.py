@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Copyright Notice
+================
+Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+Description
+===========
+Incremental results file: the results of each cause-effect chain (latency, robustness margins,
+delta let values and slack) are appended as a single line (NDJSON or csv) as soon as the chain has
+been analysed, so the results of all finished chains survive if an analysis is aborted. An aborted
+analysis can be resumed, chains whose results are already stored in the file are not analysed again,
+unless the chain (or one of its tasks) has changed since: each record contains a fingerprint of the chain.
+Results of systems analysed in a normalised time base are stored in the time base of the model.
+"""
+
+import os
+import io
+import csv
+import json
+import hashlib
+
+import numpy as np
+
+
+
+class ResultsStream(object):
+    """
+    This class appends chain analysis results to a NDJSON or csv file and reads them back for resumed runs.
+    """
+
+    ## supported formats
+    formats = ('ndjson', 'csv')
+
+    ## fields of a record, all fields but the chain name are stored as JSON values in csv files
+    fields = ['chain', 'latency', 'transition_latency', 'robustness_margins', 'delta_let', 'slack', 'fingerprint']
+
+    def __init__(self, path, format=None, resume=False, time_base=None):
+        """
+        :param path: string, path of the results file
+        :param format: string, 'ndjson' or 'csv' (default: derived from the file extension)
+        :param resume: bool, keep the records of an existing file (otherwise the file is overwritten)
+        :param time_base: model_parser.TimeBase object, results are converted from the normalised time base
+                          when written and back to it when read (None: results are stored as given)
+        """
+        ## path of the results file
+        self.path = path
+
+        ## time base of the analysed system
+        self.time_base = time_base
+
+        ## format of the results file
+        self.format = format if format is not None else ('csv' if path.endswith('.csv') else 'ndjson')
+        assert self.format in self.formats, "Unknown results stream format %s" % self.format
+
+        ## records of the results file by chain name (only records of previous runs are kept)
+        self.records = dict()
+
+        if (resume is True) and os.path.isfile(self.path):
+            self.__read()
+        else:
+            with open(self.path, 'w', newline='') as file:
+                if self.format == 'csv':
+                    csv.writer(file, delimiter=';', lineterminator='\n').writerow(self.fields)
+
+        self.__file = open(self.path, 'a', newline='')
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    @staticmethod
+    def fingerprint(content):
+        """ returns the fingerprint of a chain stored along with its results
+
+        :param content: object with a deterministic representation (repr()), e.g. a chain fingerprint
+        :rtype: string
+        """
+        return hashlib.sha256(repr(content).encode('utf-8')).hexdigest()
+
+
+    def contains(self, chain_name, fingerprint=None):
+        """ checks whether the results of a chain are stored already
+
+        :param chain_name: string
+        :param fingerprint: string, results stored for a chain with another fingerprint are outdated (None: not checked)
+        :rtype: bool
+        """
+        if chain_name not in self.records:
+            return False
+        return (fingerprint is None) or (self.records[chain_name].get('fingerprint') == fingerprint)
+
+
+    def get(self, chain_name):
+        """ returns the stored results of a chain in the order of analyse_chain()
+
+        :param chain_name: string
+        :rtype: tuple (e2e latency, transition latency, robustness margins, delta let, slack)
+        """
+        record = self.records[chain_name]
+        results = (record['latency'], record['transition_latency'], record['robustness_margins'], record['delta_let'], record['slack'])
+        if self.time_base is not None:
+            return self.time_base.to_base(results)
+        return results
+
+
+    def write(self, chain_name, latency, transition_latency, robustness_margins, delta_let, slack, fingerprint=None):
+        """ appends the results of a chain to the file. The record is flushed to disk before returning.
+        Records of resumed runs are replaced by later records of the same chain.
+
+        :param chain_name: string
+        :param latency: int
+        :param transition_latency: int
+        :param robustness_margins: dict (task name -> int)
+        :param delta_let: dict (task name -> int)
+        :param slack: dict (task name -> int)
+        :param fingerprint: string, cf. fingerprint()
+        """
+        values = [latency, transition_latency, robustness_margins, delta_let, slack]
+        if self.time_base is not None:
+            values = self.time_base.to_time(values)
+        values = [chain_name] + values + [fingerprint]
+        if self.format == 'ndjson':
+            line = json.dumps(dict(zip(self.fields, values)), default=self.__to_json) + '\n'
+        else:
+            line = io.StringIO()
+            csv.writer(line, delimiter=';', lineterminator='\n').writerow(
+                [chain_name] + [json.dumps(v, default=self.__to_json) for v in values[1:]])
+            line = line.getvalue()
+
+        # a single write per record: an aborted run leaves at most one incomplete line
+        self.__file.write(line)
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+
+    def close(self):
+        """ closes the file """
+        if not self.__file.closed:
+            self.__file.close()
+
+
+    def toString(self):
+        """ returns a short description of the stream
+
+        :rtype: string
+        """
+        return ("Results stream %s (%s): %d chains of previous runs" % (self.path, self.format, len(self.records)))
+
+
+    def __read(self):
+        """ reads the records of an existing file. An incomplete last line (aborted run) is removed from the file. """
+        with open(self.path, 'rb') as file:
+            content = file.read()
+        end = content.rfind(b'\n') + 1
+        if end < len(content):
+            with open(self.path, 'r+b') as file:
+                file.truncate(end)
+
+        lines = content[:end].decode('utf-8').splitlines()
+        if self.format == 'ndjson':
+            for line in lines:
+                if line.strip() != "":
+                    record = json.loads(line)
+                    self.records[record['chain']] = record
+        else:
+            if len(lines) == 0:
+                with open(self.path, 'w', newline='') as file:
+                    csv.writer(file, delimiter=';', lineterminator='\n').writerow(self.fields)
+                return
+            reader = csv.reader(lines, delimiter=';')
+            assert next(reader) == self.fields, "%s is not a results stream (unexpected header)" % self.path
+            for row in reader:
+                record = dict(zip(self.fields, row))
+                for field in self.fields[1:]:
+                    record[field] = json.loads(record[field])
+                self.records[record['chain']] = record
+
+
+    @staticmethod
+    def __to_json(value):
+        """ converts numpy scalars for JSON serialization """
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError("Object of type %s cannot be stored in a results stream" % type(value).__name__)
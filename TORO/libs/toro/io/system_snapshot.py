@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Copyright Notice
+================
+Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+Description
+===========
+Versioned, columnar snapshots of systems and their cause-effect chains.
+A snapshot is a directory containing a task table, a resource table and a chain table
+as binary NumPy arrays (.npy, one array per column) as well as the membership of tasks
+in chains (concatenated task indices and offsets per chain). Scalar information is stored
+in snapshot.json. Arrays are memory-mapped when a snapshot is opened, pyCPA/TORO objects
+(tasks, resources, chains, the system) are only rebuilt on demand.
+"""
+
+import os
+import json
+import shutil
+import importlib
+
+import numpy as np
+
+from pycpa import model
+
+from .. import model as toro_model
+
+
+
+class SystemSnapshot(object):
+    """
+    This class stores a system and its cause-effect chains as a snapshot and rebuilds them lazily.
+    """
+
+    ## version of the snapshot format, snapshots of other versions cannot be opened
+    version = 2
+
+    ## numeric task attributes (parameters of the PJd event model are prefixed by em_)
+    task_columns = ['release_offset', 'bcet', 'wcet', 'scheduling_parameter', 'let', 'wcrt', 'bcrt', 'deadline',
+                    'em_P', 'em_J', 'em_dmin', 'em_phi']
+
+    ## numeric chain attributes
+    chain_columns = ['e2e_deadline', 'transition_deadline']
+
+    def __init__(self, path):
+        """ opens a snapshot, arrays are memory-mapped on first access
+
+        :param path: string, path of the snapshot directory
+        """
+        ## path of the snapshot directory
+        self.path = path
+        with open(os.path.join(path, "snapshot.json"), 'r') as f:
+            self.__meta = json.load(f)
+        if self.__meta.get('version') != self.version:
+            raise ValueError("Snapshot %s has version %s, only version %d is supported" % (path, self.__meta.get('version'), self.version))
+
+        ## name of the system
+        self.name = self.__meta['name']
+
+        # memory-mapped arrays, columns converted in bulk (cf. __value()) and rebuilt objects
+        self.__arrays = dict()
+        self.__columns = dict()
+        self.__chain_index = None
+        self.__chain_links = None
+        self.__tasks = dict()
+        self.__resources = dict()
+        self.__chains = dict()
+        self.__system = None
+
+
+    ###########
+    # storing #
+    ###########
+
+    @staticmethod
+    def store(path, system, chains):
+        """ stores a system and its chains as snapshot. The snapshot is written to a temporary
+        directory first, an existing snapshot is replaced afterwards.
+
+        :param path: string, path of the snapshot directory
+        :param system: pyCPA System
+        :param chains: list of TORO extEffectChains
+        """
+        resources = sorted(system.resources, key=lambda r: str(r.name))
+
+        # task table: tasks of all resources, followed by tasks of the chains that are not mapped to any resource
+        tasks = list()
+        task_resource = list()
+        for i in range(len(resources)):
+            for task in sorted(resources[i].tasks, key=lambda t: str(t.name)):
+                tasks.append(task)
+                task_resource.append(i)
+        index = {id(task): i for i, task in enumerate(tasks)}
+        for chain in chains:
+            for task in chain.tasks:
+                if id(task) not in index:
+                    index[id(task)] = len(tasks)
+                    tasks.append(task)
+                    task_resource.append(-1)
+
+        arrays = dict()
+        meta = {'version': SystemSnapshot.version, 'name': system.name, 'task_count': len(tasks),
+                'resource_count': len(resources), 'chain_count': len(chains), 'masked': list(), 'irregular': dict()}
+
+        # resource table
+        arrays['resource_name'] = np.array([str(r.name) for r in resources], dtype=np.str_)
+        arrays['resource_scheduler'] = np.array([SystemSnapshot.scheduler_name(r.scheduler) for r in resources], dtype=np.str_)
+
+        # task table
+        arrays['task_name'] = np.array([str(t.name) for t in tasks], dtype=np.str_)
+        arrays['task_resource'] = np.array(task_resource, dtype=np.int64)
+        arrays['task_semantic'] = np.array([t.semantic.value if t.semantic is not None else -1 for t in tasks], dtype=np.int8)
+        # -1: attribute not set, else 0/1
+        arrays['task_sl_ic_task'] = np.array([int(t.sl_ic_task) if hasattr(t, 'sl_ic_task') else -1 for t in tasks], dtype=np.int8)
+        for task in tasks:
+            # other event models cannot be rebuilt from P, J, dmin and phi
+            assert (task.in_event_model is None) or isinstance(task.in_event_model, model.PJdEventModel), \
+                "Task %s: only PJd event models can be stored in snapshots" % task.name
+        for column in SystemSnapshot.task_columns:
+            if column.startswith('em_'):
+                values = [getattr(t.in_event_model, column[3:], None) for t in tasks]
+            else:
+                values = [getattr(t, column, None) for t in tasks]
+            SystemSnapshot.__store_column(arrays, meta, 'task_' + column, values)
+        arrays['task_links'] = np.array([(index[id(t)], index[id(n)]) for t in tasks for n in sorted(t.next_tasks, key=lambda n: str(n.name))
+                                         if id(n) in index], dtype=np.int64).reshape(-1, 2)
+
+        # chain table and membership arrays
+        arrays['chain_name'] = np.array([str(c.name) for c in chains], dtype=np.str_)
+        arrays['chain_subchain'] = np.array([hasattr(c, 'transition_deadline') for c in chains], dtype=bool)
+        arrays['chain_semantic'] = np.array([c.semantic.value if getattr(c, 'semantic', None) is not None else -1 for c in chains], dtype=np.int8)
+        for column in SystemSnapshot.chain_columns:
+            SystemSnapshot.__store_column(arrays, meta, 'chain_' + column, [getattr(c, column, None) for c in chains])
+        arrays['chain_offsets'] = np.cumsum([0] + [len(c.tasks) for c in chains], dtype=np.int64)
+        arrays['chain_members'] = np.array([index[id(t)] for c in chains for t in c.tasks], dtype=np.int64)
+        chain_index = {id(c): i for i, c in enumerate(chains)}
+        arrays['chain_links'] = np.array([(i, chain_index[id(n)]) for i, c in enumerate(chains) for n in getattr(c, 'next_chains', list())
+                                          if id(n) in chain_index], dtype=np.int64).reshape(-1, 2)
+
+        tmp_path = path + ".tmp%d" % os.getpid()
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, name + ".npy"), array)
+        with open(os.path.join(tmp_path, "snapshot.json"), 'w') as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(tmp_path, path)
+
+
+    @staticmethod
+    def __store_column(arrays, meta, name, values):
+        """ stores a column of numeric values: integer columns as int64, columns containing floats
+        (e.g. execution times of Amalthea models) as float64. None values are stored in a mask,
+        other values (e.g. 'n/a') are stored in snapshot.json.
+
+        :param arrays: dict, name -> np.ndarray
+        :param meta: dict
+        :param name: string, name of the column
+        :param values: list
+        """
+        def is_int(value):
+            return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+        def is_float(value):
+            return isinstance(value, (float, np.floating))
+
+        floats = any(is_float(value) for value in values)
+        column = np.zeros(len(values), dtype=np.float64 if floats else np.int64)
+        mask = np.zeros(len(values), dtype=bool)
+        irregular = dict()
+        for i, value in enumerate(values):
+            if value is None:
+                mask[i] = True
+            elif is_float(value) or (is_int(value) and (not floats or float(value) == value)):
+                column[i] = value
+            else:
+                # e.g. strings or integers that cannot be represented exactly as float64
+                irregular[str(i)] = value
+
+        arrays[name] = column
+        if mask.any():
+            arrays[name + '_none'] = mask
+            meta['masked'].append(name)
+        if len(irregular) > 0:
+            meta['irregular'][name] = irregular
+
+
+    @staticmethod
+    def scheduler_name(scheduler):
+        """ describes a scheduler by a string: empty for None, 'class:<module>.<class>' for
+        scheduler objects, otherwise the scheduler itself (e.g. 'unknown')
+
+        :param scheduler: pyCPA scheduler, string or None
+        :rtype: string
+        """
+        if scheduler is None:
+            return ""
+        if isinstance(scheduler, str):
+            return scheduler
+        return "class:" + type(scheduler).__module__ + "." + type(scheduler).__name__
+
+
+    @staticmethod
+    def scheduler(name):
+        """ recreates a scheduler from its description (cf. scheduler_name())
+
+        :param name: string
+        :rtype: pyCPA scheduler, string or None
+        """
+        if name == "":
+            return None
+        if name.startswith("class:"):
+            module, name = name[len("class:"):].rsplit(".", 1)
+            return getattr(importlib.import_module(module), name)()
+        return name
+
+
+    ###########
+    # loading #
+    ###########
+
+    def task_count(self):
+        """ :rtype: int """
+        return self.__meta['task_count']
+
+
+    def chain_names(self):
+        """ :rtype: list of strings """
+        return self.__array('chain_name').tolist()
+
+
+    def load(self):
+        """ rebuilds the system and all of its chains
+
+        :rtype: pyCPA System, list of TORO extEffectChains
+        """
+        return self.system(), self.chains()
+
+
+    def system(self):
+        """ rebuilds the system: all resources and tasks
+
+        :rtype: pyCPA System
+        """
+        if self.__system is None:
+            # all values are needed, convert whole columns at once
+            for column in self.task_columns + ['name', 'semantic', 'sl_ic_task', 'resource']:
+                self.__column('task_' + column)
+
+            self.__system = model.System(self.name)
+            for i in range(self.__meta['resource_count']):
+                self.__system.bind_resource(self.resource(i))
+            for i in range(self.task_count()):
+                self.task(i)
+            for src, dst in self.__array('task_links'):
+                self.task(int(src)).link_dependent_task(self.task(int(dst)))
+        return self.__system
+
+
+    def chains(self):
+        """ rebuilds all chains
+
+        :rtype: list of TORO extEffectChains
+        """
+        for column in self.chain_columns + ['name', 'subchain', 'semantic', 'offsets', 'members']:
+            self.__column('chain_' + column)
+        return [self.chain(i) for i in range(self.__meta['chain_count'])]
+
+
+    def chain(self, key):
+        """ rebuilds a chain and its tasks (only)
+
+        :param key: int (index) or string (name of the chain)
+        :rtype: TORO extEffectChain
+        """
+        if isinstance(key, str):
+            if self.__chain_index is None:
+                self.__chain_index = {name: i for i, name in enumerate(self.chain_names())}
+            key = self.__chain_index[key]
+
+        if key not in self.__chains:
+            start, end = self.__value('chain_offsets', key), self.__value('chain_offsets', key + 1)
+            if 'chain_members' in self.__columns:
+                members = self.__columns['chain_members'][start:end]
+            else:
+                members = self.__array('chain_members')[start:end].tolist()
+            subchain = bool(self.__value('chain_subchain', key))
+
+            chain = toro_model.extEffectChain(self.__value('chain_name', key), [self.task(i) for i in members],
+                                              e2e_deadline=self.__value('chain_e2e_deadline', key), subchain=subchain)
+            if subchain is True:
+                chain.transition_deadline = self.__value('chain_transition_deadline', key)
+            semantic = self.__value('chain_semantic', key)
+            if semantic != -1:
+                chain.set_semantic(toro_model.Semantic(semantic))
+            self.__chains[key] = chain
+
+            # links between chains whose objects already exist
+            if self.__chain_links is None:
+                self.__chain_links = dict()
+                for src, dst in self.__array('chain_links').tolist():
+                    self.__chain_links.setdefault(src, list()).append((src, dst))
+                    if dst != src:
+                        self.__chain_links.setdefault(dst, list()).append((src, dst))
+            for src, dst in self.__chain_links.get(key, list()):
+                if (src in self.__chains) and (dst in self.__chains):
+                    self.__chains[src].next_chains.append(self.__chains[dst])
+
+        return self.__chains[key]
+
+
+    def task(self, row):
+        """ rebuilds a task (and the resource it is mapped to)
+
+        :param row: int, index of the task in the task table
+        :rtype: TORO extTask
+        """
+        if row not in self.__tasks:
+            semantic = self.__value('task_semantic', row)
+            task = toro_model.extTask(self.__value('task_name', row),
+                                      self.__value('task_release_offset', row),
+                                      self.__value('task_bcet', row),
+                                      self.__value('task_wcet', row),
+                                      self.__value('task_scheduling_parameter', row),
+                                      toro_model.Semantic(semantic) if semantic != -1 else None,
+                                      let=self.__value('task_let', row),
+                                      wcrt=self.__value('task_wcrt', row),
+                                      bcrt=self.__value('task_bcrt', row),
+                                      deadline=self.__value('task_deadline', row))
+            if self.__value('task_em_P', row) is not None:
+                parameters = {parameter: self.__value('task_em_' + parameter, row) for parameter in ['P', 'J', 'dmin', 'phi']}
+                task.in_event_model = model.PJdEventModel(**{k: v for k, v in parameters.items() if v is not None})
+            sl_ic_task = self.__value('task_sl_ic_task', row)
+            if sl_ic_task != -1:
+                task.sl_ic_task = bool(sl_ic_task)
+
+            resource = self.__value('task_resource', row)
+            if resource != -1:
+                self.resource(resource).bind_task(task)
+            self.__tasks[row] = task
+
+        return self.__tasks[row]
+
+
+    def resource(self, i):
+        """ rebuilds a resource (without tasks)
+
+        :param i: int, index of the resource in the resource table
+        :rtype: pyCPA Resource
+        """
+        if i not in self.__resources:
+            scheduler = self.scheduler(str(self.__array('resource_scheduler')[i]))
+            self.__resources[i] = model.Resource(str(self.__array('resource_name')[i]), scheduler)
+        return self.__resources[i]
+
+
+    def __array(self, name):
+        """ returns a (memory-mapped) array of the snapshot
+
+        :param name: string
+        :rtype: np.ndarray
+        """
+        if name not in self.__arrays:
+            self.__arrays[name] = np.load(os.path.join(self.path, name + ".npy"), mmap_mode='r')
+        return self.__arrays[name]
+
+
+    def __column(self, name):
+        """ converts a whole column to a list of values (None and irregular values included)
+
+        :param name: string, name of the column
+        :rtype: list
+        """
+        if name not in self.__columns:
+            column = self.__array(name).tolist()
+            if name in self.__meta['masked']:
+                for row in np.flatnonzero(self.__array(name + '_none')).tolist():
+                    column[row] = None
+            for row, value in self.__meta['irregular'].get(name, dict()).items():
+                column[int(row)] = value
+            self.__columns[name] = column
+        return self.__columns[name]
+
+
+    def __value(self, name, row):
+        """ returns a value of a column. Single values are read from the memory-mapped array,
+        unless the whole column has been converted before.
+
+        :param name: string, name of the column
+        :param row: int
+        :rtype: int, string, None or irregular value
+        """
+        if name in self.__columns:
+            return self.__columns[name][row]
+        irregular = self.__meta['irregular'].get(name)
+        if (irregular is not None) and (str(row) in irregular):
+            return irregular[str(row)]
+        if (name in self.__meta['masked']) and self.__array(name + '_none')[row]:
+            return None
+        return self.__array(name)[row].item()
@@ -20,8 +20,11 @@ functions for decomposing CECs and determining subchain deadlines.
 
 from enum import Enum, auto
 import math
+import copy
 from collections import deque
 
+import numpy as np
+
 from pycpa import model
 
 class extTask(model.Task): # pragma: no cover
@@ -96,18 +99,40 @@ class extTask(model.Task): # pragma: no cover
         elif (self.semantic == Semantic.LET) and (hasattr(self, 'sl_ic_task')):
             job.set_ic_task()
         return job
+
+    def instantiate_jobs(self, first_job_number, count, wcrt, bcrt):
+        """ This function instantiates count consecutive jobs starting with ID first_job_number
+        in bulk and returns them as a job table instead of single Job objects.
+
+        :param first_job_number: job index of the first job
+        :param count: number of jobs
+        :param wcrt: task WCRT
+        :param bcrt: task BCRT
+        :rtype: JobTable
+        """
+        if self.semantic == Semantic.BET:
+            assert bcrt == self.bcet, ('Warning: check relation between bcrt = ' + str(bcrt) 
+                                   +  ' and bcet = ' + str(self.bcet) 
+                                   + ' for task ' + self.name + '.')
+        return JobTable(self, first_job_number, count, wcrt, bcrt)
     
     
 
 class Job(object): # pragma: no cover
-    """ Parameterized job model."""
+    """ Parameterized job model.
+    Attributes are stored in slots instead of a per-instance dictionary, the job's name is only
+    formatted when it is accessed.
+    """
+    __slots__ = ('task_name', 'period', 'offset', 'job_number', '_name_prefix', 'bcet', 'wcet', 'wcrt', 'bcrt', 'let',
+                 'ic_task', 'deadline', 'Rmin', 'Rmax', 'Dmin', 'Dmax', 'robustness_margin', 'slack', 'delta_let', 'semantic')
+
     def __init__(self, name, task_name, period, offset=None, bcet=None, wcet=None, let=None, bcrt=None,
                  job_number=None, wcrt=None, semantic=None, deadline=None):
         self.task_name = task_name
         self.period = period
         self.offset = offset
         self.job_number = job_number
-        self.name = (name + ",%d" % self.job_number)
+        self._name_prefix = name
         self.bcet = bcet
         self.wcet = wcet
         self.wcrt = wcrt
@@ -128,6 +153,14 @@ class Job(object): # pragma: no cover
         self.semantic = semantic
         self.set_RI_DI()
 
+    @property
+    def name(self):
+        """ job name: task name and job number, e.g. "T1,3" 
+
+        :rtype: string
+        """
+        return self._name_prefix + ",%d" % self.job_number
+
     def set_ic_task(self):
         """ set flag showing a job is used as a LET interconnect task.
         
@@ -171,6 +204,98 @@ class Job(object): # pragma: no cover
     
 
 
+class JobTable(object): # pragma: no cover
+    """ Struct-of-arrays job model: consecutive jobs of a single task.
+    Parameters shared by all jobs are stored once, job numbers as well as the minimum and 
+    maximum read and data intervals of the jobs are stored in NumPy arrays that are computed in bulk.
+    Job objects are only materialised on demand, e.g. for printing or plotting.
+    """
+    def __init__(self, task, first_job_number, count, wcrt, bcrt):
+        ## task the jobs are instances of
+        self.task = task
+        self.task_name = task.name
+        self.period = task.in_event_model.P
+        self.offset = task.release_offset
+        self.bcet = task.bcet
+        self.wcet = task.wcet
+        self.wcrt = wcrt
+        self.bcrt = bcrt
+        self.let = task.let
+        self.ic_task = (task.semantic == Semantic.LET) and hasattr(task, 'sl_ic_task')
+        if task.deadline is None:
+            self.deadline = self.period # implicit deadline
+        else:
+            self.deadline = task.deadline # arbitrary deadline
+        self.semantic = task.semantic
+
+        ## job numbers of all jobs in the table
+        self.job_number = np.arange(first_job_number, first_job_number + count, dtype=np.int64)
+        self.Rmin = None
+        self.Rmax = None
+        self.Dmin = None
+        self.Dmax = None
+        self.set_RI_DI()
+
+    def __len__(self):
+        return len(self.job_number)
+
+    def set_RI_DI(self):
+        """ The function computes minimum and maximum read and data intervals of all jobs at once.
+        [4] Equations (2.2a)-(2.2d) and (2.3a)-(2.3d), cf. Job.set_RI_DI().
+
+        :rtype: None
+        """
+        # job belongs to BET task
+        if self.semantic == Semantic.BET:
+            assert self.wcet != None or self.wcet != 0, 'Unset WCET values for task! '+ self.task_name
+            assert self.let == None or self.let == 0, 'Contradictory task parameters!'  
+            self.Rmin = self.release(self.job_number)
+            self.Rmax = self.Rmin + (self.wcrt - self.bcet)
+            self.Dmin = self.Rmin + self.bcrt
+            self.Dmax = self.Rmin + (self.period + self.wcrt)
+        elif self.semantic == Semantic.LET: 
+            self.Rmin = self.release(self.job_number)
+            self.Rmax = self.Rmin
+            self.Dmin = self.Rmin + self.let
+            self.Dmax = self.Rmin + (self.period + self.let)
+        else:
+            raise NotImplementedError("Task semantic " + self.semantic + "not supported yet")
+
+    def release(self, job_number):
+        """ returns the release instant (Rmin) of the job(s) with the given job number(s),
+        the jobs do not have to be part of the table.
+
+        :param job_number: int or np.ndarray
+        :rtype: int or np.ndarray
+        """
+        return self.offset + (job_number - 1) * self.period
+
+    def select(self, indices):
+        """ returns a job table that only contains the jobs stored at the given positions of this table
+
+        :param indices: np.ndarray, positions (int) or mask (bool)
+        :rtype: JobTable
+        """
+        jobs = copy.copy(self)
+        jobs.job_number = self.job_number[indices]
+        jobs.Rmin = self.Rmin[indices]
+        jobs.Rmax = self.Rmax[indices]
+        jobs.Dmin = self.Dmin[indices]
+        jobs.Dmax = self.Dmax[indices]
+        return jobs
+
+    def job(self, index):
+        """ materialises the job stored at the given position of the table
+
+        :param index: int
+        :rtype: Job
+        """
+        return self.task.instantiate_job(job_number=int(self.job_number[index]), 
+                                         wcrt=self.wcrt,
+                                         bcrt=self.bcrt)
+
+
+
 class extEffectChain(model.EffectChain):
     """ Cause-effect chain representation in TORO. Derived from pyCPA
 
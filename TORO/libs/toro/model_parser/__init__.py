@@ -6,10 +6,11 @@ Created on 29.10.2020
 '''
 
 from .csv_parser import CSVParser
+from .time_base import TimeBase
 
-# try:
-#     from .amalthea_parser import AmaltheaParser
-# except:
-#     print("-------------------------------------------------------------------\
-#          \nWarning: AmaltheaParser incomplete. check installation requirements\
-#          \n-------------------------------------------------------------------")
\ No newline at end of file
+try:
+    from .amalthea_parser import AmaltheaParser
+except:
+    print("-------------------------------------------------------------------\
+         \nWarning: AmaltheaParser incomplete. check installation requirements\
+         \n-------------------------------------------------------------------")
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+-----------
+This module indexes the elements of an Amalthea model (.amxmi file) in a single pass over the model.
+References between elements (attributes such as stimuli="Periodic5ms?type=PeriodicStimulus") are
+resolved using an ID->element index in both directions, so that the parser never has to search the
+whole model for associated elements.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+## xmi and xsi schemes
+xmi = '{http://www.omg.org/XMI}'
+xsi = '{http://www.w3.org/2001/XMLSchema-instance}'
+
+## namespace of Amalthea models, including the version of the model (e.g. http://app4mc.eclipse.org/amalthea/0.9.9)
+amalthea_namespace = re.compile(r'^http://app4mc\.eclipse\.org/amalthea/(\d+(?:\.\d+)*)$')
+
+
+class AmaltheaIndex(object):
+    """ ID->element, type->elements and reference indexes of an Amalthea model """
+
+    def __init__(self, file_name):
+        """ parses the model and builds all indexes
+
+        :param file_name: string, path of the .amxmi file
+        """
+        ## root element of the model
+        self.root = None
+
+        ## amalthea version of the model, e.g. '0_9_9' (None if the namespace is unknown)
+        self.version = None
+
+        ## xmi:id -> element
+        self.__ids = dict()
+
+        ## type -> list of elements (in document order)
+        self.__types = dict()
+
+        ## referenced xmi:id -> list of (attribute, referencing element) (in document order)
+        self.__referrers = dict()
+
+        ## element -> list of (attribute, referenced xmi:ids)
+        self.__references = dict()
+
+        # the model is parsed by the C parser, all indexes are built in a single pass over its elements
+        self.root = ET.parse(file_name).getroot()
+        match = amalthea_namespace.match(self.root.tag[1:].split('}')[0]) if self.root.tag.startswith('{') else None
+        if match is not None:
+            self.version = match.group(1).replace('.', '_')
+
+        type_key, id_key = xsi + 'type', xmi + 'id'
+        for item in self.root.iter():
+            attributes = item.attrib
+            id = attributes.get(id_key)
+            if id is not None:
+                self.__ids[id] = item
+
+            if (type_key in attributes) or (id is not None):
+                type = self.type(item)
+            else:
+                tag = item.tag
+                type = tag[:1].upper() + tag[1:]
+            types = self.__types.get(type)
+            if types is None:
+                types = self.__types[type] = list()
+            types.append(item)
+
+            for attribute, value in attributes.items():
+                if ('?type=' in value) and (attribute != id_key):
+                    # references are separated by spaces, the ids themselves do not contain spaces (url encoded)
+                    ids = value.split()
+                    self.__references.setdefault(item, list()).append((attribute, ids))
+                    for ref in ids:
+                        self.__referrers.setdefault(ref, list()).append((attribute, item))
+
+
+    @staticmethod
+    def type(element):
+        """ returns the (Amalthea) type of an element: its xsi:type, the type given by its xmi:id
+        or the capitalized tag of the element (e.g. taskAllocation -> TaskAllocation)
+
+        :param element: xml element
+        :rtype: string
+        """
+        xsi_type = element.get(xsi + 'type')
+        if xsi_type is not None:
+            return xsi_type.split(':')[-1]
+        id = element.get(xmi + 'id')
+        if (id is not None) and ('?type=' in id):
+            return id.rsplit('?type=', 1)[1]
+        tag = element.tag.rsplit('}', 1)[-1]
+        return tag[:1].upper() + tag[1:]
+
+
+    @staticmethod
+    def id(element):
+        """ returns the xmi:id of an element
+
+        :param element: xml element
+        :rtype: string
+        """
+        return element.get(xmi + 'id')
+
+
+    def element(self, id):
+        """ returns the element with the given xmi:id
+
+        :param id: string
+        :rtype: xml element or None
+        """
+        return self.__ids.get(id)
+
+
+    def elements(self, type):
+        """ returns all elements of a type
+
+        :param type: string, e.g. 'Task' or 'ProcessingUnit'
+        :rtype: list of xml elements
+        """
+        return self.__types.get(type, list())
+
+
+    def references(self, element, attribute):
+        """ returns the elements referenced by an attribute of an element
+
+        :param element: xml element
+        :param attribute: string, e.g. 'stimuli'
+        :rtype: list of xml elements
+        """
+        for name, ids in self.__references.get(element, list()):
+            if name == attribute:
+                return [self.__ids[id] for id in ids if id in self.__ids]
+        return list()
+
+
+    def referrers(self, element, attribute=None, type=None):
+        """ returns all elements referencing an element (reverse references)
+
+        :param element: xml element (with xmi:id)
+        :param attribute: string, only references by this attribute (None: any attribute)
+        :param type: string, only referencing elements of this type (None: any type)
+        :rtype: list of xml elements
+        """
+        elements = list()
+        for name, referrer in self.__referrers.get(self.id(element), list()):
+            if ((attribute is None) or (name == attribute)) and ((type is None) or (self.type(referrer) == type)):
+                if (attribute is not None) or (referrer not in elements):
+                    elements.append(referrer)
+        return elements
@@ -10,38 +10,42 @@
 
 Description
 -----------
-This module parses Amalthea models that describe a system.
+This module parses Amalthea models that describe a system. The model is read in a single pass
+that indexes all elements (cf. AmaltheaIndex), associated elements are looked up in these indexes.
 """
 
-# import os
+import os
 # import sys
+import shutil
+import hashlib
 from typing import Dict, List, Union, Tuple
 from pycpa import model
 from pycpa import schedulers
 from pycpa import graph
 from .. import model as toro_model
+from .. import io
 
 Semantics = toro_model.Semantic
 
 import networkx as nx
 import matplotlib.pyplot as plt
 
-try:
-    from Amalthea2PyCPA import Parser
-except:
-    print("------------------------------------------\
-         \nWarning: Amalthea2PyCPA could not be found\
-         \n------------------------------------------")
-
-
 from .parser import ModelParser
+from .amalthea_index import AmaltheaIndex
 
-## private Amalthea parser object
-parser = None
+## private index of the elements of the Amalthea model
+index = None
 
 ## private copy of amalthea version number used by .amxmi file
 amalthea_version = None
 
+## version of the conversion of Amalthea models to TORO systems, part of the key of cached systems 
+## (cf. AmaltheaParser.parse_cached()): increase if the conversion changes!
+parser_version = 1
+
+## name of the directory containing cached systems
+cache_folder = '.toro_systems'
+
 ## private list of supported amalthea versions
 supported_versions = ['0_9_5','0_9_6', '0_9_7', '0_9_8', '0_9_9']
 
@@ -53,21 +57,87 @@ units = {"s":1, "ms":10**(-3), "us":10**(-6), "ns":10**(-9), "ps":10**(-12)}
 ## dict for mapping frequencies to a common base
 freqUnits = {"Hz": 1.0, "MHz": 1000.0, "KHz": 1000000.0, "GHz": 1000000000.0}
 
+## dict of the associations between Amalthea classes used by the parser: (source class, target class) -> 
+## (attribute, reverse, typed). The attribute references the target (reverse=False) or the source (reverse=True). 
+## If typed is True, only associated elements of the target class are returned
+associations = {
+    ('RunnableCall', 'Runnable'): ('runnable', False, False),
+    ('TaskRunnableCall', 'Runnable'): ('runnable', False, False),
+    ('LabelAccess', 'Label'): ('data', False, False),
+    ('Task', 'Stimulus'): ('stimuli', False, False),
+    ('Task', 'ProcessRequirement'): ('process', True, True),
+    ('Task', 'TaskAllocation'): ('task', True, True),
+    ('TaskAllocation', 'ProcessingUnit'): ('affinity', False, False),
+    ('ProcessingUnit', 'FrequencyDomain'): ('frequencyDomain', False, False),
+    ('ProcessingUnit', 'ProcessingUnitDefinition'): ('definition', False, False),
+    ('ProcessingUnitDefinition', 'HwFeature'): ('features', False, False),
+    ('ProcessingUnit', 'SchedulerAllocation'): ('responsibility', True, True),
+    ('SchedulerAllocation', 'TaskScheduler'): ('scheduler', False, False),
+    ('EventChain', 'ProcessEvent'): (None, False, True),
+    ('EventChain', 'LabelEvent'): (None, False, True),
+    ('ProcessEvent', 'Task'): ('entity', False, False),
+    ('LabelEvent', 'Task'): ('process', False, False),
+    ('EventChain', 'EventChainLatencyConstraint'): ('scope', True, True),
+    ('ProcessChain', 'Task'): ('processes', False, False),
+    ('ProcessChain', 'ProcessChainRequirement'): (None, True, True)
+}
+
 
 class AmaltheaParser(ModelParser):
     """ """
     def __init__(self, args, file_name):
         """ load system model
         """
-        global parser
+        global index
         global amalthea_version
 
-        parser = Parser.Parser(file_name)
-        amalthea_version = parser.get_amaltheaVersion()
+        index = AmaltheaIndex(file_name)
+        amalthea_version = index.version
 
         assert amalthea_version in supported_versions, "The amalthea version used in the .amxmi file is not supported by this parser yet"
 
     
+    @staticmethod
+    def parse_cached(args, file_name, cache_dir=None) -> Tuple[model.System, List[toro_model.extEffectChain]]:
+        """ returns the system and the cause-effect chains of an AMALTHEA model. The converted system is stored
+        as a snapshot (cf. io.SystemSnapshot) keyed by the content hash of the model and the parser version, 
+        later calls load the snapshot instead of parsing the model again. Snapshots of previous versions of 
+        the same model are removed.
+
+        :param args: argparse arguments
+        :param file_name: string, path of the .amxmi file
+        :param cache_dir: string, directory of the snapshots (default: folder of the model)
+        :rtype: pyCPA.model.System, list[extEffectChain]
+        """
+        digest = hashlib.sha256()
+        with open(file_name, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(('parser %d snapshot %d' % (parser_version, io.SystemSnapshot.version)).encode())
+
+        folder = os.path.join(cache_dir if cache_dir is not None else os.path.dirname(os.path.abspath(file_name)), cache_folder)
+        prefix = os.path.basename(file_name) + '_'
+        path = os.path.join(folder, prefix + digest.hexdigest()[:32])
+
+        if os.path.isdir(path):
+            print("[AmaltheaParser] loading system from %s" % path)
+            return io.SystemSnapshot(path).load()
+
+        system, chains = AmaltheaParser(args, file_name).parse()
+
+        try:
+            os.makedirs(folder, exist_ok=True)
+            for entry in os.listdir(folder):
+                # outdated snapshots of the same model
+                if entry.startswith(prefix) and (len(entry) == len(prefix) + 32):
+                    shutil.rmtree(os.path.join(folder, entry), ignore_errors=True)
+            io.SystemSnapshot.store(path, system, chains)
+        except OSError as e:
+            print("[AmaltheaParser] WARNING: system could not be cached in %s (%s)" % (folder, e))
+
+        return system, chains
+
+
     def parse(self) -> Tuple[model.System, List[toro_model.extEffectChain]]:
         """ process the AMALTHEA model systematically translating the information
         into a pyCPA system and a list of extEffectChain objects.
@@ -84,6 +154,12 @@ class AmaltheaParser(ModelParser):
         self.__writing_tasks = dict()
         self.__reading_tasks = dict()
 
+        ## execution times of runnables: (runnable, frequency, ipc) -> (bcet, wcet)
+        self.__execution_times = dict()
+        ## statistics of the execution time cache: execution times computed/reused
+        self.execution_time_misses = 0
+        self.execution_time_hits = 0
+
         self._get_resources()
         assert len(self.__pycpa_resources) > 0, "[Amalthea Parser] No resources have been created."
         self._get_tasks()
@@ -99,6 +175,70 @@ class AmaltheaParser(ModelParser):
 
 
 
+    ###########################
+    ## model element queries ##
+    ###########################
+
+    def __get_elements(self, path, root=None, multipleElements=True, filterArgs=None):
+        """ retrieve elements contained in a given element (or the model) by their path.
+        The first entry of a path is the tag of the root element itself ('Amalthea' is optional for the model).
+
+        :param path: list of tags or list of alternative paths (list of lists)
+        :param root: xml element (None: root of the model)
+        :param multipleElements: bool, return all elements (list) or the first element (None if there is none)
+        :param filterArgs: None or ['option', type], only elements of the given (xsi:)type
+        :rtype: list of xml elements or xml element
+        """
+        paths = path if isinstance(path[0], list) else [path]
+        if root is None:
+            root = index.root
+            paths = [p[1:] if p[0] == 'Amalthea' else p for p in paths]
+        else:
+            paths = [p[1:] for p in paths]
+
+        elements = list()
+        for p in paths:
+            for element in root.findall('/'.join(p)):
+                if (filterArgs is None) or (AmaltheaIndex.type(element) == filterArgs[1]):
+                    elements.append(element)
+
+        if multipleElements is True:
+            return elements
+        return elements[0] if len(elements) > 0 else None
+
+
+    def __get_associated_elements(self, path, rootElem, filterArg=None):
+        """ retrieve the elements associated with a given element via a path of Amalthea classes (cf. associations).
+        References are resolved using the index of the model, in both directions.
+
+        :param path: list of class names, the first one is the class of rootElem
+        :param rootElem: xml element
+        :param filterArg: string, name of the attribute used for the first association (None: cf. associations)
+        :rtype: list of xml elements or None (no associated elements)
+        """
+        elements = [rootElem]
+        for i in range(1, len(path)):
+            attribute, reverse, typed = associations[(path[i - 1], path[i])]
+            if (i == 1) and (filterArg is not None):
+                attribute = filterArg
+
+            associated = list()
+            for element in elements:
+                if reverse is True:
+                    candidates = index.referrers(element, attribute=attribute)
+                else:
+                    candidates = index.references(element, attribute)
+                for candidate in candidates:
+                    if ((typed is False) or (AmaltheaIndex.type(candidate) == path[i])) and (candidate not in associated):
+                        associated.append(candidate)
+            elements = associated
+
+        return elements if len(elements) > 0 else None
+
+
+
+
+
     #######################
     ## tasks & runnables ##
     #######################
@@ -118,12 +258,12 @@ class AmaltheaParser(ModelParser):
             return None
 
         multipleElements = True
-        xml_tasks = parser.getElement(path, multipleElements=multipleElements, filterArgs=filterArgs)
+        xml_tasks = self.__get_elements(path, multipleElements=multipleElements, filterArgs=filterArgs)
 
         print("\n[AmaltheaParser] get_tasks")
 
         for task in xml_tasks:
-            name = parser.xml_get(task, 'name')
+            name = task.get('name')
 
             # executing/transmitting computation/communication resource
             resource = self.__get_executing_resource(task)
@@ -193,7 +333,7 @@ class AmaltheaParser(ModelParser):
                 semantic=semantic,
                 deadline=deadline)
             
-            print("%s:\tbcet: %s, wcet: %s,\tsemantic: \'%s\', deadline: %s, \tpriority:%s \t- running on %s" %(name, str(bcet), str(wcet), str(semantic), str(deadline), str(priority), parser.xml_get(resource, 'name')))
+            print("%s:\tbcet: %s, wcet: %s,\tsemantic: \'%s\', deadline: %s, \tpriority:%s \t- running on %s" %(name, str(bcet), str(wcet), str(semantic), str(deadline), str(priority), resource.get('name')))
 
             # set event model of task according to stimulus
             if activation_pattern is not None:
@@ -212,6 +352,8 @@ class AmaltheaParser(ModelParser):
             self.__pycpa_resources[resource].bind_task(t)
             self.__pycpa_tasks[task] = t
 
+        print("Execution times of runnables: %d computed, %d reused" % (self.execution_time_misses, self.execution_time_hits))
+
 
 
     # TODO check paths!
@@ -234,7 +376,7 @@ class AmaltheaParser(ModelParser):
     
         runnables = list() 
 
-        runnableCalls = parser.getElement(path, root=task, multipleElements=multipleElements, filterArgs=filterArgs)
+        runnableCalls = self.__get_elements(path, root=task, multipleElements=multipleElements, filterArgs=filterArgs)
         if runnableCalls is not None:
             for call in runnableCalls:
                 if amalthea_version in ['0_9_3', '0_9_4']:          
@@ -245,10 +387,10 @@ class AmaltheaParser(ModelParser):
                     print("Processing of Runnables currently not supported for Amalthea version %s" %amalthea_version)
                     return None
 
-                lst = parser.getAssocaitedElement(path=path, rootElem=call)                
+                lst = self.__get_associated_elements(path=path, rootElem=call)                
                 if lst is not None:
                     for runnable in lst:
-                        # name = parser.xml_get(runnable, 'name')
+                        # name = runnable.get('name')
                         runnables.append(runnable)
 
         return runnables
@@ -265,13 +407,35 @@ class AmaltheaParser(ModelParser):
         :param elem: string
         :rtype: float, float
         """
-        bcet, wcet = 0, 0
-
         freq = self.__frequencies[resource]
         # normally an association would be used to get from ExecutionNeed to HwFeature, but for some reason no association is used
         # in Amalthea here, just a key that cannot be processed by Amalthea2PyCPA
         ipc = self.__ipc[resource]
 
+        if elem != 'runnables':
+            return self.__calculate_execution_time(executableEntity, freq, ipc, elem)
+
+        # runnables are called by several tasks: execution times are calculated once per frequency and ipc
+        key = (executableEntity, freq, tuple(ipc))
+        if key in self.__execution_times:
+            self.execution_time_hits += 1
+        else:
+            self.execution_time_misses += 1
+            self.__execution_times[key] = self.__calculate_execution_time(executableEntity, freq, ipc, elem)
+        return self.__execution_times[key]
+
+
+    def __calculate_execution_time(self, executableEntity, freq, ipc, elem):
+        """ calculates the execution time of a given task or runnable on a processing unit
+
+        :param executableEntity: xml entry of type Task or Runnable
+        :param freq: float, frequency of the processing unit
+        :param ipc: list of floats, IPC classification of the processing unit
+        :param elem: string
+        :rtype: float, float
+        """
+        bcet, wcet = 0, 0
+
         needs_min, needs_max = self.__get_execution_needs(executableEntity, elem)        
         if (needs_min != 0 and needs_max != 0 and len(ipc) > 0):
             bcet += (needs_min/max(ipc) * (1/freq))
@@ -307,7 +471,7 @@ class AmaltheaParser(ModelParser):
             return 0, 0
             
         multipleElements = True
-        exec_needs_xml = parser.getElement(path, root=executableEntity, multipleElements=multipleElements, filterArgs=filterArgs)
+        exec_needs_xml = self.__get_elements(path, root=executableEntity, multipleElements=multipleElements, filterArgs=filterArgs)
         if exec_needs_xml is not None:
             min, max = 0, 0
             for needs_entry in exec_needs_xml:
@@ -317,47 +481,47 @@ class AmaltheaParser(ModelParser):
                     filterArgs = None
                     multipleElements = False
 
-                    values = parser.getElement(sub_path, root=needs_entry, multipleElements=multipleElements, filterArgs=filterArgs)
+                    values = self.__get_elements(sub_path, root=needs_entry, multipleElements=multipleElements, filterArgs=filterArgs)
                     if values is not None:
                         if values.attrib[xsi+'type'] == 'am:DiscreteValueConstant':
-                            value = int(parser.xml_get(values, 'value'))
+                            value = int(values.get('value'))
                             lowerBound = value
                             upperBound = value
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueHistogram':
                             print("ExecutionNeed - value type \'am:DiscreteValueHistogram\' not supported.")
                             continue
                         elif values.attrib[xsi+'type'] == 'am:BoundedDiscreteValueDistribution':
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueBoundaries':
-                            # samplingType = parser.xml_get(values, 'samplingType')
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # samplingType = values.get('samplingType')
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueStatistics':
-                            # average = float(parser.xml_get(values, 'average'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # average = float(values.get('average'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueUniformDistribution':
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueWeibullEstimatorsDistribution':
-                            # average = float(parser.xml_get(values, 'average'))
-                            # pRemainPromille = float(parser.xml_get(values, 'pRemainPromille'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # average = float(values.get('average'))
+                            # pRemainPromille = float(values.get('pRemainPromille'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueBetaDistribution':
-                            # alpha = float(parser.xml_get(values, 'alpha'))
-                            # beta = float(parser.xml_get(values, 'beta'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # alpha = float(values.get('alpha'))
+                            # beta = float(values.get('beta'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:TruncatedDiscreteValueDistribution':
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueGaussDistribution':
-                            # mean = float(parser.xml_get(values, 'mean'))
-                            # sd = float(parser.xml_get(values, 'sd'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # mean = float(values.get('mean'))
+                            # sd = float(values.get('sd'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         
                         min += lowerBound
                         max += upperBound
@@ -387,7 +551,7 @@ class AmaltheaParser(ModelParser):
             return 0, 0
 
         multipleElements = True
-        ticks_xml = parser.getElement(path, root=executableEntity, multipleElements=multipleElements, filterArgs=filterArgs)
+        ticks_xml = self.__get_elements(path, root=executableEntity, multipleElements=multipleElements, filterArgs=filterArgs)
 
         if ticks_xml is not None:
             ticks_min, ticks_max = 0, 0
@@ -398,47 +562,47 @@ class AmaltheaParser(ModelParser):
                     filterArgs = None
                     multipleElements = False
 
-                    values = parser.getElement(sub_path, root=ticks_entry, multipleElements=multipleElements, filterArgs=filterArgs)
+                    values = self.__get_elements(sub_path, root=ticks_entry, multipleElements=multipleElements, filterArgs=filterArgs)
                     if values is not None:
                         if values.attrib[xsi+'type'] == 'am:DiscreteValueConstant':
-                            value = int(parser.xml_get(values, 'value'))
+                            value = int(values.get('value'))
                             lowerBound = value
                             upperBound = value
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueHistogram':
                             print("Ticks - value type \'am:DiscreteValueHistogram\' not supported")
                             continue
                         elif values.attrib[xsi+'type'] == 'am:BoundedDiscreteValueDistribution':
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueBoundaries':
-                            # samplingType = parser.xml_get(values, 'samplingType')
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # samplingType = values.get('samplingType')
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueStatistics':
-                            # average = float(parser.xml_get(values, 'average'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # average = float(values.get('average'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueUniformDistribution':
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueWeibullEstimatorsDistribution':
-                            # average = float(parser.xml_get(values, 'average'))
-                            # pRemainPromille = float(parser.xml_get(values, 'pRemainPromille'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # average = float(values.get('average'))
+                            # pRemainPromille = float(values.get('pRemainPromille'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueBetaDistribution':
-                            # alpha = float(parser.xml_get(values, 'alpha'))
-                            # beta = float(parser.xml_get(values, 'beta'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # alpha = float(values.get('alpha'))
+                            # beta = float(values.get('beta'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:TruncatedDiscreteValueDistribution':
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         elif values.attrib[xsi+'type'] == 'am:DiscreteValueGaussDistribution':
-                            # mean = float(parser.xml_get(values, 'mean'))
-                            # sd = float(parser.xml_get(values, 'sd'))
-                            lowerBound = int(parser.xml_get(values, 'lowerBound'))
-                            upperBound = int(parser.xml_get(values, 'upperBound'))
+                            # mean = float(values.get('mean'))
+                            # sd = float(values.get('sd'))
+                            lowerBound = int(values.get('lowerBound'))
+                            upperBound = int(values.get('upperBound'))
                         
                         ticks_min += lowerBound
                         ticks_max += upperBound
@@ -467,7 +631,7 @@ class AmaltheaParser(ModelParser):
 
         multipleElements = True
 
-        accesses = parser.getElement(path, root=task, multipleElements=multipleElements, filterArgs=filterArgs)
+        accesses = self.__get_elements(path, root=task, multipleElements=multipleElements, filterArgs=filterArgs)
         read = list()
         write = list()
 
@@ -475,7 +639,7 @@ class AmaltheaParser(ModelParser):
             if amalthea_version in ['0_9_5', '0_9_6', '0_9_7', '0_9_8', '0_9_9']:
                 for entry in accesses:
                     # LabelAccessEnum will take on one of the following values: ['_undefined_', 'read', 'write']
-                    rw = parser.xml_get(entry, 'access')
+                    rw = entry.get('access')
                     label = self.__get_accessedLabel(entry)
                     if rw == 'read':
                         read.append(label)
@@ -495,11 +659,11 @@ class AmaltheaParser(ModelParser):
         else:
             print("Processing of LabelAccess not implemented for Amalthea version %s" %amalthea_version)  
         
-        lst = parser.getAssocaitedElement(path=path, rootElem=entry)                
+        lst = self.__get_associated_elements(path=path, rootElem=entry)                
         if lst is not None:
             if amalthea_version in ['0_9_5', '0_9_6', '0_9_7', '0_9_8', '0_9_9']:
                 for label in lst:
-                    name = parser.xml_get(label, 'name')
+                    name = label.get('name')
                     # only one label expected, return after first result!
                     return label
                 else:
@@ -518,12 +682,12 @@ class AmaltheaParser(ModelParser):
         else:
             return None
 
-        lst = parser.getAssocaitedElement(path=path, rootElem=task)                
+        lst = self.__get_associated_elements(path=path, rootElem=task)                
         if lst is not None:
             if amalthea_version in ["0_9_3", "0_9_4", "0_9_5", "0_9_6", "0_9_7", "0_9_8", "0_9_9"]:
                 # note: only one result expected here! return the first result             
                 for stimulus in lst:
-                    name = parser.xml_get(stimulus, 'name')
+                    name = stimulus.get('name')
 
                     xmlElement = stimulus                
                     if xmlElement.attrib[xsi+'type'] == 'am:PeriodicStimulus':
@@ -532,12 +696,12 @@ class AmaltheaParser(ModelParser):
                         filterArgs = None
                         multipleElements = False
 
-                        recurrence = parser.getElement(path, root=stimulus, multipleElements=multipleElements, filterArgs=filterArgs)
+                        recurrence = self.__get_elements(path, root=stimulus, multipleElements=multipleElements, filterArgs=filterArgs)
                         # if multipleElements is True, <elem> is a list -> use for loop to iterate over all elements
                         if recurrence is not None:
-                            value = int(parser.xml_get(recurrence, 'value'))
+                            value = int(recurrence.get('value'))
                             # TimeUnit will take on one of the following values: ['_undefined_', 's', 'ms', 'us', 'ns', 'ps']
-                            unit = parser.xml_get(recurrence, 'unit')
+                            unit = recurrence.get('unit')
 
                             recurrence = value #* units[unit]
                         else:                            
@@ -548,12 +712,12 @@ class AmaltheaParser(ModelParser):
                         filterArgs = None
                         multipleElements = False
 
-                        minDistance = parser.getElement(path, root=stimulus, multipleElements=multipleElements, filterArgs=filterArgs)
+                        minDistance = self.__get_elements(path, root=stimulus, multipleElements=multipleElements, filterArgs=filterArgs)
                         # if multipleElements is True, <elem> is a list -> use for loop to iterate over all elements
                         if minDistance is not None:
-                            value = int(parser.xml_get(minDistance, 'value'))
+                            value = int(minDistance.get('value'))
                             # TimeUnit will take on one of the following values: ['_undefined_', 's', 'ms', 'us', 'ns', 'ps']
-                            unit = parser.xml_get(minDistance, 'unit')
+                            unit = minDistance.get('unit')
 
                             distance = value #* units[unit]
                         else:
@@ -570,12 +734,12 @@ class AmaltheaParser(ModelParser):
                         filterArgs = None
                         multipleElements = False
 
-                        offset = parser.getElement(path, root=stimulus, multipleElements=multipleElements, filterArgs=filterArgs)
+                        offset = self.__get_elements(path, root=stimulus, multipleElements=multipleElements, filterArgs=filterArgs)
                         # if multipleElements is True, <elem> is a list -> use for loop to iterate over all elements
                         if offset is not None:
                             #attributes:
-                            value = int(parser.xml_get(offset, 'value'))
-                            unit = parser.xml_get(offset, 'unit')
+                            value = int(offset.get('value'))
+                            unit = offset.get('unit')
 
                             offset = value #* units[unit]
                         else:
@@ -626,7 +790,7 @@ class AmaltheaParser(ModelParser):
         else:
             return None
 
-        lst = parser.getAssocaitedElement(path=path, rootElem=task)                
+        lst = self.__get_associated_elements(path=path, rootElem=task)                
         if lst is not None:                
             for requirement in lst:
                 if amalthea_version in ["0_9_3", "0_9_4", "0_9_5", "0_9_6", "0_9_7", "0_9_8", "0_9_9"]:
@@ -635,7 +799,7 @@ class AmaltheaParser(ModelParser):
                     filterArgs = None
                     multipleElements = False
 
-                    limit = parser.getElement(path, root=requirement, multipleElements=multipleElements, filterArgs=filterArgs)
+                    limit = self.__get_elements(path, root=requirement, multipleElements=multipleElements, filterArgs=filterArgs)
                     if limit is not None:
                         xmlElement = limit
                         if xmlElement.attrib[xsi+'type'] == 'am:TimeRequirementLimit':
@@ -644,12 +808,12 @@ class AmaltheaParser(ModelParser):
                             filterArgs = None
                             multipleElements = False
 
-                            limitValue = parser.getElement(path, root=limit, multipleElements=multipleElements, filterArgs=filterArgs)
+                            limitValue = self.__get_elements(path, root=limit, multipleElements=multipleElements, filterArgs=filterArgs)
                             # if multipleElements is True, <elem> is a list -> use for loop to iterate over all elements
                             if limitValue is not None:
-                                value = int(parser.xml_get(limitValue, 'value'))
+                                value = int(limitValue.get('value'))
                                 # TimeUnit will take on one of the following values: ['_undefined_', 's', 'ms', 'us', 'ns', 'ps']
-                                unit = parser.xml_get(limitValue, 'unit')
+                                unit = limitValue.get('unit')
 
                                 return value #* units[unit]
         return None
@@ -666,7 +830,7 @@ class AmaltheaParser(ModelParser):
         else:
             return None
 
-        lst = parser.getAssocaitedElement(path=path, rootElem=task)                
+        lst = self.__get_associated_elements(path=path, rootElem=task)                
         if lst is not None:
             for taskAlloc in lst:
                 if amalthea_version in ["0_9_3", "0_9_4", "0_9_5", "0_9_6", "0_9_7", "0_9_8", "0_9_9"]:
@@ -675,10 +839,10 @@ class AmaltheaParser(ModelParser):
                     filterArgs = None
                     multipleElements = False
 
-                    schedParam = parser.getElement(path, root=taskAlloc, multipleElements=multipleElements, filterArgs=filterArgs)
+                    schedParam = self.__get_elements(path, root=taskAlloc, multipleElements=multipleElements, filterArgs=filterArgs)
                     # if multipleElements is True, <elem> is a list -> use for loop to iterate over all elements
                     if schedParam is not None:
-                        priority = int(parser.xml_get(schedParam, 'priority'))
+                        priority = int(schedParam.get('priority'))
                         return priority
                     else:
                         return None
@@ -696,7 +860,7 @@ class AmaltheaParser(ModelParser):
         semantic = None
 
         # option 1: task name
-        name = parser.xml_get(task, 'name')
+        name = task.get('name')
         if ('let' in name or 'Let' in name or 'LET' in name):
             return Semantics.LET
         elif ('bet' in name or 'Bet' in name or 'BET' in name):
@@ -706,8 +870,8 @@ class AmaltheaParser(ModelParser):
         try:
             # get custom property
             path = ['task', 'customProperties', 'value']
-            customProperty = parser.getElement(path, root=task, multipleElements=False, filterArgs=None)
-            value = parser.xml_get(customProperty, 'value')
+            customProperty = self.__get_elements(path, root=task, multipleElements=False, filterArgs=None)
+            value = customProperty.get('value')
             
             if value in ['LET', 'let', 'Let']:
                 return Semantics.LET
@@ -727,14 +891,14 @@ class AmaltheaParser(ModelParser):
             quit('no supported version for __get_task_semantic()')
         multipleElements = True
 
-        accesses = parser.getElement(path, root=task, multipleElements=multipleElements, filterArgs=filterArgs)
+        accesses = self.__get_elements(path, root=task, multipleElements=multipleElements, filterArgs=filterArgs)
 
         tmp = list()
         if accesses is not None:
             for access in accesses:
                 # LabelAccessImplementation implementation will take on one of the following values: ['_undefined_', 'explicit', 'implicit', 'timed'] 
                 try:
-                    implementation = parser.xml_get(access, 'implementation')
+                    implementation = access.get('implementation')
                     if implementation == 'timed':
                         tmp.append(Semantics.LET)
                     elif (implementation == 'implicit' or implementation == 'explicit'):
@@ -773,12 +937,12 @@ class AmaltheaParser(ModelParser):
             return None
 
         multipleElements = True
-        pus = parser.getElement(path, multipleElements=multipleElements, filterArgs=filterArgs)
+        pus = self.__get_elements(path, multipleElements=multipleElements, filterArgs=filterArgs)
 
         print("\n[AmaltheaParser] get_resources")
 
         for pu in pus:
-            name = parser.xml_get(pu, 'name')
+            name = pu.get('name')
 
             frequency = self.__get_frequency(pu)
 
@@ -809,7 +973,7 @@ class AmaltheaParser(ModelParser):
         else:
             return None
         
-        lst = parser.getAssocaitedElement(path=path, rootElem=resource)                
+        lst = self.__get_associated_elements(path=path, rootElem=resource)                
         if lst is not None:
             for freqDomain in lst:
                 # Frequency defaultValue
@@ -817,10 +981,10 @@ class AmaltheaParser(ModelParser):
                 filterArgs = None
                 multipleElements = False
 
-                freqElem = parser.getElement(path, root=freqDomain, multipleElements=multipleElements, filterArgs=filterArgs)
+                freqElem = self.__get_elements(path, root=freqDomain, multipleElements=multipleElements, filterArgs=filterArgs)
                 if freqElem is not None:
-                    value = float(parser.xml_get(freqElem, 'value'))
-                    unit = parser.xml_get(freqElem, 'unit')
+                    value = float(freqElem.get('value'))
+                    unit = freqElem.get('unit')
 
                     frequency = value * freqUnits[unit]
 
@@ -841,13 +1005,13 @@ class AmaltheaParser(ModelParser):
 
         ipc = list()
 
-        lst = parser.getAssocaitedElement(path=path, rootElem=core)                
+        lst = self.__get_associated_elements(path=path, rootElem=core)                
         if lst is not None:    
             for hwFeature in lst:
                 if amalthea_version in ["0_9_5", "0_9_6", "0_9_7", "0_9_8", "0_9_9"]:            
                 # attributes
-                    value = float(parser.xml_get(hwFeature, 'value'))
-                    name = parser.xml_get(hwFeature, 'name')
+                    value = float(hwFeature.get('value'))
+                    name = hwFeature.get('name')
 
                     ipc.append(value)
         return ipc
@@ -867,19 +1031,19 @@ class AmaltheaParser(ModelParser):
         else:
             return None        
 
-        lst = parser.getAssocaitedElement(path=path, rootElem=resource, filterArg=filterArg)
+        lst = self.__get_associated_elements(path=path, rootElem=resource, filterArg=filterArg)
         if lst is not None:                
             for scheduler in lst:
                 if amalthea_version in ["0_9_3", "0_9_4", "0_9_5", "0_9_6", "0_9_7", "0_9_8", "0_9_9"]:             
                     # attributes
-                    name = parser.xml_get(scheduler, 'name')
+                    name = scheduler.get('name')
 
                     # TaskSchedulingAlgorithm schedulingAlgorithm
                     path = ['taskSchedulers', 'schedulingAlgorithm']
                     filterArgs = None
                     multipleElements = False
 
-                    algorithm = parser.getElement(path, root=scheduler, multipleElements=multipleElements, filterArgs=filterArgs)
+                    algorithm = self.__get_elements(path, root=scheduler, multipleElements=multipleElements, filterArgs=filterArgs)
                     if algorithm is not None:
                         xmlElement = algorithm
                         policy = xmlElement.attrib[xsi+'type']
@@ -887,8 +1051,8 @@ class AmaltheaParser(ModelParser):
                         if policy not in scheduler_mapping.keys():
                             # get custom property
                             path = ['schedulingAlgorithm', 'customProperties', 'value']
-                            customProperty = parser.getElement(path, root=algorithm, multipleElements=False, filterArgs=None)
-                            policy = parser.xml_get(customProperty, 'value')
+                            customProperty = self.__get_elements(path, root=algorithm, multipleElements=False, filterArgs=None)
+                            policy = customProperty.get('value')
 
                         try:
                             return scheduler_mapping[policy]
@@ -908,13 +1072,13 @@ class AmaltheaParser(ModelParser):
         else:
             return None
 
-        lst = parser.getAssocaitedElement(path=path, rootElem=task)               
+        lst = self.__get_associated_elements(path=path, rootElem=task)               
         if lst is not None:
             if len(lst) > 1:
-                print('the mapping of %s is ambiguous! Check the corresponding TaskAllocation element to change this!' % parser.xml_get(task, 'name'))               
+                print('the mapping of %s is ambiguous! Check the corresponding TaskAllocation element to change this!' % task.get('name'))               
             for pu in lst:                
                 # attributes
-                name = parser.xml_get(pu, 'name')
+                name = pu.get('name')
                 # here: only one result expected
                 return pu
 
@@ -957,7 +1121,7 @@ class AmaltheaParser(ModelParser):
         # option 2: Cause-Effect chain modelled using process events
         chains = self.__get_event_chains()
         for chain in chains:
-            name = parser.xml_get(chain, 'name')
+            name = chain.get('name')
 
             # get all chain segments             
             tasks = self.__get_chain_segments(chain)   
@@ -973,14 +1137,14 @@ class AmaltheaParser(ModelParser):
         # option 3: Process Chains
         processChains = self.__get_process_chains()
         for chain in processChains:
-            name = parser.xml_get(chain, 'name')
+            name = chain.get('name')
 
             if amalthea_version in ['0_7_2', '0_9_3', '0_9_8', '0_8_1', '0_9_9', '0_8_3', '0_8_2', '0_9_4', '0_9_5', '0_9_7', '0_9_0', '0_9_1', '0_9_2', '0_8_0']:
                 path = ['ProcessChain', 'Task']
             else:
                 return None
     
-            lst = parser.getAssocaitedElement(path=path, rootElem=chain)
+            lst = self.__get_associated_elements(path=path, rootElem=chain)
             tasks = list()         
             for t in lst:               
                 tasks.append(self.__pycpa_tasks[t])
@@ -1010,13 +1174,13 @@ class AmaltheaParser(ModelParser):
     #     graph_labels = dict()
     #     for label, task in self.__writing_tasks.items():
     #         data_dependency_graph.add_node(task)
-    #         graph_labels[task] = parser.xml_get(task, 'name')
+    #         graph_labels[task] = task.get('name')
 
     #     for label, tasks in self.__reading_tasks.items():
     #         for task in tasks:
     #             if not(data_dependency_graph.has_node(task)):
     #                 data_dependency_graph.add_node(task)
-    #                 graph_labels[task] = parser.xml_get(task, 'name')
+    #                 graph_labels[task] = task.get('name')
 
     #     for label, tasks in self.__reading_tasks.items():
     #         writing_task = self.__writing_tasks[label]
@@ -1056,11 +1220,11 @@ class AmaltheaParser(ModelParser):
     #     multipleElements = True
 
     #     ret = list()
-    #     constraints = parser.getElement(path, multipleElements=multipleElements, filterArgs=filterArgs)
+    #     constraints = self.__get_elements(path, multipleElements=multipleElements, filterArgs=filterArgs)
     #     for constraint in constraints:
-    #         name = parser.xml_get(constraint, 'name')
+    #         name = constraint.get('name')
 
-    #         mappingType = parser.xml_get(constraint, 'mappingType')
+    #         mappingType = constraint.get('mappingType')
     #         if mappingType != 'Reaction':
     #             continue # skip constraint            
 
@@ -1069,21 +1233,21 @@ class AmaltheaParser(ModelParser):
     #         multipleElements = False
 
     #         deadline = None
-    #         upper_limit = parser.getElement(path, root=constraint, multipleElements=multipleElements, filterArgs=filterArgs)
+    #         upper_limit = self.__get_elements(path, root=constraint, multipleElements=multipleElements, filterArgs=filterArgs)
     #         if upper_limit is not None:
     #             #attributes:
-    #             value = int(parser.xml_get(upper_limit, 'value'))
-    #             unit = parser.xml_get(upper_limit, 'unit')
+    #             value = int(upper_limit.get('value'))
+    #             unit = upper_limit.get('unit')
 
     #             deadline = value #* units[unit]
             
     #         # chain latency describe using LabelEvents (events of first and last label written in a path)
     #         try:            
     #             path = ['DelayConstraint', 'LabelEvent', 'Label']
-    #             source = parser.getAssocaitedElement(path, rootElem=constraint, filterArg='source')[0]
+    #             source = self.__get_associated_elements(path, rootElem=constraint, filterArg='source')[0]
                 
     #             path = ['DelayConstraint', 'LabelEvent', 'Label']
-    #             target = parser.getAssocaitedElement(path, rootElem=constraint, filterArg='target')[0]
+    #             target = self.__get_associated_elements(path, rootElem=constraint, filterArg='target')[0]
                 
     #             if deadline is not None:
     #                 ret.append((name, source, target, deadline))
@@ -1110,7 +1274,7 @@ class AmaltheaParser(ModelParser):
             return None
         multipleElements = True
 
-        xml_chains = parser.getElement(path, multipleElements=multipleElements, filterArgs=filterArgs)
+        xml_chains = self.__get_elements(path, multipleElements=multipleElements, filterArgs=filterArgs)
 
         return xml_chains
 
@@ -1131,22 +1295,22 @@ class AmaltheaParser(ModelParser):
 
         task_list = list()
 
-        segments = parser.getElement(path, root=chain, multipleElements=multipleElements, filterArgs=filterArgs)
+        segments = self.__get_elements(path, root=chain, multipleElements=multipleElements, filterArgs=filterArgs)
         if segments is not None:
             if amalthea_version in ['0_9_5', '0_9_6', '0_9_7', '0_9_8', '0_9_9']:
                 for segment in segments:
                     path = ['items', 'eventChain']
-                    ec = parser.getElement(path, root=segment, multipleElements=False, filterArgs=None)
+                    ec = self.__get_elements(path, root=segment, multipleElements=False, filterArgs=None)
 
                     # option 1: chain modeled using arbitrary ProcessEvents
                     try:
                         path = ['EventChain', 'ProcessEvent', 'Task']
-                        stimulus = parser.getAssocaitedElement(path, rootElem=ec, filterArg='stimulus')[0]
+                        stimulus = self.__get_associated_elements(path, rootElem=ec, filterArg='stimulus')[0]
                         if self.__pycpa_tasks[stimulus] not in task_list:
                             task_list.append(self.__pycpa_tasks[stimulus])
 
                         path = ['EventChain', 'ProcessEvent', 'Task']
-                        response = parser.getAssocaitedElement(path, rootElem=ec, filterArg='response')[0]
+                        response = self.__get_associated_elements(path, rootElem=ec, filterArg='response')[0]
                         if self.__pycpa_tasks[response] not in task_list:
                             task_list.append(self.__pycpa_tasks[response])
 
@@ -1157,12 +1321,12 @@ class AmaltheaParser(ModelParser):
                     # option 2: chain modeled using LabelEvents (read/write access to labels)
                     try:
                         path = ['EventChain', 'LabelEvent', 'Task']
-                        stimulus = parser.getAssocaitedElement(path, rootElem=ec, filterArg='stimulus')[0]
+                        stimulus = self.__get_associated_elements(path, rootElem=ec, filterArg='stimulus')[0]
                         if self.__pycpa_tasks[stimulus] not in task_list:
                             task_list.append(self.__pycpa_tasks[stimulus])
 
                         path = ['EventChain', 'LabelEvent', 'Task']
-                        response = parser.getAssocaitedElement(path, rootElem=ec, filterArg='response')[0]
+                        response = self.__get_associated_elements(path, rootElem=ec, filterArg='response')[0]
                         if self.__pycpa_tasks[response] not in task_list:
                             task_list.append(self.__pycpa_tasks[response])
                         
@@ -1193,7 +1357,7 @@ class AmaltheaParser(ModelParser):
             return None
 
         multipleElements = True
-        chains = parser.getElement(path, multipleElements=multipleElements, filterArgs=filterArgs)
+        chains = self.__get_elements(path, multipleElements=multipleElements, filterArgs=filterArgs)
 
         if chains is None:
             return list()
@@ -1219,7 +1383,7 @@ class AmaltheaParser(ModelParser):
         else:
             return None
         
-        lst = parser.getAssocaitedElement(path=path, rootElem=chain)                
+        lst = self.__get_associated_elements(path=path, rootElem=chain)                
         if lst is not None:
             constraint = lst[0] # only one result expected here
             # subordinated element: Time maximum
@@ -1227,12 +1391,12 @@ class AmaltheaParser(ModelParser):
             filterArgs = None
             multipleElements = False
 
-            max_constraint = parser.getElement(path, root=constraint, multipleElements=multipleElements, filterArgs=filterArgs)
+            max_constraint = self.__get_elements(path, root=constraint, multipleElements=multipleElements, filterArgs=filterArgs)
             if max_constraint is not None:
                 #attributes:
-                value = int(parser.xml_get(max_constraint, 'value'))
+                value = int(max_constraint.get('value'))
                 # TimeUnit unit will take on one of the following values: ['_undefined_', 's', 'ms', 'us', 'ns', 'ps'] 
-                unit = parser.xml_get(max_constraint, 'unit')
+                unit = max_constraint.get('unit')
 
                 deadline = value #* units[unit]
                 return deadline
@@ -1248,7 +1412,7 @@ class AmaltheaParser(ModelParser):
         else:
             return None
         
-        lst = parser.getAssocaitedElement(path=path, rootElem=chain)
+        lst = self.__get_associated_elements(path=path, rootElem=chain)
         if lst is not None:
             elem = lst[0] # only a single results expected
 
@@ -1257,10 +1421,10 @@ class AmaltheaParser(ModelParser):
             filterArgs = None
             multipleElements = False
 
-            limitValue = parser.getElement(path, root=elem, multipleElements=multipleElements, filterArgs=filterArgs)
+            limitValue = self.__get_elements(path, root=elem, multipleElements=multipleElements, filterArgs=filterArgs)
             if limitValue is not None:
-                value = int(parser.xml_get(limitValue, 'value'))
+                value = int(limitValue.get('value'))
                 # TimeUnit will take on one of the following values: ['_undefined_', 's', 'ms', 'us', 'ns', 'ps']
-                unit = parser.xml_get(limitValue, 'unit')
+                unit = limitValue.get('unit')
 
                 return value #* units[unit]
\ No newline at end of file
@@ -17,7 +17,8 @@ Toro
 Description
 ===========
 This module contains classes and functions for interpreting user inputs (prompts)
-to determine whether a system is analysable using TORO.
+to determine whether a system is analysable using TORO. The answers can also be 
+predefined (command line arguments or properties files), e.g. for unattended batch runs.
 """
 import os
 from .. import io
@@ -27,12 +28,58 @@ positive = ['y', 'Y', 'j', 'J', 'yes', 'Yes', 'ja', 'Ja']
 negative = ['N', 'n', 'no', 'No', 'nein', 'Nein']
     
  
+## values of the system properties that can be predefined instead of answering the prompts, cf. SystemProperties.set_properties()
+property_values = {'clock_sync': ['global', 'subchain'],
+                   'paradigm': ['LET', 'BET', 'mixed'],
+                   'periodic': valid_results,
+                   'implicit_deadlines': valid_results,
+                   'wcrt_knowledge': ['known', 'computable']}
+
+## system property that predefines the answer to a prompt: name of the attribute determined by the answer -> property name
+answered_by = {'clks_sync': 'clock_sync', 'subchain_sync': 'clock_sync',
+               'pp_let': 'paradigm', 'pp_bet': 'paradigm', 'pp_mixed': 'paradigm',
+               'periodic_tasks': 'periodic', 'implicit_deadlines': 'implicit_deadlines',
+               'wcrt_known': 'wcrt_knowledge', 'wcrt_computable': 'wcrt_knowledge'}
+
+
+def read_properties(file_name):
+    """ reads system properties from a csv file (one "property;value" line per property, 
+    following a header line), cf. property_values
+     
+    :param file_name: string
+    :rtype: dict, property name -> value
+    """
+    properties = dict()
+    with open(file_name, "r") as f:
+        lines = f.read().splitlines()
+    for l in lines[1:]:
+        if len(l.strip()) == 0:
+            continue
+        line = l.split(";")
+        if len(line) < 2:
+            quit("ERROR: Parser encountered unexpected input in " + file_name + ": \"" + l + "\".\nTORO terminates.")
+        properties[line[0].strip()] = line[1].strip()
+    return properties
+
+ 
 class SystemProperties(object):
     """
     This class provides functions to interactively check the properties of system to be analyzed.
+    Prompts are skipped if the answers have been predefined (cf. set_properties()).
     """
     
-    def __init__(self):
+    def __init__(self, properties=None, headless=False):
+        """
+        :param properties: dict, predefined system properties (cf. property_values)
+        :param headless: bool, never prompt the user, all properties have to be predefined
+        """
+        ## predefined answers to the prompts: name of the corresponding attribute -> bool
+        self.answers = dict()
+        ## never prompt the user
+        self.headless = headless
+        if properties is not None:
+            self.set_properties(properties)
+
         self.clks_sync = False
         self.subchain_sync = True
         self.pp_let = False   
@@ -44,6 +91,57 @@ class SystemProperties(object):
         self.wcrt_computable = False
         self.case = None
 
+    def set_properties(self, properties):
+        """
+        This function predefines the answers to the prompts based on system properties.
+
+        :param properties: dict, property name -> value (cf. property_values)
+        """
+        for name, value in properties.items():
+            if value is None:
+                continue
+            if (name not in property_values.keys()) or (value not in property_values[name]):
+                quit("ERROR: Invalid system property " + str(name) + "=" + str(value) + ", valid properties: " + str(property_values) + "\nTORO terminates.")
+
+            if name == 'clock_sync':
+                self.answers['clks_sync'] = (value == 'global')
+                if value == 'subchain':
+                    self.answers['subchain_sync'] = True
+            elif name == 'paradigm':
+                self.answers['pp_let'] = (value == 'LET')
+                if value != 'LET':
+                    self.answers['pp_bet'] = (value == 'BET')
+                if value == 'mixed':
+                    self.answers['pp_mixed'] = True
+            elif name == 'periodic':
+                self.answers['periodic_tasks'] = value in positive
+            elif name == 'implicit_deadlines':
+                self.answers['implicit_deadlines'] = value in positive
+            elif name == 'wcrt_knowledge':
+                self.answers['wcrt_known'] = (value == 'known')
+                if value == 'computable':
+                    self.answers['wcrt_computable'] = True
+
+
+    def _ask(self, key, question):
+        """
+        This function returns the answer to a prompt, unless it has been predefined the user is prompted.
+
+        :param key: string, name of the attribute determined by the answer
+        :param question: string
+        :rtype: bool, positive answer
+        """
+        if key in self.answers.keys():
+            return self.answers[key]
+        if self.headless:
+            quit("ERROR: System property \"" + answered_by[key] + "\" has not been specified (headless mode):\n" + question.strip() + "\nTORO terminates.")
+
+        ans = input(question)
+        while(ans not in valid_results):            
+            ans = input('Invalid input - try again [y/n]: ')
+        return ans in positive
+
+
     def _start(self, path):
         """
         This function starts user interaction. 
@@ -59,20 +157,12 @@ class SystemProperties(object):
         This functions checks synchronization of clocks and synchronized start of schedules.
         """
 
-        ans = input("Are the clocks in each system synchronized and all schedules start at the same time? [y/n]\n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:
+        if self._ask('clks_sync', "Are the clocks in each system synchronized and all schedules start at the same time? [y/n]\n"):
             self.clks_sync = True
             return
 
-        ans = input("Is each subchain exclusively executed on an arbitrary number of synchronized resources\
-                    \nor uses LET interconnect tasks to communicate between those resources? [y/n]\n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:
+        if self._ask('subchain_sync', "Is each subchain exclusively executed on an arbitrary number of synchronized resources\
+                    \nor uses LET interconnect tasks to communicate between those resources? [y/n]\n"):
             self.subchain_sync = True
             return
         else:
@@ -86,28 +176,16 @@ class SystemProperties(object):
         This functions checks the programming paradigm of tasks.
         """
         
-        ans = input("For each system, are all tasks subject to the LET programming paradigm? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:
+        if self._ask('pp_let', "For each system, are all tasks subject to the LET programming paradigm? [y/n] \n"):
             self.pp_let = True
             return    
 
 
-        ans = input("For each system, are all tasks subject to the BET programming paradigm? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:
+        if self._ask('pp_bet', "For each system, are all tasks subject to the BET programming paradigm? [y/n] \n"):
             self.pp_bet = True
             return
         
-        ans = input("For each system, are all tasks on a resource either subject to the LET or BET programming paradigm? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:                      
+        if self._ask('pp_mixed', "For each system, are all tasks on a resource either subject to the LET or BET programming paradigm? [y/n] \n"):                      
             self.pp_mixed = True
             return
         else:                      
@@ -118,13 +196,9 @@ class SystemProperties(object):
         """
         This functions checks the activation pattern. 
         """
-        ans = input("Are all tasks periodically activated? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:
+        if self._ask('periodic_tasks', "Are all tasks periodically activated? [y/n] \n"):
             self.periodic_tasks = True 
-        elif ans in negative:                        
+        else:                        
             quit("ERROR: Systems with not-periodic tasks are not supported yet.\nTORO terminates.")  
 
                                     
@@ -132,13 +206,9 @@ class SystemProperties(object):
         """
         This functions checks the type of task deadlines. 
         """
-        ans = input("Do all tasks have implicit deadlines if not specified otherwise? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:
+        if self._ask('implicit_deadlines', "Do all tasks have implicit deadlines if not specified otherwise? [y/n] \n"):
             self.implicit_deadlines = True 
-        elif ans in negative:                        
+        else:                        
             quit("ERROR: The system is not supported.\nTORO terminates.")           
             
                         
@@ -146,13 +216,9 @@ class SystemProperties(object):
         """
         This function checks whether the WCRTs of tasks are known or can be computed.
         """    
-        ans = input("Are the WCRTs known from all BET tasks in the cause-effect chains? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-
-        if ans in positive:
+        if self._ask('wcrt_known', "Are the WCRTs known from all BET tasks in the cause-effect chains? [y/n] \n"):
             self.wcrt_known = True
-        elif ans in negative:
+        else:
             self.wcrt_known = False           
 
 
@@ -161,30 +227,17 @@ class SystemProperties(object):
         The function checks whether the computation of WCRTs is possible.
         """
         print("Toro checks now whether the computation of WCRTs is possible.")
-        ans = input("\t Did you specify ALL tasks in the system (not only those in the listed cause-effect chains)? [y/n] \n")
-
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-        if ans in negative:
+        if not self._ask('wcrt_computable', "\t Did you specify ALL tasks in the system (not only those in the listed cause-effect chains)? [y/n] \n"):
             quit("ERROR: All tasks need to be described.\nTORO terminates")
 
-        ans = input("\t Did you specify the task-to-resource mapping for ALL tasks? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-        if ans in negative:
+        if not self._ask('wcrt_computable', "\t Did you specify the task-to-resource mapping for ALL tasks? [y/n] \n"):
             quit("ERROR: A complete task-to-resource mapping needs to be specified.\nTORO terminates")
 
     
-        ans = input("\t Did you specify the scheduling algorithm for each resource? Either SPP or SPNP? [y/n] \n")   
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-        if ans in negative:
+        if not self._ask('wcrt_computable', "\t Did you specify the scheduling algorithm for each resource? Either SPP or SPNP? [y/n] \n"):
             quit("ERROR: A scheduling algorithm has to be specified - Only SPP and SPNP supported so far.\nTORO terminates")
          
-        ans = input("\t Did you specify for ALL tasks: period, offset=0 (!), WCET, scheduling priority? [y/n] \n")
-        while(ans not in valid_results):            
-            ans = input('Invalid input - try again [y/n]: ')
-        if ans in positive:
+        if self._ask('wcrt_computable', "\t Did you specify for ALL tasks: period, offset=0 (!), WCET, scheduling priority? [y/n] \n"):
             self.wcrt_computable = True  
         else:
             quit("ERROR: Without detailed information on each task's period, offsetm wcet and priority the analysis will not worj.\nTORO terminates.")           
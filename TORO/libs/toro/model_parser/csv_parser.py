@@ -17,11 +17,12 @@ This module parses the CSV files that specify a system.
 
 import os
 import sys
+import csv
 from pycpa import model
 from pycpa import schedulers
 from .. import model as toro_model
 
-from .check import SystemProperties
+from .check import SystemProperties, read_properties, property_values
 
 from .parser import ModelParser
 
@@ -35,29 +36,39 @@ class CSVParser(ModelParser):
     resources = list()
     system = None
     oWCRT = False
-    __error = False
 
     def __init__(self, args):
         """
         Parsing the files resources.csv, tasks.csv, chains.csv.
+        System properties are read from the file properties.csv of a system's folder if it exists, 
+        else the properties given for all systems are used (cf. __check_csv_properties()).
         """
-        sys_properties  = self.__check_csv_properties(args)
-        self.case = sys_properties.case
-
-        # type of system determined by the user query
-        assert (self.case in [1,2,3,4,5])
+        self.__args = args
+        ## case of all systems without properties file, determined when the first of those systems is parsed
+        self.__common_case = None
+        self.case = None
 
 
-    def __check_csv_properties(self, args):
+    def __check_csv_properties(self, args, path, properties_file=None):
         """ verify whether system is analysable using TORO by
-        prompting the user with questions about the system.
+        prompting the user with questions about the system. Answers are predefined by 
+        the properties file given by args.properties, the property arguments and the system's own 
+        properties file, the user is only prompted for missing properties (never in headless mode).
 
         :param args: args dummy class
+        :param path: string, path of the system(s)
+        :param properties_file: string, path of the properties file of a system
         :rtype:  Check
         """
-        check_properties = SystemProperties()
-
-        check_properties._start(args.path)
+        check_properties = SystemProperties(headless=getattr(args, 'headless', False))
+        # properties given for all systems, properties of the system's own file take precedence
+        if getattr(args, 'properties', None) is not None:
+            check_properties.set_properties(read_properties(args.properties))
+        check_properties.set_properties({name: getattr(args, name, None) for name in property_values.keys()})
+        if properties_file is not None:
+            check_properties.set_properties(read_properties(properties_file))
+
+        check_properties._start(path)
         check_properties._clock_sync() 
         check_properties._programming_paradigm() 
         check_properties._activation_pattern()
@@ -79,41 +90,40 @@ class CSVParser(ModelParser):
         """
         assert folder_name is not None
 
-        # parse resources.csv
-        file = None
-        try:
-            file = open(os.path.join(folder_name, "resources.csv"),"r")
-        except (OSError, IOError):
-            print("ERROR: Parser cannot open resources file:\"" + str(folder_name) + "/resources.csv\"")
+        # type of system determined by the system properties
+        properties_file = os.path.join(folder_name, "properties.csv")
+        if os.path.exists(properties_file):
+            self.case = self.__check_csv_properties(self.__args, folder_name, properties_file).case
+        else:
+            if self.__common_case is None:
+                self.__common_case = self.__check_csv_properties(self.__args, self.__args.path).case
+            self.case = self.__common_case
+        assert (self.case in [1,2,3,4,5])
+
+        self.__errors = list()
 
-        if file != None:
-            csv_resc = self.__read_csv_resc(file)
-            self.resources = self._get_resources(csv_resc)
+        # parse resources.csv
+        csv_rescs = self.__read_csv_resc(folder_name)
+        if csv_rescs is not None:
+            self.resources = self._get_resources(csv_rescs)
             self.system = model.System(folder_name.split("/")[-1])
             for resc in self.resources:
                 self.system.bind_resource(resc)
-        
+
         # parse tasks.csv
-        file = None
-        try:
-            file = open(os.path.join(folder_name, "tasks.csv"),"r")
-        except (OSError, IOError):
-            print("ERROR: Parser cannot open resources file:\"" + str(folder_name) + "/tasks.csv\"")
-        if file != None:
-            csv_tasks = self.__read_csv_tasks(file)
+        csv_tasks = self.__read_csv_tasks(folder_name)
+        if (csv_tasks is not None) and (csv_rescs is not None):
             self.tasks = self._get_tasks(csv_tasks)
 
         # parse chains.csv
-        file = None
-        try: 
-            file = open(os.path.join(folder_name, "chains.csv"),"r")
-        except (OSError, IOError):
-            print("ERROR: Parser cannot open resources file:\"" + str(folder_name) + "/chains.csv\"")
-        if file != None:
-            csv_chains = self.__read_csv_chains(file)
+        csv_chains = self.__read_csv_chains(folder_name)
+        if (csv_chains is not None) and (csv_tasks is not None) and (csv_rescs is not None):
             self.chains = self._get_chains(csv_chains)
-        
-        if self.__error:
+
+        # report all errors at once
+        if len(self.__errors) > 0:
+            for error in self.__errors:
+                print("ERROR: " + error)
             print(">> QUIT")
             quit()
 
@@ -123,46 +133,58 @@ class CSVParser(ModelParser):
     def _get_tasks(self, csv_tasks):
         """
         Each task in the parsed list of tasks is converted into an instance of a pyCPA task model.
-        Each task is related to a resource.
+        Each task is related to a resource, resources are looked up by name.
         """
         tasks = list()
 
+        # resources by name (the first one, if names are not unique)
+        resources = dict()
+        for resc in self.resources:
+            resources.setdefault(resc.name, resc)
+
         for csv_task in csv_tasks:
             t_name = csv_task["name"]
-            t_period = csv_task["period"]
+            t_period = csv_task.get("period", None)
             t_offset = csv_task["offset"]
-
-            try:
-                t_bcet = csv_task["bcet"]
-            except:
-                t_bcet = 0
-
-            try:
-                t_wcet = csv_task["wcet"]
-            except:
-                t_wcet = None
-
-            try:
-                t_bcrt = csv_task["bcrt"]
-            except:
-                t_bcrt = None
-
-            try:
-                t_wcrt = csv_task["wcrt"]
-            except:
-                t_wcrt = None          
+            t_bcet = csv_task.get("bcet", 0)
+            t_wcet = csv_task.get("wcet", None)
+            t_bcrt = csv_task.get("bcrt", None)
+            t_wcrt = csv_task.get("wcrt", None)
 
             if 'BET' in t_name:
                 t_semantic = toro_model.Semantic.BET
                 t_let = None
                 if (not isinstance(t_wcrt, int) or not isinstance(t_bcrt, int)):
                     if(not isinstance(t_wcet, int) or not isinstance(t_bcet, int)):
-                        quit("Neither execution nor response times are defined for task " + t_name)
+                        self.__errors.append("Neither execution nor response times are defined for task " + t_name)
+                        continue
 
             elif 'LET' in t_name:
                 t_semantic = toro_model.Semantic.LET
-                t_let = csv_task["let"]
-            t_prio = csv_task["priority"]
+                t_let = csv_task.get("let", None)
+            else:
+                self.__errors.append("Parser cannot derive the semantic (BET or LET) of task \"" + t_name + "\" from its name")
+                continue
+            t_prio = csv_task.get("priority", None)
+
+            # missing ('n/a') or invalid entries of mandatory parameters: the LET of LET tasks and the priority
+            # of BET tasks whose response times have to be computed
+            mandatory = [("period", t_period)]
+            if t_semantic == toro_model.Semantic.LET:
+                mandatory.append(("let", t_let))
+            elif not isinstance(t_wcrt, int) or not isinstance(t_bcrt, int):
+                mandatory.append(("priority", t_prio))
+            undefined = [column for column, value in mandatory if value is None]
+            if len(undefined) > 0:
+                self.__errors.append("Parser found no valid " + ", ".join(undefined) + " of task \"" + t_name + "\"")
+                continue
+
+            # Check that the task is assigned to a known resource.
+            resc = resources.get(csv_task["resource"], None)
+            if resc is None:
+                self.__errors.append("Parser cannot assign task \"" + t_name + 
+                                     "\" to a unknown resource \"" + csv_task["resource"] + "\"")
+                continue
 
             t = toro_model.extTask(
                 name = t_name,
@@ -181,19 +203,8 @@ class CSVParser(ModelParser):
                 if t_let > t_period:
                     t.set_system_level_task()
 
-
-            # Check that the task is assigned to a known resource.
-            hit = False
-            for resc in self.resources:
-                if resc.name == csv_task["resource"]:
-                    resc.bind_task(t)
-                    hit = True
-            if hit:
-                tasks.append(t)
-            else:
-                self.__error = True
-                assert False, ("ERROR: Parser cannot assign task \"" + csv_task["name"] + 
-                               "\" to a unknown resource \"" + csv_task["resource"] + "\"")
+            resc.bind_task(t)
+            tasks.append(t)
        
         return tasks
 
@@ -201,27 +212,21 @@ class CSVParser(ModelParser):
     def _get_chains(self, csv_chains):
         """
         Check that cause-effect chains do not consist of tasks that are not specified in tasks.csv.
-        Return list of pyCPA task instances as cause-effect chain.
+        Return list of pyCPA task instances as cause-effect chain. Tasks are looked up by name.
         """
+        # tasks by name (the first one, if names are not unique)
+        tasks = dict()
+        for task in self.tasks:
+            tasks.setdefault(task.name, task)
+
         chains = list()
-        for csv_chain in csv_chains.keys():
-            task_list = list()
-            hit = False
-            skippedTasks = ""
-            for task_name in csv_chains[csv_chain]['tasks']:
-                hit = False
-                for task in self.tasks:
-                    if task_name == task.name:
-                        task_list.append(task)
-                        hit = True
-                        break
-                if not hit:
-                    skippedTasks +=  " \"" + task_name + "\""
-            if hit:
-                chains.append(toro_model.extEffectChain(csv_chain, task_list, csv_chains[csv_chain]['e2e_deadline']))
+        for csv_chain, csv_chain_desc in csv_chains.items():
+            task_list = [tasks.get(task_name, None) for task_name in csv_chain_desc['tasks']]
+            skippedTasks = [task_name for task_name, task in zip(csv_chain_desc['tasks'], task_list) if task is None]
+            if len(skippedTasks) == 0:
+                chains.append(toro_model.extEffectChain(csv_chain, task_list, csv_chain_desc['e2e_deadline']))
             else:
-                self.__error = True
-                assert False, "ERROR: Parser cannot find task(s) " + str(skippedTasks) + " in chain: \"" + str(csv_chain) + "\""
+                self.__errors.append("Parser cannot find task(s) " + " ".join("\"" + t + "\"" for t in skippedTasks) + " in chain: \"" + str(csv_chain) + "\"")
         return chains
 
 
@@ -248,153 +253,145 @@ class CSVParser(ModelParser):
         return rescs
 
 
-    def __read_csv_chains(self, file):
+    def __read_csv(self, folder_name, file_name):
+        """
+          This function reads a csv file in one pass and returns the header and all remaining (non-empty) lines,
+          split into their fields. 
+        """
+        try:
+            with open(os.path.join(folder_name, file_name), "r", newline='') as file:
+                lines = [line for line in csv.reader(file, delimiter=';') if len(line) > 0]
+        except (OSError, IOError):
+            self.__errors.append("Parser cannot open file:\"" + str(folder_name) + "/" + file_name + "\"")
+            return None, None
+
+        if (len(lines) == 0) or (len(";".join(lines[0])) <= 3):
+            self.__errors.append("Parser encountered unexpected input in " + file_name + ".")
+            return None, None
+        return lines[0], lines[1:]
+
+
+    def __get_keys(self, header, known_keys, file_name):
+        """
+          This function maps the column names of a header to keys, every column name contains 
+          one of the known keys (checked in the order of the list).
+        """
+        keys = list()
+        for key in header:
+            key = key.lower()
+            for known_key, name in known_keys:
+                if known_key in key:
+                    keys.append(name)
+                    break
+            else:
+                self.__errors.append("Parser found unknown key in " + file_name + ": \"" + key + "\"")
+                keys.append(None)
+        return keys
+
+
+    def __get_columns(self, lines, keys, file_name):
+        """
+          This function transposes lines into columns (key -> list of values). Additional fields 
+          at the end of a line are ignored.
+        """
+        columns = {key: list() for key in keys if key is not None}
+        indices = [(i, key) for i, key in enumerate(keys) if key is not None]
+        valid = True
+        for n, line in enumerate(lines):
+            if len(line) < len(keys):
+                self.__errors.append("Line " + str(n + 2) + " of " + file_name + " has " + str(len(line)) + " instead of " + str(len(keys)) + " entries")
+                valid = False
+        if not valid:
+            return None
+        for i, key in indices:
+            columns[key] = [line[i] for line in lines]
+        return columns
+
+
+    def __to_int(self, values, column, file_name):
+        """
+          This function converts a column of values to integers in bulk ('n/a' is converted to None).
+          Every invalid value is reported.
+        """
+        try:
+            return [None if value == 'n/a' else int(value) for value in values]
+        except ValueError:
+            converted = list()
+            for n, value in enumerate(values):
+                try:
+                    converted.append(None if value == 'n/a' else int(value))
+                except ValueError:
+                    self.__errors.append("Invalid entry \"" + value + "\" in column " + column + ", line " + str(n + 2) + " of " + file_name)
+                    converted.append(None)
+            return converted
+
+
+    def __read_csv_chains(self, folder_name):
         """
           This function returns a dictionary of cause-effect chains, where the key is the
           name of the cause-effect chain and the value is a list of tasks.
         """                
+        header, lines = self.__read_csv(folder_name, "chains.csv")
+        if header is None:
+            return None
+
+        # checking for correct keys (members are listed from the third column on)
+        self.__get_keys(header[0:2], [("chain_name", "chain_name"), ("e2e_deadline", "e2e_deadline"), ("members", "members")], "chains.csv")
+
         chains = dict()
-        
-        l = file.readline()
-        keys = list()
-        if len(l) > 3:
-            l = self.__remove_trailing_newline_char(l)
-            # checking for correct keys
-            line = l.split(";")
-            for key in line[0:2]:
-                key = key.lower()
-                if  "chain_name" in key:
-                    keys.append("chain_name")
-                elif "e2e_deadline" in key:
-                    keys.append("e2e_deadline")                      
-                elif "members" in key:
-                    keys.append("members")
-                else:
-                    assert False, ("ERROR: Parser found unknown key in chain.csv: \"" + str(key) + "\"")        
-                    
-            l = file.readline()
-            while l:
-                l = self.__remove_trailing_newline_char(l)
-                line = l.split(";")
-                tasks = list()
-                for i in range(2,len(line)): # modified to start from 2
-                    tasks.append(line[i])
-                if str(line[1]) == 'n/a' or str(line[1]) == 'unknown':
-                    e2e_deadline = None
-                elif str(line[1]).isdigit():
-                    e2e_deadline = int(line[1])   
-                else:
-                    assert False, "Entry for e2e deadline of chain " + str(line[0]) + " is not supported."
-                chains[line[0]] = {'tasks': tasks, 'e2e_deadline': e2e_deadline}
-                l = file.readline()
-            return chains
-        else:
-            print("ERROR: Parser encountered unexpected input in chains.csv.")        
+        for line in lines:
+            if len(line) < 2:
+                self.__errors.append("Parser encountered unexpected input in chains.csv: \"" + ";".join(line) + "\"")
+                continue
+            if line[1] == 'n/a' or line[1] == 'unknown':
+                e2e_deadline = None
+            elif line[1].isdigit():
+                e2e_deadline = int(line[1])   
+            else:
+                self.__errors.append("Entry for e2e deadline of chain " + str(line[0]) + " is not supported.")
+                continue
+            chains[line[0]] = {'tasks': line[2:], 'e2e_deadline': e2e_deadline}
+        return chains
 
 
-    def __read_csv_tasks(self, file):
+    def __read_csv_tasks(self, folder_name):
         """
           This function returns a list of tasks specified in the file tasks.csv. 
           Each list element is a dictionary with entries for parameters. 
         """        
-        tasks = list()
-        
-        l = file.readline()
-        keys = list()
-        if len(l) > 3:
-            l = self.__remove_trailing_newline_char(l)
-            # checking for correct keys
-            line = l.split(";")
-            for key in line:
-                key = key.lower()
-                if  "task_name" in key:
-                    keys.append("name")
-                elif  "period" in key:
-                    keys.append("period")
-                elif  "offset" in key:
-                    keys.append("offset")                    
-                elif  "priority" in key:
-                    keys.append("priority")
-                elif  "bcet" in key:
-                    keys.append("bcet")
-                elif  "wcet" in key:
-                    keys.append("wcet")
-                elif  "resource" in key:
-                    keys.append("resource")  
-                elif  "bcrt" in key:
-                    keys.append("bcrt")                                      
-                elif  "wcrt" in key:
-                    keys.append("wcrt")
-                elif  "let" in key:
-                    keys.append("let")
-                else:
-                    print("ERROR: Parser found unknown key: \"" + key + "\"")
-            # parsing tasks
-            l = file.readline()
-            while l:
-                l = self.__remove_trailing_newline_char(l)
-                line = l.split(";")
-                task = dict()
-                for i in range(len(keys)):
-                    if keys[i] == "name":
-                        task[keys[i]] = str(line[i])
-                    elif keys[i] == "resource":
-                        task[keys[i]] = str(line[i])
-                    else: 
-                        if str(line[i]) == 'n/a':
-                            task[keys[i]] = None
-                        else:    
-                            task[keys[i]] = int(line[i])
-                tasks.append(task)
-                l = file.readline()
-            return tasks
-        else:
-            print("ERROR: Parser encountered unexpected input in tasks.csv.")    
+        header, lines = self.__read_csv(folder_name, "tasks.csv")
+        if header is None:
+            return None
+
+        # checking for correct keys
+        keys = self.__get_keys(header, [("task_name", "name"), ("period", "period"), ("offset", "offset"), ("priority", "priority"), 
+                                        ("bcet", "bcet"), ("wcet", "wcet"), ("resource", "resource"), ("bcrt", "bcrt"), 
+                                        ("wcrt", "wcrt"), ("let", "let")], "tasks.csv")
+        columns = self.__get_columns(lines, keys, "tasks.csv")
+        if columns is None:
+            return None
 
+        # convert all numeric columns at once
+        for key in columns.keys():
+            if key not in ["name", "resource"]:
+                columns[key] = self.__to_int(columns[key], key, "tasks.csv")
 
-    def __read_csv_resc(self, file):
+        return [dict(zip(columns.keys(), values)) for values in zip(*columns.values())]
+
+
+    def __read_csv_resc(self, folder_name):
         """
           This function returns a list of resources specified in the file resources.csv. 
           Each list element is a dictionary with entries for resource name and scheduler. 
         """
-        rescs = list()
-         
-        l = file.readline()
-        keys = list()
-        if len(l) > 3:
-            # checking for correct keys
-            l = self.__remove_trailing_newline_char(l)
-            line = l.split(";")
-            for key in line:
-                key = key.lower()
-                if  "name" in key:
-                    keys.append("name")
-                elif  "scheduler" in key:
-                    keys.append("scheduler")
-                else:
-                    print("ERROR: Parser found unknown key: \"" + key + "\".")
-            # parsing resources
-            l = file.readline()
-            while l:
-                l = self.__remove_trailing_newline_char(l)   
-                line = l.split(";")
-                resc = dict()
-                for i in range(len(keys)):
-                        resc[keys[i]] = str(line[i])
-                rescs.append(resc)
-                l = file.readline()
-            return rescs
-        else:
-            print("ERROR: Parser encountered unexpected input in resources.csv.")
+        header, lines = self.__read_csv(folder_name, "resources.csv")
+        if header is None:
+            return None
 
-        
-    
-    
-    def __remove_trailing_newline_char(self, line):
-        if line[-1] == "\n":
-            line = line[0:-1] # remove \n
-        if line[-1] == "\r":
-            line = line[0:-1] # remove \r
-        if line[-1] == "\n":
-            line = line[0:-1] # remove \n     
-        return line   
\ No newline at end of file
+        # checking for correct keys
+        keys = self.__get_keys(header, [("name", "name"), ("scheduler", "scheduler")], "resources.csv")
+        columns = self.__get_columns(lines, keys, "resources.csv")
+        if columns is None:
+            return None
+
+        return [dict(zip(columns.keys(), values)) for values in zip(*columns.values())]
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Copyright Notice
+================
+Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+===========
+Normalisation of the time base of a parsed system: all periods, offsets, execution and response
+times, LETs and deadlines are converted to integers in the coarsest exact common time base, i.e.
+they are divided by their greatest common divisor. Fractional values (e.g. execution times of
+Amalthea models, which are derived from ticks and frequencies) become integers as well, so the
+analysis of such systems is exact instead of being subject to floating point rounding. Ratios of
+time values are not affected: hyperperiods and the number of jobs of the data propagation graphs
+stay the same. Analysis results are converted back to the time base of the model.
+"""
+
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from pycpa import model
+
+
+
+class TimeBase(object):
+    """
+    This class determines the common time base of a system, normalises the system to it
+    and converts analysis results back to the time base of the model.
+    """
+
+    ## largest denominator of fractional (float) time values, e.g. 1.3333333333333335 -> 4/3
+    max_denominator = 10**6
+
+    ## time attributes of tasks
+    task_attributes = ['release_offset', 'bcet', 'wcet', 'let', 'wcrt', 'bcrt', 'deadline']
+
+    ## time attributes of (PJd) event models
+    event_model_attributes = ['P', 'J', 'dmin', 'phi']
+
+    ## time attributes of cause-effect chains and subchains
+    chain_attributes = ['e2e_deadline', 'transition_deadline', 'latency', 'transition_latency', 'combined_latency']
+
+    def __init__(self, system, chains):
+        """ determines the common time base of all time values of the system
+
+        :param system: pyCPA System object
+        :param chains: list of TORO extEffectChain objects
+        """
+        ## system and cause-effect chains
+        self.system = system
+        self.chains = chains
+
+        ## the system is given in the normalised time base
+        self.normalized = False
+
+        ## time values that could not be represented exactly (deviation of the nearest fraction),
+        ## systems with such values are not normalised
+        self.deviations = dict()
+
+        values = list()
+        for obj, attributes in self.__objects():
+            for attribute in attributes:
+                value = getattr(obj, attribute, None)
+                if value is not None:
+                    values.append(self.__fraction(value, "%s.%s" % (getattr(obj, 'name', obj), attribute)))
+
+        # gcd of fractions: gcd of the numerators (common denominator) divided by the common denominator
+        denominator = 1
+        for value in values:
+            denominator = denominator * value.denominator // math.gcd(denominator, value.denominator)
+        numerator = 0
+        for value in values:
+            numerator = math.gcd(numerator, value.numerator * (denominator // value.denominator))
+
+        ## duration of one tick of the normalised time base in the time base of the model
+        self.base = Fraction(numerator, denominator) if numerator != 0 else Fraction(1)
+
+
+    def normalize(self):
+        """ converts all time values of the system to integers in the common time base. Systems with
+        time values that cannot be represented exactly are not normalised, as rounding execution or
+        response times would render the analysis unsafe.
+
+        :rtype: bool, the system is given in the normalised time base
+        """
+        if len(self.deviations) > 0:
+            print("WARNING: %d time values of system %s cannot be represented exactly (largest deviation: %s), the time base is not normalised"
+                  % (len(self.deviations), self.system.name, str(max(self.deviations.values()))))
+            return False
+        if self.normalized is False:
+            self.__scale(lambda value: self.to_base(value))
+            self.normalized = True
+        return True
+
+
+    def denormalize(self):
+        """ converts all time values of the system (including response times and subchain deadlines
+        determined by the analysis) back to the time base of the model
+
+        :rtype: None
+        """
+        if self.normalized is True:
+            self.__scale(lambda value: self.to_time(value))
+            self.normalized = False
+
+
+    def to_base(self, value):
+        """ converts a value of the model's time base to the normalised time base.
+        Time values of normalised systems are multiples of the time base, other values (e.g. robustness
+        margins of a results stream written in another time base) are rounded down.
+
+        :param value: int, float, dict, list, tuple or None
+        :rtype: int (dict, list, tuple or None)
+        """
+        if isinstance(value, dict):
+            return {k: self.to_base(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.to_base(v) for v in value)
+        if (value is None) or (isinstance(value, float) and not math.isfinite(value)):
+            return value
+        return math.floor(self.__fraction(value) / self.base)
+
+
+    def to_time(self, value):
+        """ converts a value of the normalised time base back to the model's time base
+
+        :param value: int, dict, list, tuple or None
+        :rtype: int or float (dict, list, tuple or None)
+        """
+        if isinstance(value, dict):
+            return {k: self.to_time(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.to_time(v) for v in value)
+        if (value is None) or (isinstance(value, float) and not math.isfinite(value)):
+            return value
+        value = self.__fraction(value) * self.base
+        if value.denominator == 1:
+            return value.numerator
+        return float(value)
+
+
+    def toString(self):
+        """ returns a short description of the time base
+
+        :rtype: string
+        """
+        return "Time base of system %s: 1 tick = %s time units of the model" % (self.system.name, str(self.base))
+
+
+    def __objects(self):
+        """ yields all objects of the system with time attributes and the names of these attributes
+
+        :rtype: generator of tuples (object, list of strings)
+        """
+        for resource in self.system.resources:
+            for task in resource.tasks:
+                yield task, self.task_attributes
+                if task.in_event_model is not None:
+                    yield task.in_event_model, self.event_model_attributes
+        for chain in self.chains:
+            yield chain, self.chain_attributes
+            for subchain in getattr(chain, 'decomposed_chains', list()):
+                yield subchain, self.chain_attributes
+
+
+    def __scale(self, convert):
+        """ converts all time values of the system
+
+        :param convert: function, conversion of a single value
+        :rtype: None
+        """
+        for obj, attributes in self.__objects():
+            if attributes is self.event_model_attributes:
+                continue
+            for attribute in attributes:
+                value = getattr(obj, attribute, None)
+                if value is not None:
+                    setattr(obj, attribute, convert(value))
+
+        # event models derive their event functions from their parameters, new models are created instead
+        for resource in self.system.resources:
+            for task in resource.tasks:
+                em = task.in_event_model
+                if isinstance(em, model.PJdEventModel):
+                    phi = getattr(em, 'phi', None)
+                    task.in_event_model = model.PJdEventModel(P=convert(em.P), J=convert(em.J), dmin=convert(em.dmin),
+                                                              phi=convert(phi) if phi is not None else None)
+
+
+    def __fraction(self, value, name=None):
+        """ returns a time value as fraction. Floats are approximated by the nearest fraction with
+        a denominator of at most max_denominator.
+
+        :param value: int or float
+        :param name: string, name of the value (deviations of values with a name are recorded)
+        :rtype: Fraction
+        """
+        if isinstance(value, (Fraction, int, np.integer)):
+            return Fraction(int(value)) if not isinstance(value, Fraction) else value
+        fraction = Fraction(float(value)).limit_denominator(self.max_denominator)
+        deviation = abs(float(fraction) - float(value))
+        if (name is not None) and (deviation > 1e-9 * max(1.0, abs(float(value)))):
+            self.deviations[name] = deviation
+        return fraction
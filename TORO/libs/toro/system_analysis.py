@@ -21,7 +21,13 @@ of class SystemAnalysisResults that is used to aggregate analysis results for st
 
 import copy
 import sys
-from collections import deque
+import itertools
+import contextlib
+import concurrent.futures
+from collections import deque, OrderedDict
+from io import StringIO
+
+import dill
 
 sys.path.append(sys.path[0] + "/libs/")
 
@@ -32,12 +38,11 @@ from pycpa import analysis # NOTE: only here for pytest
 from . import io
 from . import model
 from . import chain_analysis as ChainAnalysis
+from . import graph_wrappers
 
 Semantic = model.Semantic
 toro_analysis_BET_LET = ChainAnalysis.analysis_LET_BET
 
-## dict of chain analysis objects for each sub_chain
-analyses = dict()
 
 
 
@@ -106,6 +111,181 @@ class SystemAnalysisResults(object):
 
 
 
+class AnalysisCache(object):
+    """ bounded cache of chain analysis objects with already built data propagation graphs.
+    Analyses are stored under the content fingerprint of their chain (cf. chain_fingerprint()) and
+    the graph options, thus equivalent chains (e.g. a chain that has been parsed again) share one analysis.
+    The least recently used analyses are evicted once more than maxsize analyses or analyses with more than
+    max_jobs jobs (graph nodes) in total are stored.
+    """
+
+    def __init__(self, maxsize=256, max_jobs=5000000):
+        """
+        :param maxsize: int, maximum number of cached analyses (None: unbounded)
+        :param max_jobs: int, maximum number of jobs of all cached analyses (None: unbounded)
+        """
+        ## cached analyses: key -> (analysis, number of jobs), ordered from least to most recently used
+        self.__entries = OrderedDict()
+
+        self.maxsize = maxsize
+        self.max_jobs = max_jobs
+
+        ## total number of jobs of all cached analyses
+        self.jobs = 0
+
+        ## cache statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def key(self, chain, backend=None, vis=False, reduce_roots=False):
+        """ returns the key an analysis of the chain is stored under
+
+        :param chain: TORO extEffectChain
+        :param backend: string, graph wrapper (cf. graph_wrappers.backends)
+        :param vis: bool, graph visualisation enabled
+        :param reduce_roots: bool, only representative root jobs are instantiated
+        :rtype: tuple
+        """
+        if backend is None:
+            backend = graph_wrappers.default_backend
+        return (chain_fingerprint(chain), backend, bool(vis), bool(reduce_roots))
+
+    def get(self, chain, backend=None, vis=False, reduce_roots=False):
+        """ returns the cached analysis of an equivalent chain or None
+
+        :param chain: TORO extEffectChain
+        :param backend: string
+        :param vis: bool
+        :param reduce_roots: bool
+        :rtype: ChainAnalysis object or None
+        """
+        key = self.key(chain, backend, vis, reduce_roots)
+        if key not in self.__entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key][0]
+
+    def put(self, chain, analysis, backend=None, vis=False, reduce_roots=False):
+        """ stores the analysis of a chain and evicts the least recently used analyses if necessary
+
+        :param chain: TORO extEffectChain
+        :param analysis: ChainAnalysis object
+        :param backend: string
+        :param vis: bool
+        :param reduce_roots: bool
+        """
+        key = self.key(chain, backend, vis, reduce_roots)
+        if key in self.__entries:
+            self.jobs -= self.__entries.pop(key)[1]
+
+        job_cnt = analysis.get_job_count()
+        self.__entries[key] = (analysis, job_cnt)
+        self.jobs += job_cnt
+
+        # the analysis that has just been added is never evicted
+        while (len(self.__entries) > 1) and (((self.maxsize is not None) and (len(self.__entries) > self.maxsize))
+                                             or ((self.max_jobs is not None) and (self.jobs > self.max_jobs))):
+            self.jobs -= self.__entries.popitem(last=False)[1][1]
+            self.evictions += 1
+
+    def clear(self):
+        """ removes all analyses from the cache (statistics are kept) """
+        self.__entries.clear()
+        self.jobs = 0
+
+    def toString(self):
+        """ print cache statistics to string
+
+        :rtype: string
+        """
+        return ("Analysis cache: %d analyses (%d jobs), %d hits, %d misses, %d evictions" 
+                % (len(self.__entries), self.jobs, self.hits, self.misses, self.evictions))
+
+
+
+class ResponseTimeCache(object):
+    """ bounded cache of the response times of groups of resources, stored under the content fingerprint
+    of their task sets (cf. resources_fingerprint()). The least recently used entries are evicted once more
+    than maxsize groups are stored.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: int, maximum number of cached groups (None: unbounded)
+        """
+        ## cached response times: fingerprint -> list (resources) of lists (tasks) of (bcrt, wcrt),
+        ## ordered from least to most recently used
+        self.__entries = OrderedDict()
+
+        self.maxsize = maxsize
+
+        ## cache statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key):
+        """ returns the cached response times of a group of resources or None
+
+        :param key: tuple, cf. resources_fingerprint()
+        :rtype: list of lists of tuples (bcrt, wcrt) or None
+        """
+        if key not in self.__entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key]
+
+    def put(self, key, response_times):
+        """ stores the response times of a group of resources and evicts the least recently used entries if necessary
+
+        :param key: tuple, cf. resources_fingerprint()
+        :param response_times: list of lists of tuples (bcrt, wcrt), cf. analyse_resources_spec()
+        """
+        self.__entries[key] = response_times
+        self.__entries.move_to_end(key)
+        while (self.maxsize is not None) and (len(self.__entries) > self.maxsize):
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """ removes all entries from the cache (statistics are kept) """
+        self.__entries.clear()
+
+    def toString(self):
+        """ print cache statistics to string
+
+        :rtype: string
+        """
+        return ("Response time cache: %d resource groups, %d hits, %d misses, %d evictions"
+                % (len(self.__entries), self.hits, self.misses, self.evictions))
+
+
+
+## cache of chain analysis objects for each (sub)chain
+analyses = AnalysisCache()
+
+## persistent on-disk caches of chain analysis results and graphs: cache directory -> io.ResultsCache object
+results_caches = dict()
+
+## cache of the worst-case response times of groups of resources
+response_times = ResponseTimeCache()
+
+
+
+
 class argsDummy(object):
     """ dummy class for analyses arguments that can be used
     if the args perform_analyis received have to be altered
@@ -121,7 +301,7 @@ class argsDummy(object):
 #----------------------------#
 
 
-def perform_analysis(args, system, chains, performance_eval=False):
+def perform_analysis(args, system, chains, performance_eval=False, stream=None, time_base=None):
     """ calls all functions for performing the latency
     and robustness analyses.
 
@@ -129,12 +309,16 @@ def perform_analysis(args, system, chains, performance_eval=False):
     :param system: pyCPA System object
     :param chains: TORO extEffectChain object
     :param performance_eval: bool
+    :param stream: io.ResultsStream object, the results of each chain are appended as soon as the chain has been analysed.
+                   Chains whose results are stored in the stream already are not analysed again.
+    :param time_base: model_parser.TimeBase object, the system has been normalised to this time base.
+                      The results are converted back to the time base of the model.
     :rtype: SystemAnalysisResults object
     """
 
     # use pycpa to calculate response times of all tasks
     if (args.wcrt is True):
-        task_results = calculate_wcrt(system)
+        task_results = calculate_wcrt(system, jobs=getattr(args, 'jobs', 1), cache=get_results_cache(getattr(args, 'cache', None)))
 
     # check for implicit deadline violations
     if (check_task_deadlines(system) != 0) and (performance_eval is False):
@@ -152,19 +336,52 @@ def perform_analysis(args, system, chains, performance_eval=False):
         slack = list()   
         
 
-        for chain in chains:
+        # calculate only robustness margins and delta let values of a chain
+        args_tmp = argsDummy(lat=args.lat, rm=args.rm, plot=args.plot, backend=getattr(args, 'backend', None), cache=getattr(args, 'cache', None),
+                             reduce_roots=getattr(args, 'reduce_roots', False), streaming=getattr(args, 'streaming', False))
+
+        # independent chains can be analysed by a pool of worker processes (not if graphs shall be plotted)
+        jobs = getattr(args, 'jobs', 1)
+        # chains whose results have been stored by a previous (aborted) run are not analysed again
+        pending = [chain for chain in chains if (stream is None) or (not stream.contains(chain.name, stream_fingerprint(chain)))]
+        parallel = (jobs is not None) and (jobs > 1) and (len(pending) > 1) and (args.plot is False)
+        if parallel:
+            semantic_outputs = dict()
+            for chain in pending:
+                # determine chain semantic, the console output is printed along with the chain's results
+                output = StringIO()
+                with contextlib.redirect_stdout(output):
+                    semantic_known = chain.determine_semantic()
+                semantic_outputs[id(chain)] = output.getvalue()
+                if(not semantic_known):
+                    print(output.getvalue(), end='')
+                    quit("Cannot analyze chains with tasks of different semantic!")
+            chain_results = dict(zip([id(chain) for chain in pending], analyse_chains_parallel(pending, args_tmp, jobs, stream=stream)))
+
+        for i in range(len(chains)):
+            chain = chains[i]
             io.PrintOuts.newline()
             io.PrintOuts.doubleline()
             print('Analyzing cause-effect chain: ' + chain.name + "\n" + str([task.name for task in chain.tasks]))
 
-            # determine chain semantic
-            if(not chain.determine_semantic()):
-                quit("Cannot analyze chains with tasks of different semantic!")
+            if (stream is not None) and stream.contains(chain.name, stream_fingerprint(chain)):
+                # the chain semantic is still needed by the following steps (e.g. verification of the margins)
+                if(not chain.determine_semantic()):
+                    quit("Cannot analyze chains with tasks of different semantic!")
+                print("Loading analysis results of cause-effect chain %s from %s." % (chain.name, stream.path))
+                lat, t_lat, rm, dlet, slk = stream.get(chain.name)
+            elif parallel:
+                # results are merged in the order of the chains, print the worker's console output in that order as well
+                output, (lat, t_lat, rm, dlet, slk) = chain_results[id(chain)]
+                print(semantic_outputs[id(chain)] + output, end='')
+            else:
+                # determine chain semantic
+                if(not chain.determine_semantic()):
+                    quit("Cannot analyze chains with tasks of different semantic!")
 
-                
-            # calculate only robustness margins and delta let values of a chain
-            args_tmp = argsDummy(lat=args.lat, rm=args.rm, plot=args.plot)
-            lat, t_lat, rm, dlet, slk = analyse_chain(chain, previousChain=None, args=args_tmp)
+                lat, t_lat, rm, dlet, slk = analyse_chain(chain, previousChain=None, args=args_tmp)
+                if stream is not None:
+                    stream.write(chain.name, lat, t_lat, rm, dlet, slk, fingerprint=stream_fingerprint(chain))
 
             chain_latencies[chain.name] = lat
 
@@ -186,23 +403,39 @@ def perform_analysis(args, system, chains, performance_eval=False):
             robustness_margins, delta_let = calc_min_rm_and_dlet(robustness_margins, delta_let)
             slack = calc_min_slack(slack)
 
+            if (getattr(args, 'exact_rm', False) is True):
+                # replace the closed-form values by the largest increases found by reanalysing the chains
+                robustness_margins, delta_let = calculate_exact_margins(chains, jobs=jobs, backend=getattr(args, 'backend', None))
+
+        # results are reported in the time base of the model, margins are verified in the normalised time base
+        margins = (robustness_margins, delta_let)
+        if time_base is not None:
+            chain_latencies, robustness_margins, delta_let, slack = time_base.to_time((chain_latencies, robustness_margins, delta_let, slack))
+
         # print results to console and TODO write results to csv/model
+        # (values converted from a fractional time base are floats)
         if (args.lat is True):
             io.PrintOuts.newline() 
             io.PrintOuts.doubleline()
             for chain, latency in chain_latencies.items():                
-                print("The maximum end-to-end latency of chain \"%s\" is %d." %(chain, latency))
+                print("The maximum end-to-end latency of chain \"%s\" is %s." %(chain, latency))
         if (args.rm is True):
             io.PrintOuts.line()
             for task, rm in sorted(robustness_margins.items()):
-                print("Robustness margin of task \"%s\" is %d." %(task, rm))
+                print("Robustness margin of task \"%s\" is %s." %(task, rm))
             io.PrintOuts.line() 
             for task, dlet in sorted(delta_let.items()):
-                print("Delta LET of task \"%s\" is %d." %(task, dlet))
+                print("Delta LET of task \"%s\" is %s." %(task, dlet))
 
         # verify, whether the robustness margins actually do not lead to deadline misses
         if (args.test is True):
-            verify_margins(chains, task_results, robustness_margins, delta_let)
+            # exact margins are only valid for one task at a time and are verified separately
+            verify_margins(chains, task_results, margins[0], margins[1], backend=getattr(args, 'backend', None), cache=getattr(args, 'cache', None),
+                           streaming=getattr(args, 'streaming', False), separately=(getattr(args, 'exact_rm', False) is True))
+
+        if (time_base is not None) and (args.wcrt is True):
+            for result in task_results.values():
+                result.wcrt, result.bcrt = time_base.to_time((result.wcrt, result.bcrt))
 
 
         # return final analysis results       
@@ -212,11 +445,16 @@ def perform_analysis(args, system, chains, performance_eval=False):
 
 
 
-def calculate_wcrt(pycpa_system):
+def calculate_wcrt(pycpa_system, jobs=1, cache=None):
     """ calculates the worst-case response times of the task set.
-    If any wcrt are already defined in the processed model, use those values
+    If any wcrt are already defined in the processed model, use those values.
+    Resources are analysed in independent groups (cf. resource_groups()), only groups with unknown
+    response times are analysed by pyCPA (by a pool of worker processes if jobs > 1). The results of
+    each group are cached under the fingerprint of its task set.
 
     :param pycpa_system: pyCPA System object
+    :param jobs: int, number of worker processes
+    :param cache: io.ResultsCache object, persistent cache of response times (None: in-memory cache only)
     :rtype: dict
     """
     io.PrintOuts.newline()
@@ -232,15 +470,15 @@ def calculate_wcrt(pycpa_system):
             task_results[t] = pycpa.analysis.TaskResult()
             t.analysis_results = task_results[t]
     
-    # list of tasks with unknown wcrt
-    unknown = list()
+    # set of tasks with unknown wcrt
+    unknown = set()
     for r in pycpa_system.resources:
         for t in r.tasks:
             # first check whether wcrt and bcrt of a task are already known
             # if there are any let tasks in list of tasks with unknown wcrt, ignore those
             if (t.wcrt is None) and not (t.semantic == Semantic.LET):
                 # wcrt unknown
-                unknown.append(t)
+                unknown.add(t)
             else:                    
                 # bcrt and wcrt known
                 task_results[t].wcrt = t.wcrt    
@@ -251,27 +489,55 @@ def calculate_wcrt(pycpa_system):
     if len(unknown) > 0:
         # some tasks' wcrts are still unknown -> use pycpa to calculate those
 
-        # wcrt calculation only possible, if wcet defined for all tasks!
-        tmp = list()
-        for r in pycpa_system.resources :
-            for t in r.tasks:
-                tmp.append(t)
-                assert (t.wcet is not None), "Tasks with unknown worst case execution time were found in the processed System. The WCET has to be defined for every task. Therefore pyCPA is not able to calculate WCRTs."
+        # only groups of resources with unknown response times are analysed, each group only once
+        groups = [group for group in resource_groups(pycpa_system) if any(t in unknown for r in group for t in r.tasks)]
+
+        # wcrt calculation only possible, if wcet defined for all tasks of the analysed resources!
+        for group in groups:
+            for r in group:
+                for t in r.tasks:
+                    assert (t.wcet is not None), "Tasks with unknown worst case execution time were found in the processed System. The WCET has to be defined for every task. Therefore pyCPA is not able to calculate WCRTs."
+
+        specs = [resources_to_spec(group) for group in groups]
+        keys = [resources_fingerprint(spec) for spec in specs]
+        group_results = dict()
+        missing = OrderedDict()
+        for key, spec in zip(keys, specs):
+            if (key not in group_results) and (key not in missing):
+                group_results[key] = response_times.get(key)
+                if (group_results[key] is None) and (cache is not None):
+                    entry = cache.load(cache.key('wcrt', key))
+                    if entry is not None:
+                        group_results[key] = [[tuple(times) for times in resource] for resource in entry[0]['response_times']]
+                        response_times.put(key, group_results[key])
+                if group_results[key] is None:
+                    missing[key] = spec
 
         try:
-            tmp_results = pycpa.analysis.analyze_system(pycpa_system)
+            if (jobs is not None) and (jobs > 1) and (len(missing) > 1):
+                with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(missing))) as executor:
+                    tmp_results = list(executor.map(analyse_resources_spec, missing.values()))
+            else:
+                tmp_results = [analyse_resources_spec(spec) for spec in missing.values()]
+        except:        
+            assert False, "WCRT-computation with pyCPA failed."
 
-            for r in pycpa_system.resources:
-                for t in r.tasks:
+        for key, results in zip(missing.keys(), tmp_results):
+            group_results[key] = results
+            response_times.put(key, results)
+            if cache is not None:
+                cache.store(cache.key('wcrt', key), {'response_times': results})
+
+        for group, key in zip(groups, keys):
+            for i, r in enumerate(group):
+                for j, t in enumerate(resource_tasks(r)):
                     # only update those result that have been unknown so far
                     if t in unknown:
-                        t.bcrt = tmp_results[t].bcrt
-                        t.wcrt = tmp_results[t].wcrt
+                        t.bcrt, t.wcrt = group_results[key][i][j]
 
-                        task_results[t].wcrt = tmp_results[t].wcrt
-                        task_results[t].bcrt = tmp_results[t].bcrt
-        except:        
-            assert False, "WCRT-computation with pyCPA failed."
+                        task_results[t].wcrt = t.wcrt
+                        task_results[t].bcrt = t.bcrt
+        print("Response times of %d resource groups: %d computed, %d reused" % (len(groups), len(missing), len(groups) - len(missing)))
 
     for task, results in task_results.items():
         print("%s: BCRT=%s,\tWCRT=%s" %(task, str(results.bcrt), str(results.wcrt)))
@@ -281,6 +547,110 @@ def calculate_wcrt(pycpa_system):
 
 
 
+def resource_groups(pycpa_system):
+    """ splits the resources of a system into groups that can be analysed independently:
+    resources are in the same group if a task of one resource activates a task of the other one
+
+    :param pycpa_system: pyCPA System object
+    :rtype: list of lists of pyCPA Resources (sorted by name)
+    """
+    resources = sorted(pycpa_system.resources, key=lambda r: r.name)
+    group = {r: i for i, r in enumerate(resources)}
+
+    def find(i):
+        while group[resources[i]] != i:
+            i = group[resources[i]]
+        return i
+
+    for r in resources:
+        for t in r.tasks:
+            for n in getattr(t, 'next_tasks', list()):
+                if getattr(n, 'resource', None) in group:
+                    i, j = find(group[r]), find(group[n.resource])
+                    group[resources[max(i, j)]] = min(i, j)
+
+    groups = OrderedDict()
+    for i, r in enumerate(resources):
+        groups.setdefault(find(i), list()).append(r)
+    return list(groups.values())
+
+
+def resource_tasks(resource):
+    """ returns the tasks of a resource in the order of its specification (cf. resources_to_spec())
+
+    :param resource: pyCPA Resource
+    :rtype: list of TORO extTasks
+    """
+    return sorted(resource.tasks, key=lambda t: t.name)
+
+
+def resources_to_spec(resources):
+    """ describes a group of resources and their task sets using plain python objects only, so that
+    the response times can be calculated by other processes (cf. chain_to_spec()). Schedulers are
+    pickled, so that configured scheduler objects (e.g. custom priority comparisons) are kept.
+    Tasks are referred to by (resource index, task index) in the group, task names need not be unique.
+
+    :param resources: list of pyCPA Resources
+    :rtype: dict
+    """
+    index = {t: (i, j) for i, r in enumerate(resources) for j, t in enumerate(resource_tasks(r))}
+    specs = list()
+    links = list()
+    for r in resources:
+        tasks = list()
+        for t in resource_tasks(r):
+            em = t.in_event_model
+            tasks.append({'name': t.name,
+                          'bcet': t.bcet,
+                          'wcet': t.wcet,
+                          'scheduling_parameter': t.scheduling_parameter,
+                          'semantic': t.semantic,
+                          'period': em.P,
+                          'jitter': getattr(em, 'J', 0),
+                          'dmin': getattr(em, 'dmin', 0),
+                          'phi': getattr(em, 'phi', None)})
+            links += [(index[t], index[n]) for n in getattr(t, 'next_tasks', list()) if n in index]
+        specs.append({'name': r.name, 'scheduler': dill.dumps(r.scheduler), 'tasks': tasks})
+
+    return {'resources': specs, 'links': sorted(links)}
+
+
+def resources_fingerprint(spec):
+    """ returns a content fingerprint of a group of resources, based on all parameters the response times depend on
+
+    :param spec: dict, cf. resources_to_spec()
+    :rtype: tuple
+    """
+    resources = tuple((r['name'], r['scheduler'], tuple((t['name'], t['bcet'], t['wcet'], t['scheduling_parameter'], t['semantic'],
+                                                         t['period'], t['jitter'], t['dmin'], t['phi']) for t in r['tasks']))
+                      for r in spec['resources'])
+    return (resources, tuple(spec['links']))
+
+
+def analyse_resources_spec(spec):
+    """ recreates a group of resources from its specification and calculates the response times of all its tasks using pyCPA
+
+    :param spec: dict, cf. resources_to_spec()
+    :rtype: list (resources) of lists (tasks, in the order of the specification) of tuples (bcrt, wcrt)
+    """
+    system = pycpa.model.System()
+    tasks = list()
+    for r in spec['resources']:
+        resource = system.bind_resource(pycpa.model.Resource(r['name'], dill.loads(r['scheduler'])))
+        tasks.append(list())
+        for t in r['tasks']:
+            task = model.extTask(t['name'], 0, t['bcet'], t['wcet'], t['scheduling_parameter'], t['semantic'])
+            task.in_event_model = pycpa.model.PJdEventModel(P=t['period'], J=t['jitter'], dmin=t['dmin'], phi=t['phi'])
+            tasks[-1].append(resource.bind_task(task))
+    for (i, j), (k, l) in spec['links']:
+        tasks[i][j].link_dependent_task(tasks[k][l])
+
+    results = pycpa.analysis.analyze_system(system)
+    return [[(results[task].bcrt, results[task].wcrt) for task in resource] for resource in tasks]
+
+
+
+
 # TODO change do use the arbitrary deadline attribute of TORO extTasks
 def check_task_deadlines(pycpa_system):
     """ check whether all tasks satisfy their deadline constraints
@@ -330,8 +700,6 @@ def analyse_chain(chain, previousChain, args):
     :param prev_chain: TORO extEffectChain object
     :param args: argparse arguments
     """
-    global analyses
-
     io.PrintOuts.line()
     print('Analyzing subchain: ' + chain.name + "\n" + str([task.name for task in chain.tasks]))
 
@@ -348,53 +716,324 @@ def analyse_chain(chain, previousChain, args):
         # initialize graph in preparation for plotting the reachability graph later
         visualize = True
 
-    if chain not in analyses.keys():
-        # the (sub)chain has not been processed yet:
-        if (chain_type in [Semantic.BET, Semantic.LET]):
-            analysis = toro_analysis_BET_LET.ChainAnalysis(chain, vis=visualize)
-        elif (chain_type == Semantic.EVENT_TRIGGERED):
-            raise NotImplementedError("The analysis of %s cause-effect-chains has not been implemented yet!" % chain_type)
-        elif (chain_type == Semantic.SPORADIC):
-            raise NotImplementedError("The analysis of %s cause-effect-chains has not been implemented yet!" % chain_type)
-        else:
+    backend = getattr(args, 'backend', None)
+
+    # representative root jobs are sufficient for the latency analysis, but not for calculating robustness margins
+    reduce_roots = (getattr(args, 'reduce_roots', False) is True) and (args.rm is False)
+
+    cache = get_results_cache(getattr(args, 'cache', None))
+    if (cache is not None) and (visualize is False):
+        # an equivalent chain may have been analysed using the same options by a previous run
+        results_key = cache.key('results', chain_fingerprint(chain), args.lat, args.rm)
+        entry = cache.load(results_key)
+        if entry is not None:
+            print("Loading cached analysis results of cause-effect chain %s." % chain.name)
+            results = entry[0]
+            return results['e2e_lat'], results['t_lat'], results['robustness_margins'], results['delta_let'], results['task_slack']
+
+    if (getattr(args, 'streaming', False) is True) and (visualize is False):
+        # analyse the chain line by line without building the data propagation graph
+        if (chain_type not in [Semantic.BET, Semantic.LET]):
             raise NotImplementedError("The analysis of %s cause-effect-chains has not been implemented yet!" % chain_type)
-        
-        # store analysis object used for a (sub)chain for later use
-        analyses[chain] = analysis
+        analysis = None
 
-        # build the reachability graph
-        analysis.build_graph()
+        if (args.lat is True):
+            print("Calculating maximum end-to-end latencies of cause-effect chains.")
+        if (args.rm is True):
+            print("Calculating robustness margins of cause-effect chain %s." % chain.name)
+        lat, margins = toro_analysis_BET_LET.ChainAnalysis(chain, reduce_roots=reduce_roots).stream_analysis(margins=args.rm)
+
+        if (args.lat is True):
+            e2e_lat = lat
+        if (args.rm is True):
+            robustness_margins, delta_let, task_slack = margins
     else:
-        # load already exisiting analyses object for that (sub)chain with an already built data propagation graph
-        analysis = analyses[chain]
+        analysis = analyses.get(chain, backend=backend, vis=visualize, reduce_roots=reduce_roots)
+
+        if analysis is None:
+            # the (sub)chain (or an equivalent one) has not been processed yet:
+            if (chain_type in [Semantic.BET, Semantic.LET]):
+                analysis = toro_analysis_BET_LET.ChainAnalysis(chain, vis=visualize, backend=backend, reduce_roots=reduce_roots)
+            elif (chain_type == Semantic.EVENT_TRIGGERED):
+                raise NotImplementedError("The analysis of %s cause-effect-chains has not been implemented yet!" % chain_type)
+            elif (chain_type == Semantic.SPORADIC):
+                raise NotImplementedError("The analysis of %s cause-effect-chains has not been implemented yet!" % chain_type)
+            else:
+                raise NotImplementedError("The analysis of %s cause-effect-chains has not been implemented yet!" % chain_type)
+        
+            # build the reachability graph (restore data paths from the on-disk cache if possible)
+            analysis.build_graph(graph_data=load_cached_graph(cache, chain, reduce_roots) if (visualize is False) else None)
+
+            # store analysis object used for a (sub)chain for later use
+            analyses.put(chain, analysis, backend=backend, vis=visualize, reduce_roots=reduce_roots)
+        # else: already exisiting analyses object for that (sub)chain with an already built data propagation graph is used
     
-    # for all instances:
-    if (args.lat is True): # TODO: and chain.transition_latency is None possible as well!
-        # option 1: execute e2e latency analysis
-        print("Calculating maximum end-to-end latencies of cause-effect chains.")
-        e2e_lat = analysis.calculate_e2e_lat(print_all=False)
+        # for all instances:
+        if (args.lat is True): # TODO: and chain.transition_latency is None possible as well!
+            # option 1: execute e2e latency analysis
+            print("Calculating maximum end-to-end latencies of cause-effect chains.")
+            e2e_lat = analysis.calculate_e2e_lat(print_all=False)
 
-    if (args.rm is True):
-        # option 2: calculate robustness margins/delta let
-        print("Calculating robustness margins of cause-effect chain %s." % chain.name)
-        robustness_margins, delta_let, task_slack = analysis.calculate_robustness_margins()
+        if (args.rm is True):
+            # option 2: calculate robustness margins/delta let
+            print("Calculating robustness margins of cause-effect chain %s." % chain.name)
+            robustness_margins, delta_let, task_slack = analysis.calculate_robustness_margins()
+
+        if (args.plot is True):
+            # TODO only very basic plotting function that does not scale well, update/rewrite for better plots
+            analysis.plot('drawIntervals')
 
-    if (args.plot is True):
-        # TODO only very basic plotting function that does not scale well, update/rewrite for better plots
-        analysis.plot('drawIntervals')
+    if (cache is not None) and (visualize is False):
+        # store graph and results for later runs
+        if analysis is not None:
+            store_cached_graph(cache, chain, analysis, reduce_roots)
+        cache.store(results_key, {'e2e_lat': e2e_lat, 't_lat': t_lat, 'robustness_margins': robustness_margins, 
+                                  'delta_let': delta_let, 'task_slack': task_slack})
 
     return e2e_lat, t_lat, robustness_margins, delta_let, task_slack
 
 
 
 
-def verify_margins(chains, task_results, robustness_margins, delta_let):
+def get_results_cache(directory):
+    """ returns the persistent on-disk cache stored in a directory
+
+    :param directory: string, path of the cache directory or None (no cache)
+    :rtype: io.ResultsCache object or None
+    """
+    if directory is None:
+        return None
+    if directory not in results_caches.keys():
+        results_caches[directory] = io.ResultsCache(directory)
+    return results_caches[directory]
+
+
+def load_cached_graph(cache, chain, reduce_roots=False):
+    """ loads the (memory-mapped) data propagation graph of a chain from the on-disk cache
+
+    :param cache: io.ResultsCache object or None
+    :param chain: TORO extEffectChain
+    :param reduce_roots: bool, graph only contains representative root jobs
+    :rtype: dict of np.ndarray or None
+    """
+    if cache is None:
+        return None
+    entry = cache.load(cache.key('graph', chain_fingerprint(chain), reduce_roots))
+    if entry is None:
+        return None
+    return entry[1]
+
+
+def store_cached_graph(cache, chain, analysis, reduce_roots=False):
+    """ stores the data propagation graph of a chain in the on-disk cache, if it has not been stored yet
+
+    :param cache: io.ResultsCache object
+    :param chain: TORO extEffectChain
+    :param analysis: ChainAnalysis object with an already built graph
+    :param reduce_roots: bool, graph only contains representative root jobs
+    """
+    key = cache.key('graph', chain_fingerprint(chain), reduce_roots)
+    if not cache.contains(key):
+        cache.store(key, dict(), analysis.get_graph_data())
+
+
+
+
+def analyse_chains_parallel(chains, args, jobs, stream=None):
+    """ analyses independent cause-effect chains using a pool of worker processes.
+    Chains are handed to the workers as picklable chain specifications (cf. chain_to_spec()).
+    The console output of each worker is captured and returned along with the results,
+    both in the order of the chains.
+
+    :param chains: list of TORO extEffectChains
+    :param args: argsDummy object (analysis options)
+    :param jobs: int, number of worker processes
+    :param stream: io.ResultsStream object, results are appended (in the order of the chains) as soon as they are available
+    :rtype: list of tuples (string, analyse_chain() results)
+    """
+    specs = [chain_to_spec(chain) for chain in chains]
+    chunksize = max(1, len(specs) // (4 * jobs))
+    if stream is not None:
+        # smaller chunks, so that finished results are not held back by the workers for too long
+        chunksize = max(1, min(chunksize, 16))
+
+    chain_results = list()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        for chain, results in zip(chains, executor.map(analyse_chain_spec, specs, [args] * len(specs), chunksize=chunksize)):
+            if stream is not None:
+                stream.write(chain.name, *results[1], fingerprint=stream_fingerprint(chain))
+            chain_results.append(results)
+    return chain_results
+
+
+
+
+def analyse_chain_spec(spec, args):
+    """ analyses a cause-effect chain given by its specification, executed by worker processes
+
+    :param spec: dict, cf. chain_to_spec()
+    :param args: argsDummy object (analysis options)
+    :rtype: tuple (string, analyse_chain() results)
+    """
+    chain = chain_from_spec(spec)
+
+    output = StringIO()
+    with contextlib.redirect_stdout(output):
+        results = analyse_chain(chain, previousChain=None, args=args)
+
+    return output.getvalue(), results
+
+
+
+
+def calculate_exact_margins(chains, jobs=1, backend=None):
+    """ determines the exact robustness margin and delta let value of each task by binary search, 
+    cf. ChainAnalysis.exact_margins(). The margins of the chains are determined by a pool of 
+    worker processes if jobs > 1, the value of a task is the min. value of all chains it is part of.
+
+    :param chains: list of TORO extEffectChains
+    :param jobs: int, number of worker processes
+    :param backend: string, graph backend
+    :rtype: dict, dict
+    """
+    io.PrintOuts.line()
+    print("Calculating exact robustness margins and delta let values.")
+
+    if (jobs is not None) and (jobs > 1) and (len(chains) > 1):
+        specs = [chain_to_spec(chain) for chain in chains]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            margins = list(executor.map(exact_margins_spec, specs, [backend] * len(specs)))
+    else:
+        margins = list()
+        for chain in chains:
+            analysis = analyses.get(chain, backend=backend)
+            if analysis is None:
+                # the graph is built by the first probe
+                analysis = toro_analysis_BET_LET.ChainAnalysis(chain, backend=backend)
+                margins.append(analysis.exact_margins())
+                analyses.put(chain, analysis, backend=backend)
+            else:
+                margins.append(analysis.exact_margins())
+            
+    return calc_min_rm_and_dlet([rm for rm, _ in margins], [dlet for _, dlet in margins])
+
+
+
+
+def exact_margins_spec(spec, backend):
+    """ determines the exact robustness margins of a cause-effect chain given by its specification, 
+    executed by worker processes
+
+    :param spec: dict, cf. chain_to_spec()
+    :param backend: string, graph backend
+    :rtype: dict, dict
+    """
+    chain = chain_from_spec(spec)
+
+    with contextlib.redirect_stdout(StringIO()):
+        return toro_analysis_BET_LET.ChainAnalysis(chain, backend=backend).exact_margins()
+
+
+
+
+def chain_to_spec(chain):
+    """ describes a cause-effect chain using plain python objects only, so that it can be
+    sent to other processes without the pyCPA system (resources, event models, ...) it is part of
+
+    :param chain: TORO extEffectChain
+    :rtype: dict
+    """
+    tasks = list()
+    for task in chain.tasks:
+        tasks.append({'name': task.name,
+                      'release_offset': task.release_offset,
+                      'bcet': task.bcet,
+                      'wcet': task.wcet,
+                      'scheduling_parameter': task.scheduling_parameter,
+                      'semantic': task.semantic,
+                      'let': task.let,
+                      'wcrt': task.wcrt,
+                      'bcrt': task.bcrt,
+                      'deadline': task.deadline,
+                      'period': task.in_event_model.P,
+                      'sl_ic_task': getattr(task, 'sl_ic_task', False)})
+
+    return {'name': chain.name,
+            'tasks': tasks,
+            'e2e_deadline': chain.e2e_deadline,
+            'semantic': getattr(chain, 'semantic', None),
+            'subchain': hasattr(chain, 'transition_deadline'),
+            'transition_deadline': getattr(chain, 'transition_deadline', None)}
+
+
+
+
+def chain_fingerprint(chain):
+    """ returns a content fingerprint of a cause-effect chain, based on all chain and task parameters 
+    (in the order of the chain's tasks) the chain analysis depends on
+
+    :param chain: TORO extEffectChain
+    :rtype: tuple
+    """
+    spec = chain_to_spec(chain)
+    tasks = tuple((t['name'], t['period'], t['release_offset'], t['bcet'], t['wcet'], t['wcrt'], t['bcrt'], t['let'],
+                   t['deadline'], t['semantic'], t['sl_ic_task']) for t in spec['tasks'])
+    return (spec['name'], spec['e2e_deadline'], spec['semantic'], spec['subchain'], spec['transition_deadline'], tasks)
+
+
+
+
+def stream_fingerprint(chain):
+    """ returns the fingerprint of a cause-effect chain stored along with its results in a results stream.
+    The chain semantic is left out: it is derived from the task semantics and may not be determined yet
+    when the results of a previous run are looked up.
+
+    :param chain: TORO extEffectChain
+    :rtype: string
+    """
+    fingerprint = chain_fingerprint(chain)
+    return io.ResultsStream.fingerprint(fingerprint[:2] + fingerprint[3:])
+
+
+
+
+def chain_from_spec(spec):
+    """ recreates a cause-effect chain from its specification
+
+    :param spec: dict, cf. chain_to_spec()
+    :rtype: TORO extEffectChain
+    """
+    tasks = list()
+    for t in spec['tasks']:
+        task = model.extTask(t['name'], t['release_offset'], t['bcet'], t['wcet'], t['scheduling_parameter'], t['semantic'],
+                             let=t['let'], wcrt=t['wcrt'], bcrt=t['bcrt'], deadline=t['deadline'])
+        task.in_event_model = pycpa.model.PJdEventModel(P=t['period'])
+        if t['sl_ic_task'] is True:
+            task.sl_ic_task = True
+        tasks.append(task)
+
+    chain = model.extEffectChain(spec['name'], tasks, e2e_deadline=spec['e2e_deadline'], subchain=spec['subchain'])
+    chain.semantic = spec['semantic']
+    if spec['subchain'] is True:
+        chain.transition_deadline = spec['transition_deadline']
+
+    return chain
+
+
+
+
+def verify_margins(chains, task_results, robustness_margins, delta_let, backend=None, cache=None, streaming=False, separately=False):
     """ verifiy whether the robustness margins calculated for all of the system's tasks
     will not violate any CEC deadlines if applied to the CECs' tasks
 
     :param chains: list of TORO extEffectChains
     :param robustness_margins: dict
     :param delta_let: dict
+    :param backend: string, graph backend used if a chain's graph has to be built first
+    :param cache: string, directory of the on-disk cache the graph is restored from if it has to be built first
+    :param streaming: bool, do not build graphs, recalculate latencies line by line instead
+    :param separately: bool, apply the margin of one task at a time (exact margins only hold if all other tasks keep their parameters)
+    :rtype: int, number of margins (or chains) that lead to a deadline miss
     """
     io.PrintOuts.newline()
     io.PrintOuts.doubleline()
@@ -410,8 +1049,36 @@ def verify_margins(chains, task_results, robustness_margins, delta_let):
             continue
 
         print('Chain: ', chain.name)
+
+        analysis = analyses.get(chain, backend=backend)
+        if (analysis is None) and (streaming is True):
+            # the latency is recalculated line by line by test()
+            analysis = toro_analysis_BET_LET.ChainAnalysis(chain)
+        elif analysis is None:
+            # chain has been analysed by a worker process or its analysis has been evicted from the cache, build the graph again
+            analysis = toro_analysis_BET_LET.ChainAnalysis(chain, backend=backend)
+            analysis.build_graph(graph_data=load_cached_graph(get_results_cache(cache), chain))
+            analyses.put(chain, analysis, backend=backend)
             
-        res, chain_latency = analyses[chain].test(robustness_margins, delta_let)
+        if separately is True:
+            for task in chain.tasks:
+                if (task.semantic == Semantic.BET) and (task.name in robustness_margins):
+                    margins = ({task.name: robustness_margins[task.name]}, dict())
+                elif (task.semantic == Semantic.LET) and (task.name in delta_let):
+                    margins = (dict(), {task.name: delta_let[task.name]})
+                else:
+                    continue
+                try:
+                    res, task_latency = analysis.test(*margins)
+                except AssertionError:
+                    res, task_latency = False, None
+                if res is False:
+                    failure_cnt += 1
+                    print("Applying the margin of task %s leads to a deadline miss of chain %s (e2e latency: %s, deadline: %s)"
+                          % (task.name, chain.name, str(task_latency), str(chain.e2e_deadline)))
+            continue
+
+        res, chain_latency = analysis.test(robustness_margins, delta_let)
 
         if chain_latency <= chain.e2e_deadline:
             print("Applying robustness margins leads to no deadline miss for chain " + chain.name + "\n\tnew e2e latency: " + str(chain_latency) + " vs deadline: " + str(chain.e2e_deadline) + "\n")
@@ -423,6 +1090,49 @@ def verify_margins(chains, task_results, robustness_margins, delta_let):
     io.PrintOuts.newline()  
     io.PrintOuts.doubleline()
 
+    return failure_cnt
+
+
+
+
+def sweep_grid(axes):
+    """ creates the scenarios of a what-if sweep from a grid of parameter overrides:
+    one scenario for each combination of the values of all axes (cartesian product)
+
+    :param axes: list of (task name, parameter name, list of values)
+    :rtype: list of dicts, task name -> dict (parameter name -> value)
+    """
+    scenarios = list()
+    for values in itertools.product(*[axis[2] for axis in axes]):
+        scenario = dict()
+        for (task_name, parameter, _), value in zip(axes, values):
+            scenario.setdefault(task_name, dict())[parameter] = value
+        scenarios.append(scenario)
+    return scenarios
+
+
+def sweep_chain(chain, scenarios, margins=False, backend=None):
+    """ what-if analysis of a cause-effect chain: determines the max. e2e latency (and the robustness margins)
+    for each scenario, cf. ChainAnalysis.sweep(). The data propagation graph is built only once and shared 
+    with the analyses of equivalent chains.
+
+    :param chain: TORO extEffectChain
+    :param scenarios: list of dicts, task name -> dict (parameter name -> value), cf. sweep_grid()
+    :param margins: bool, calculate robustness margins, delta let values and slack for each scenario as well
+    :param backend: string, graph backend
+    :rtype: list of dicts, one row for each scenario
+    """
+    if (chain.semantic not in [Semantic.BET, Semantic.LET]):
+        raise NotImplementedError("The analysis of %s cause-effect-chains has not been implemented yet!" % chain.semantic)
+
+    analysis = analyses.get(chain, backend=backend)
+    if analysis is None:
+        analysis = toro_analysis_BET_LET.ChainAnalysis(chain, backend=backend)
+        analysis.build_graph()
+        analyses.put(chain, analysis, backend=backend)
+
+    return analysis.sweep(scenarios, margins=margins)
+
 
 
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3.6
+"""
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+-----------
+pytest module: validate that all graph wrappers lead to identical analysis results
+"""
+
+import os
+import sys
+import dill as pickle
+
+sys.path.append(sys.path[0] + "/../libs/")
+
+from toro import system_analysis
+from toro import graph_wrappers
+
+import pytest
+
+## path to current file
+p_file = os.path.dirname(os.path.abspath(__file__))
+
+p_test_data = '/testData/csv_topology_test/pickled_combined/'
+p_results = '/testData/csv_topology_test/results/'
+
+
+class argsDummy(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+###########################
+## functional validation ##
+###########################
+
+@pytest.fixture(params = [x for x in sorted(os.listdir(p_file + p_test_data))])
+def test_data(request):
+    """ load test cases """
+    # part one: system and cause-effect chain descriptions
+    file_name_system = p_file + p_test_data + request.param
+    with open(file_name_system, 'rb') as f:
+        sys_tuple = pickle.load(f)
+
+    # part two: results for each system-chain pair
+    res_pickled = request.param.replace("test_n", "").replace(".pkl", "_results.pkl")
+    file_name_results = p_file + p_results + res_pickled
+    with open(file_name_results, 'rb') as f:
+        results = pickle.load(f)
+    yield (sys_tuple, results)
+    # finalizer not needed!
+
+
+@pytest.mark.parametrize('backend', list(graph_wrappers.backends.keys()) + ['auto'])
+def test_wrapper_results(test_data, backend, monkeypatch):
+    """ analyse every topology using each graph wrapper and compare against the reference results """
+    if backend != 'auto' and not graph_wrappers.is_available(backend):
+        pytest.skip("graph backend " + backend + " is not installed")
+    # analysis objects are cached across systems, make sure the graph is built using the wrapper under test
+    monkeypatch.setattr(system_analysis, 'analyses', system_analysis.AnalysisCache())
+
+    args = argsDummy(lat=True, rm=True, wcrt=True, plot=False, test=False, backend=backend)
+
+    system_description = test_data[0]
+    results = test_data[1]
+    new_results = system_analysis.perform_analysis(args, system_description[0], system_description[1])
+
+    assert new_results == results
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3.6
+"""
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+         - Alex Bendrick
+
+Description
+-----------
+pytest module: validate system level analysis features (verification, caches, sweeps, snapshots, result
+streams, time bases, response times of resource groups) against the reference results of the pickled
+topology test systems
+"""
+
+import os
+import sys
+import json
+import dill as pickle
+
+sys.path.append(sys.path[0] + "/../libs/")
+
+import numpy as np
+from pycpa import model as pycpa_model
+from pycpa import schedulers
+
+from toro import model
+from toro import system_analysis
+
+import pytest
+
+## path to current file
+p_file = os.path.dirname(os.path.abspath(__file__))
+
+p_test_data = '/testData/csv_topology_test/pickled_combined/'
+p_results = '/testData/csv_topology_test/results/'
+
+
+class argsDummy(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+###########################
+## functional validation ##
+###########################
+
+@pytest.fixture(params = [x for x in sorted(os.listdir(p_file + p_test_data))])
+def test_data(request, monkeypatch):
+    """ load test cases, each test starts with an empty analysis cache """
+    monkeypatch.setattr(system_analysis, 'analyses', system_analysis.AnalysisCache())
+
+    # part one: system and cause-effect chain descriptions
+    file_name_system = p_file + p_test_data + request.param
+    with open(file_name_system, 'rb') as f:
+        sys_tuple = pickle.load(f)
+
+    # part two: results for each system-chain pair
+    res_pickled = request.param.replace("test_n", "").replace(".pkl", "_results.pkl")
+    file_name_results = p_file + p_results + res_pickled
+    with open(file_name_results, 'rb') as f:
+        results = pickle.load(f)
+    yield (sys_tuple, results)
+
+
+def analyse(test_data, **options):
+    """ analyses the system of a test case, options override the default analysis arguments """
+    args = argsDummy(**dict(dict(lat=True, rm=True, wcrt=True, plot=False, test=False), **options))
+    system_description = test_data[0]
+    return system_analysis.perform_analysis(args, system_description[0], system_description[1])
+
+
+def test_incremental_verification(test_data):
+    """ verifying robustness margins incrementally and by rebuilding the data propagation graphs leads to identical latencies """
+    results = analyse(test_data)
+
+    for chain in test_data[0][1]:
+        analysis = system_analysis.analyses.get(chain)
+        if (analysis is None) or (chain.e2e_deadline is None):
+            continue
+        # the incremental verification leaves the analysis untouched and is performed first
+        incremental = analysis.test(results.robustness_margins, results.delta_let, incremental=True)
+        rebuilt = analysis.test(results.robustness_margins, results.delta_let, incremental=False)
+        assert incremental == rebuilt
+
+
+def test_analysis_cache(test_data):
+    """ analyses of equivalent chains are shared, the least recently used analyses are evicted """
+    # the fixture provides an empty cache
+    cache = system_analysis.analyses
+    cache.maxsize = 1
+
+    chains = test_data[0][1]
+    analyse(test_data, rm=False)
+
+    assert len(cache) == 1
+    assert cache.evictions == cache.misses - 1
+    assert cache.jobs == cache.get(chains[-1]).get_job_count()
+
+    # a copy of the chain has the same fingerprint and hits the cache
+    chain = pickle.loads(pickle.dumps(chains[-1]))
+    hits = cache.hits
+    assert cache.get(chain) is not None
+    assert cache.hits == hits + 1
+
+    # a chain with different parameters does not
+    chain.tasks[0].release_offset += 1
+    assert cache.get(chain) is None
+
+
+def test_results_cache(test_data, tmp_path, monkeypatch):
+    """ results loaded from the on-disk cache and analyses of graphs restored from the cache match the reference results """
+    cache_dir = str(tmp_path)
+    system_description = test_data[0]
+    results = test_data[1]
+
+    # first run: results and graphs are stored, second run: all results are loaded (not from memory)
+    for run in range(2):
+        monkeypatch.setattr(system_analysis, 'analyses', system_analysis.AnalysisCache())
+        monkeypatch.setattr(system_analysis, 'results_caches', dict())
+        assert analyse(test_data, test=True, cache=cache_dir) == results
+
+    cache = system_analysis.get_results_cache(cache_dir)
+    assert cache.misses == 0
+    assert cache.hits > 0
+
+    # only restore the graphs: the results of the restored graphs are calculated again
+    for chain in system_description[1]:
+        analysis = system_analysis.toro_analysis_BET_LET.ChainAnalysis(chain)
+        analysis.build_graph(graph_data=system_analysis.load_cached_graph(cache, chain))
+        reference = system_analysis.toro_analysis_BET_LET.ChainAnalysis(chain)
+        reference.build_graph()
+
+        assert analysis.calculate_e2e_lat() == reference.calculate_e2e_lat()
+        assert analysis.calculate_robustness_margins() == reference.calculate_robustness_margins()
+
+
+def test_reduced_roots(test_data):
+    """ analysing representative root jobs only leads to the reference latencies """
+    assert analyse(test_data, rm=False, reduce_roots=True).chain_latencies == test_data[1].chain_latencies
+
+
+def test_streaming_analysis(test_data):
+    """ analysing the chains line by line without building graphs leads to the reference results """
+    assert analyse(test_data, test=True, streaming=True) == test_data[1]
+    # no graph has been built
+    assert len(system_analysis.analyses) == 0
+
+
+def test_sweep(test_data):
+    """ the latencies and margins of a what-if sweep match the results of analysing each scenario separately """
+    analyse(test_data, rm=False)
+
+    for chain in test_data[0][1]:
+        first, last = chain.tasks[0], chain.tasks[-1]
+        axes = [(first.name, 'release_offset', [0, first.in_event_model.P // 2])]
+        if last.semantic == system_analysis.Semantic.LET:
+            axes.append((last.name, 'let', [last.let, last.in_event_model.P]))
+        else:
+            axes.append((last.name, 'wcrt', [last.wcrt, last.wcrt + 1]))
+        scenarios = system_analysis.sweep_grid(axes)
+        assert len(scenarios) == 4
+
+        table = system_analysis.sweep_chain(chain, scenarios, margins=True)
+
+        for scenario, row in zip(scenarios, table):
+            modified = pickle.loads(pickle.dumps(chain))
+            for task in modified.tasks:
+                for parameter, value in scenario.get(task.name, dict()).items():
+                    setattr(task, parameter, value)
+            reference = system_analysis.toro_analysis_BET_LET.ChainAnalysis(modified)
+            reference.build_graph()
+
+            assert row['scenario'] == scenario
+            if row['deadline_met'] is False:
+                # the sweep reports deadline violations instead of aborting the analysis
+                with pytest.raises(AssertionError):
+                    reference.calculate_e2e_lat()
+                continue
+            assert row['latency'] == reference.calculate_e2e_lat()
+            assert (row['robustness_margins'], row['delta_let'], row['slack']) == reference.calculate_robustness_margins()
+
+        # the task parameters of the chain are restored after the sweep
+        assert system_analysis.analyses.get(chain).calculate_e2e_lat() == system_analysis.toro_analysis_BET_LET.ChainAnalysis(chain).stream_analysis(margins=False)[0]
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_exact_margins(test_data, jobs):
+    """ exact robustness margins are at least as large as the closed-form values and do not violate 
+    any deadline if applied to a single task """
+    system_description = test_data[0]
+    results = test_data[1]
+    new_results = analyse(test_data, exact_rm=True, jobs=jobs)
+
+    assert new_results.chain_latencies == results.chain_latencies
+    for task_name, rm in results.robustness_margins.items():
+        assert new_results.robustness_margins[task_name] >= rm
+    for task_name, dlet in results.delta_let.items():
+        assert new_results.delta_let[task_name] >= dlet
+
+    for chain in system_description[1]:
+        analysis = system_analysis.analyses.get(chain)
+        if analysis is None:
+            analysis = system_analysis.toro_analysis_BET_LET.ChainAnalysis(chain)
+        for task in chain.tasks:
+            if task.semantic == system_analysis.Semantic.BET:
+                assert analysis.test({task.name: new_results.robustness_margins[task.name]})[0] is True
+            else:
+                assert analysis.test(dict(), {task.name: new_results.delta_let[task.name]})[0] is True
+
+    # the verification (--test) applies exact margins one task at a time
+    assert system_analysis.verify_margins(system_description[1], None, new_results.robustness_margins,
+                                          new_results.delta_let, separately=True) == 0
+
+
+def test_system_snapshot(test_data, tmp_path):
+    """ systems restored from snapshots lead to the reference results, chains can be restored without the system """
+    system_description = test_data[0]
+    results = test_data[1]
+    path = str(tmp_path / 'snapshot')
+    system_analysis.io.SystemSnapshot.store(path, system_description[0], system_description[1])
+
+    snapshot = system_analysis.io.SystemSnapshot(path)
+    assert snapshot.chain_names() == [chain.name for chain in system_description[1]]
+    for chain in system_description[1]:
+        assert system_analysis.chain_fingerprint(snapshot.chain(chain.name)) == system_analysis.chain_fingerprint(chain)
+
+    system, chains = system_analysis.io.SystemSnapshot(path).load()
+    assert sorted(r.name for r in system.resources) == sorted(r.name for r in system_description[0].resources)
+
+    args = argsDummy(lat=True, rm=True, wcrt=True, plot=False, test=False)
+    assert system_analysis.perform_analysis(args, system, chains) == results
+
+
+def test_snapshot_columns(tmp_path):
+    """ float time values are stored in float64 columns, event model offsets are kept, 
+    only PJd event models can be stored """
+    system = pycpa_model.System("snapshot_columns")
+    resource = system.bind_resource(pycpa_model.Resource("R1", schedulers.SPPScheduler()))
+    t1 = resource.bind_task(model.extTask("BET_T1", 0, 0.75, 1.5, 1, model.Semantic.BET))
+    t1.in_event_model = pycpa_model.PJdEventModel(P=10, phi=3)
+    t2 = resource.bind_task(model.extTask("BET_T2", 1, 2, 3, 2, model.Semantic.BET))
+    t2.in_event_model = pycpa_model.PJdEventModel(P=20)
+    chain = model.extEffectChain("c1", [t1, t2], e2e_deadline=50)
+
+    path = str(tmp_path / 'snapshot')
+    system_analysis.io.SystemSnapshot.store(path, system, [chain])
+    assert np.load(os.path.join(path, 'task_wcet.npy')).dtype == np.float64
+    assert np.load(os.path.join(path, 'task_em_P.npy')).dtype == np.int64
+    with open(os.path.join(path, 'snapshot.json')) as f:
+        assert json.load(f)['irregular'] == dict()
+
+    tasks = {t.name: t for t in system_analysis.io.SystemSnapshot(path).chain('c1').tasks}
+    assert (tasks['BET_T1'].bcet, tasks['BET_T1'].wcet, tasks['BET_T2'].wcet) == (0.75, 1.5, 3)
+    assert (tasks['BET_T1'].in_event_model.P, tasks['BET_T1'].in_event_model.phi) == (10, 3)
+
+    class OtherEventModel(pycpa_model.EventModel):
+        pass
+
+    t2.in_event_model = OtherEventModel()
+    with pytest.raises(AssertionError):
+        system_analysis.io.SystemSnapshot.store(path, system, [chain])
+
+
+@pytest.mark.parametrize('format', ['ndjson', 'csv'])
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_results_stream(test_data, format, jobs, tmp_path):
+    """ results streamed chain by chain and results of resumed (aborted) analyses match the reference results,
+    results of chains that have changed since are not reused """
+    args = argsDummy(lat=True, rm=True, wcrt=True, plot=False, test=False, jobs=jobs)
+
+    system_description = test_data[0]
+    results = test_data[1]
+    chains = system_description[1]
+    path = str(tmp_path / ('chain_results_stream.' + format))
+
+    with system_analysis.io.ResultsStream(path) as stream:
+        assert system_analysis.perform_analysis(args, system_description[0], chains, stream=stream) == results
+    with open(path) as f:
+        lines = f.readlines()
+    header = 1 if format == 'csv' else 0
+    assert len(lines) == header + len(chains)
+
+    # abort after half of the chains, in the middle of writing a record
+    done = len(chains) // 2
+    with open(path, 'w') as f:
+        f.writelines(lines[:header + done])
+        f.write(lines[header + done][:5])
+
+    with system_analysis.io.ResultsStream(path, resume=True) as stream:
+        assert len(stream.records) == done
+        assert system_analysis.perform_analysis(args, system_description[0], chains, stream=stream) == results
+
+    with system_analysis.io.ResultsStream(path, resume=True) as stream:
+        assert sorted(stream.records.keys()) == sorted(chain.name for chain in chains)
+        for chain in chains:
+            assert stream.get(chain.name)[0] == results.chain_latencies[chain.name]
+
+    # a modified chain is analysed again, its new results replace the stored ones
+    chain = chains[0]
+    fingerprint = system_analysis.stream_fingerprint(chain)
+    chain.e2e_deadline = (chain.e2e_deadline or 0) + 1
+    with system_analysis.io.ResultsStream(path, resume=True) as stream:
+        assert stream.contains(chain.name)
+        assert not stream.contains(chain.name, system_analysis.stream_fingerprint(chain))
+        assert all(stream.contains(c.name, system_analysis.stream_fingerprint(c)) for c in chains[1:])
+        system_analysis.perform_analysis(args, system_description[0], chains, stream=stream)
+    with system_analysis.io.ResultsStream(path, resume=True) as stream:
+        assert stream.records[chain.name]['fingerprint'] == system_analysis.stream_fingerprint(chain) != fingerprint
+
+
+def test_time_base(test_data, tmp_path, capsys):
+    """ systems analysed in the normalised time base lead to the reference results (scaled to the time base of the model) """
+    from fractions import Fraction
+    from toro import model_parser
+
+    system, chains = test_data[0]
+    results = test_data[1]
+    tasks = [task for resource in system.resources for task in resource.tasks]
+    reference = {task.name: (task.in_event_model.P, task.release_offset, task.wcet, task.let) for task in tasks}
+    base = model_parser.TimeBase(system, chains).base
+
+    # same system in a time base with 1000 times finer ticks
+    scale = model_parser.TimeBase(system, chains)
+    scale.base, scale.normalized = Fraction(1000), True
+    scale.denormalize()
+
+    time_base = model_parser.TimeBase(system, chains)
+    assert time_base.base == 1000 * base
+    assert time_base.normalize() is True
+    assert all(task.in_event_model.P == reference[task.name][0] * 1000 // time_base.base for task in tasks)
+
+    args = argsDummy(lat=True, rm=True, wcrt=True, plot=False, test=True, jobs=1)
+    path = str(tmp_path / 'chain_results_stream.ndjson')
+    with system_analysis.io.ResultsStream(path, time_base=time_base) as stream:
+        new_results = system_analysis.perform_analysis(args, system, chains, stream=stream, time_base=time_base)
+    assert new_results.chain_latencies == {c: 1000 * l for c, l in results.chain_latencies.items()}
+    assert new_results.robustness_margins == {t: 1000 * m for t, m in results.robustness_margins.items()}
+    assert new_results.delta_let == {t: 1000 * d for t, d in results.delta_let.items()}
+
+    # the stream stores results in the time base of the model
+    with system_analysis.io.ResultsStream(path, resume=True) as stream:
+        assert all(stream.get(c)[0] == l for c, l in new_results.chain_latencies.items())
+
+    time_base.denormalize()
+    assert all((task.in_event_model.P, task.release_offset, task.wcet, task.let) == tuple(None if v is None else 1000 * v for v in reference[task.name])
+               for task in tasks)
+
+    # fractional time base: the system in ticks of 1/3 of the model's time unit, results are exact fractions
+    scale = model_parser.TimeBase(system, chains)
+    scale.base, scale.normalized = Fraction(1, 3000), True
+    scale.denormalize()
+    time_base = model_parser.TimeBase(system, chains)
+    assert time_base.base == base / 3
+    assert time_base.normalize() is True
+    capsys.readouterr()
+    new_results = system_analysis.perform_analysis(args, system, chains, time_base=time_base)
+    output = capsys.readouterr().out
+
+    def fraction(value):
+        value = Fraction(value, 3)
+        return value.numerator if value.denominator == 1 else float(value)
+
+    assert new_results.chain_latencies == {c: fraction(l) for c, l in results.chain_latencies.items()}
+    assert new_results.robustness_margins == {t: fraction(m) for t, m in results.robustness_margins.items()}
+    for c, l in new_results.chain_latencies.items():
+        assert "The maximum end-to-end latency of chain \"%s\" is %s." % (c, str(l)) in output
+    time_base.denormalize()
+
+    # time values that cannot be represented exactly are not rounded, the system is not normalised
+    tasks[0].wcet = 1.0000001
+    time_base = model_parser.TimeBase(system, chains)
+    assert time_base.normalize() is False
+    assert (time_base.normalized, tasks[0].wcet) == (False, 1.0000001)
+
+
+def fake_analyze_system(system):
+    """ stand-in for pycpa.analysis.analyze_system(): response time = sum of the wcets of a resource
+    (times the factor of its scheduler, if any) """
+    results = dict()
+    for r in system.resources:
+        busy = sum(t.wcet for t in r.tasks) * getattr(r.scheduler, 'factor', 1)
+        for t in r.tasks:
+            results[t] = system_analysis.pycpa.analysis.TaskResult()
+            results[t].bcrt, results[t].wcrt = t.bcet, busy
+    return results
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_resource_response_times(test_data, jobs, tmp_path, monkeypatch):
+    """ only resources with unknown response times are analysed, results are cached per task set """
+    monkeypatch.setattr(system_analysis, 'response_times', system_analysis.ResponseTimeCache())
+    monkeypatch.setattr(system_analysis.pycpa.analysis, 'analyze_system', fake_analyze_system)
+
+    system = test_data[0][0]
+    resources = sorted(system.resources, key=lambda r: r.name)
+    unknown = [r for r in resources if any(t.semantic == system_analysis.Semantic.BET for t in r.tasks)][:2]
+    if len(unknown) == 0:
+        pytest.skip("system without BET tasks")
+    known = {t: (t.bcrt, t.wcrt) for r in resources if r not in unknown for t in r.tasks}
+    for r in unknown:
+        for t in r.tasks:
+            if t.wcet is None:
+                t.wcet = t.wcrt if t.wcrt is not None else 1
+
+    def reset():
+        for r in unknown:
+            for t in r.tasks:
+                if t.semantic == system_analysis.Semantic.BET:
+                    t.wcrt, t.bcrt = None, None
+
+    reset()
+    cache = system_analysis.io.ResultsCache(str(tmp_path / 'cache'))
+    task_results = system_analysis.calculate_wcrt(system, jobs=jobs, cache=cache)
+    for r in unknown:
+        for t in r.tasks:
+            if t.semantic == system_analysis.Semantic.BET:
+                assert (t.bcrt, t.wcrt) == (t.bcet, sum(u.wcet for u in r.tasks))
+                assert (task_results[t].bcrt, task_results[t].wcrt) == (t.bcrt, t.wcrt)
+    assert all((t.bcrt, t.wcrt) == times for t, times in known.items())
+    assert len(system_analysis.response_times) == len(unknown)
+    assert cache.stores == len(unknown)
+
+    # cached results are reused, also by other processes (persistent cache)
+    reset()
+    monkeypatch.setattr(system_analysis.pycpa.analysis, 'analyze_system', None)
+    system_analysis.calculate_wcrt(system, jobs=jobs, cache=cache)
+    reset()
+    monkeypatch.setattr(system_analysis, 'response_times', system_analysis.ResponseTimeCache())
+    system_analysis.calculate_wcrt(system, jobs=jobs, cache=cache)
+    assert cache.hits == len(unknown)
+    assert all(t.wcrt == sum(u.wcet for u in r.tasks) for r in unknown for t in r.tasks if t.semantic == system_analysis.Semantic.BET)
+
+
+def test_resource_response_times_config(monkeypatch):
+    """ configured schedulers are kept, tasks with the same name are distinguished, the in-memory cache is bounded """
+    monkeypatch.setattr(system_analysis, 'response_times', system_analysis.ResponseTimeCache(maxsize=2))
+    monkeypatch.setattr(system_analysis.pycpa.analysis, 'analyze_system', fake_analyze_system)
+
+    system = pycpa_model.System("response_times_config")
+    scheduler = schedulers.SPPScheduler()
+    scheduler.factor = 3
+    resource = system.bind_resource(pycpa_model.Resource("R1", scheduler))
+    for wcet in [1, 2]:
+        task = resource.bind_task(model.extTask("BET_T1", 0, wcet, wcet, wcet, model.Semantic.BET))
+        task.in_event_model = pycpa_model.PJdEventModel(P=10)
+
+    system_analysis.calculate_wcrt(system)
+    assert sorted((t.bcrt, t.wcrt) for t in resource.tasks) == [(1, 9), (2, 9)]
+
+    for _ in range(2):
+        for t in resource.tasks:
+            t.wcet, t.wcrt, t.bcrt = t.wcet + 2, None, None
+        system_analysis.calculate_wcrt(system)
+    assert (len(system_analysis.response_times), system_analysis.response_times.evictions) == (2, 1)
@@ -23,6 +23,7 @@ from pycpa import model as pycpaModel
 from pycpa import schedulers as pycpaSchedulers
 from toro import model
 from toro import system_analysis
+from toro import benchmark
 
 Semantic = model.Semantic
 
@@ -79,6 +80,25 @@ def test_perform_analysis(test_data):
     assert new_results == results
 
 
+def test_parallel_analysis():
+    """ analysing the chains of all topologies in worker processes leads to the same results as analysing them one after another """
+    args = argsDummy(lat=True, rm=True, plot=False)
+
+    chains = list()
+    for file_name in sorted(os.listdir(p_file + p_test_data)):
+        with open(p_file + p_test_data + file_name, 'rb') as f:
+            sys_tuple = pickle.load(f)
+        system_analysis.calculate_wcrt(sys_tuple[0])
+        for chain in sys_tuple[1]:
+            assert chain.determine_semantic()
+            chains.append(chain)
+
+    serial = [system_analysis.analyse_chain(chain, previousChain=None, args=args) for chain in chains]
+    parallel = system_analysis.analyse_chains_parallel(chains, args, jobs=2)
+
+    assert [x[1] for x in parallel] == serial
+
+
 n = 100
 # also test random models
 @pytest.fixture(params = [x for x in range(0,n)])
@@ -170,4 +190,81 @@ def test_perform_analysis_rand(test_data_random):
     new_results = system_analysis.perform_analysis(args, system_description, chain_description)
 
     assert len(new_results.chain_latencies) == 1, "No decomposed chains expected here"
-    assert new_results == results
\ No newline at end of file
+    assert new_results == results
+
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_generated_systems(seed, monkeypatch):
+    """ generated systems are reproducible, respect the generator parameters and can be analysed (verified margins) """
+    monkeypatch.setattr(system_analysis, 'analyses', system_analysis.AnalysisCache())
+
+    generator = benchmark.SystemGenerator(resources=3, tasks=6, chains=4, chain_length=4, max_period_ratio=10, let_share=0.5)
+    system, chains = generator.generate(seed)
+    describe = lambda chains: [[(t.name, t.in_event_model.P, t.release_offset, t.wcet, t.wcrt, t.let) for t in c.tasks] for c in chains]
+    assert describe(generator.generate(seed)[1]) == describe(chains)
+
+    for chain in chains:
+        assert 2 <= len(chain.tasks) <= 4
+        assert len(set(t.semantic for t in chain.tasks)) == 1
+        for a, b in zip(chain.tasks, chain.tasks[1:]):
+            assert max(a.in_event_model.P, b.in_event_model.P) <= 10 * min(a.in_event_model.P, b.in_event_model.P)
+    for r in system.resources:
+        for t in r.tasks:
+            assert t.in_event_model.P // 1000 in benchmark.generator.automotive_periods
+            if t.semantic == Semantic.BET:
+                assert t.bcrt == t.bcet <= t.wcet <= t.wcrt <= t.in_event_model.P - t.release_offset
+            else:
+                assert t.let + t.release_offset <= t.in_event_model.P
+
+    args = argsDummy(lat=True, rm=True, wcrt=True, plot=False, test=True)
+    results = system_analysis.perform_analysis(args, system, chains)
+    assert sorted(results.chain_latencies.keys()) == sorted(c.name for c in chains)
+
+
+def test_generator_limits():
+    """ unschedulable task sets are redrawn instead of limiting their response times, chains consist of at least 2 tasks """
+    with pytest.raises(AssertionError):
+        benchmark.SystemGenerator(utilization=1.3)
+
+    generator = benchmark.SystemGenerator(resources=1, tasks=3, utilization=1.0, chains=1, chain_length=2, let_share=0,
+                                          periods={2: 1, 3: 1})
+    system, _ = generator.generate(0)
+    assert all(t.wcrt <= t.in_event_model.P for r in system.resources for t in r.tasks)
+    generator.max_attempts = 1
+    with pytest.raises(ValueError):
+        generator.generate(0)
+
+    # walks that end after the first task are restarted from other tasks
+    generator = benchmark.SystemGenerator(resources=2, tasks=5, chains=3, chain_length=3, max_period_ratio=10)
+    assert all(len(chain.tasks) >= 2 for chain in generator.generate(24)[1])
+
+
+def test_benchmark_suite(tmp_path):
+    """ all backends lead to the same latencies, results are written to JSON and compared to a baseline """
+    import json
+
+    scenarios = {'small': benchmark.SystemGenerator(resources=2, tasks=5, chains=3, chain_length=3, max_period_ratio=5)}
+    suite = benchmark.BenchmarkSuite(scenarios, [0, 1], backends=['NX', 'DAG', 'NP', 'streaming'])
+    results = suite.run()
+
+    assert len(results['systems']) == 2
+    assert len(results['chains']) == 2 * 3 * 4
+    latencies = dict()
+    for record in results['chains']:
+        latencies.setdefault((record['seed'], record['chain']), set()).add(record['latency'])
+        assert record['jobs'] > 0
+        assert set(record['times'].keys()) == ({'stream'} if record['backend'] == 'streaming' else {'graph', 'latency', 'margins'})
+    assert all(len(values) == 1 for values in latencies.values())
+
+    path = str(tmp_path / 'benchmark_results.json')
+    suite.write(path)
+    with open(path) as f:
+        baseline = json.load(f)
+    assert benchmark.BenchmarkSuite.compare(results, baseline) == []
+
+    # slower phases and deviating results are reported
+    baseline['chains'][0]['times']['graph'] = results['chains'][0]['times']['graph'] - 1.0
+    baseline['chains'][1]['latency'] = results['chains'][1]['latency'] + 1
+    regressions = benchmark.BenchmarkSuite.compare(results, baseline)
+    assert len(regressions) == 2
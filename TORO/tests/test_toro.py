@@ -82,6 +82,149 @@ def test_perform_analysis(test_data):
     assert results == new_results
 
 
+@pytest.mark.parametrize('use_case', [
+        ('UseCase1_BETwithWCRTs', 'global', 'BET', 'known', 1),
+        ('UseCase2_BETwithoutWCRTs', 'global', 'BET', 'computable', 2),
+        ('UseCase3_LET', 'global', 'LET', None, 3),
+        ('UseCase8_SL_LET', 'subchain', 'LET', None, 5)
+])
+def test_headless_parsing(use_case, tmp_path, monkeypatch):
+    """ systems are selected and parsed without prompting the user, system properties are 
+    taken from the properties file of each system and from the arguments given for all systems """
+    import shutil
+    from toro import io
+    from toro import model_parser
+
+    def no_prompt(*args):
+        raise AssertionError("The user has been prompted in headless mode")
+    monkeypatch.setattr('builtins.input', no_prompt)
+
+    folder, clock_sync, paradigm, wcrt_knowledge, case = use_case
+    shutil.copytree(p_file + '/../data/csv/' + folder, str(tmp_path / 'csv' / folder))
+    with open(str(tmp_path / 'csv' / folder / 'properties.csv'), 'w') as f:
+        f.write("property;value\nclock_sync;%s\nparadigm;%s\n" % (clock_sync, paradigm))
+        if wcrt_knowledge is not None:
+            f.write("wcrt_knowledge;%s\n" % wcrt_knowledge)
+
+    args = argsDummy(model_type='csv', path=str(tmp_path), headless=True, systems=None, periodic='y', implicit_deadlines='y')
+    dirs = io.FileManagement().get_system_dirs(args)
+    assert [d.split('/')[-1] for d in dirs] == [folder]
+
+    parser = model_parser.CSVParser(args)
+    system, chains = parser.parse(dirs[0])
+    assert parser.case == case
+    assert len(chains) > 0
+
+
+def test_csv_parser_errors(tmp_path, capsys):
+    """ all errors of a system description are reported at once """
+    from toro import model_parser
+
+    with open(str(tmp_path / 'resources.csv'), 'w') as f:
+        f.write("Name;Scheduler\nR1;SPPScheduler\n")
+    with open(str(tmp_path / 'tasks.csv'), 'w') as f:
+        f.write("task_name;period;offset;priority;wcet;resource;bcrt;wcrt;let\n"
+                "BET_T1;10;0;1;2;R1;2;5;n/a\n"
+                "BET_T2;ten;0;2;2;R1;2;5;n/a\n"
+                "BET_T3;10;0;3;2;R2;2;5;n/a\n"
+                "BET_T5;10;0;n/a;2;R1;n/a;n/a;n/a\n"
+                "LET_T6;10;0;6;2;R1;n/a;n/a;n/a\n")
+    with open(str(tmp_path / 'chains.csv'), 'w') as f:
+        f.write("chain_name;e2e_deadline;members\nc1;50;BET_T1;BET_T4\nc2;50;BET_T1\n")
+
+    args = argsDummy(path=str(tmp_path), headless=True, clock_sync='global', paradigm='BET', periodic='y', implicit_deadlines='y', wcrt_knowledge='known')
+    with pytest.raises(SystemExit):
+        model_parser.CSVParser(args).parse(str(tmp_path))
+
+    output = capsys.readouterr().out
+    assert 'Invalid entry "ten" in column period, line 3 of tasks.csv' in output
+    assert 'unknown resource "R2"' in output
+    assert 'Parser cannot find task(s) "BET_T4" in chain: "c1"' in output
+    assert 'Parser found no valid period of task "BET_T2"' in output
+    assert 'Parser found no valid priority of task "BET_T5"' in output
+    assert 'Parser found no valid let of task "LET_T6"' in output
+
+
+def test_amalthea_parser(monkeypatch):
+    """ tasks, resources and chains of an Amalthea model are resolved via the index of the model """
+    from toro.model_parser import amalthea_parser
+
+    # do not plot the system graph
+    monkeypatch.setattr(amalthea_parser.graph, 'graph_system', lambda *args, **kwargs: None)
+
+    parser = amalthea_parser.AmaltheaParser(None, p_file + '/../data/AmaltheaModels/amaltheaModels/model.amxmi')
+    system, chains = parser.parse()
+
+    chains = {chain.name: chain for chain in chains}
+    assert [task.name for task in chains['LETchain1'].tasks] == ['LET_T1', 'LET_T5', 'LET_T7', 'LET_T9']
+    assert [task.name for task in chains['LabelChain1'].tasks] == ['TaskWithLabel5', 'TaskWithLabel3', 'TaskWithLabel4', 'TaskWithLabel2']
+    assert [task.name for task in chains['1111'].tasks] == ['BET_T4', 'BET_T6']
+    assert chains['BETchain1'].e2e_deadline == 50
+
+    tasks = {task.name: task for resource in system.resources for task in resource.tasks}
+    assert (tasks['BET_T2'].scheduling_parameter, tasks['BET_T2'].resource.name) == (2, 'Core2_1')
+    assert (tasks['BET_T3'].bcet, tasks['BET_T3'].wcet, tasks['BET_T3'].deadline) == (3.0, 3.0, 15)
+    assert (tasks['LET_T5'].let, tasks['LET_T5'].in_event_model.P, tasks['LET_T5'].release_offset) == (10, 15, 1)
+    assert tasks['TaskWithLabel1'].semantic == model.Semantic.BET
+
+    schedulers = {r.name: r.scheduler.__class__.__name__ for r in system.resources}
+    assert (schedulers['Core2_0'], schedulers['Core2_1']) == ('SPPScheduler', 'SPNPScheduler')
+
+
+def test_amalthea_execution_times(tmp_path, monkeypatch):
+    """ execution times of runnables shared by tasks on processing units of the same type are calculated once """
+    from toro.model_parser import amalthea_parser
+
+    monkeypatch.setattr(amalthea_parser.graph, 'graph_system', lambda *args, **kwargs: None)
+    file_name = p_file + '/../data/AmaltheaModels/amaltheaModels/example.amxmi'
+    parser = amalthea_parser.AmaltheaParser(None, file_name)
+    system, chains = parser.parse()
+    reference = {t.name: (t.bcet, t.wcet) for r in system.resources for t in r.tasks}
+    assert parser.execution_time_hits == 0
+
+    # LET_T8 (Core1_1) calls the runnable of LET_T7 (Core1_0) instead of its own
+    with open(file_name) as f:
+        model = f.read()
+    with open(str(tmp_path / 'example.amxmi'), 'w') as f:
+        f.write(model.replace('runnable="Runnable2?type=Runnable"', 'runnable="Runnable1?type=Runnable"'))
+    parser = amalthea_parser.AmaltheaParser(None, str(tmp_path / 'example.amxmi'))
+    system, chains = parser.parse()
+    times = {t.name: (t.bcet, t.wcet) for r in system.resources for t in r.tasks}
+
+    assert (parser.execution_time_misses, parser.execution_time_hits) == (3, 1)
+    assert times['LET_T8'] == times['LET_T7'] == reference['LET_T7']
+    assert all(times[name] == reference[name] for name in reference if name != 'LET_T8')
+
+
+def test_amalthea_cache(tmp_path, monkeypatch):
+    """ converted Amalthea systems are loaded from the cache until the model changes """
+    import shutil
+    from toro.model_parser import amalthea_parser
+
+    monkeypatch.setattr(amalthea_parser.graph, 'graph_system', lambda *args, **kwargs: None)
+    file_name = str(tmp_path / 'model.amxmi')
+    shutil.copy(p_file + '/../data/AmaltheaModels/amaltheaModels/model.amxmi', file_name)
+
+    system, chains = amalthea_parser.AmaltheaParser.parse_cached(None, file_name)
+    entries = os.listdir(str(tmp_path / amalthea_parser.cache_folder))
+    assert len(entries) == 1
+
+    # the model is not parsed again
+    with monkeypatch.context() as m:
+        m.setattr(amalthea_parser, 'AmaltheaIndex', None)
+        cached_system, cached_chains = amalthea_parser.AmaltheaParser.parse_cached(None, file_name)
+    assert [system_analysis.chain_fingerprint(c) for c in cached_chains] == [system_analysis.chain_fingerprint(c) for c in chains]
+    assert sorted((r.name, r.scheduler.__class__.__name__) for r in cached_system.resources) == \
+           sorted((r.name, r.scheduler.__class__.__name__) for r in system.resources)
+
+    # a modified model replaces the cached system
+    with open(file_name, 'a') as f:
+        f.write("\n")
+    amalthea_parser.AmaltheaParser.parse_cached(None, file_name)
+    new_entries = os.listdir(str(tmp_path / amalthea_parser.cache_folder))
+    assert len(new_entries) == 1 and new_entries != entries
+
+
 
 
 
@@ -248,7 +391,7 @@ def run_benchmark(chainType, withWCRT=True, useProfiler=False, small=False):
 
 
 if __name__ == "__main__":
-    assert False, "No performance test data in this repo"
+    assert False, "No performance test data in this repo, use toro_benchmark.py (generated systems) instead"
     run_benchmark('simple', withWCRT=True, useProfiler=True, small=True)
 
    
\ No newline at end of file
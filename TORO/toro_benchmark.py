@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Copyright Notice
+================
+Toro
+| Copyright (C) 2021 Institute of Computer and Network Engineering (IDA) at TU BS
+| All rights reserved.
+| See LICENSE file for copyright and license details.
+
+:Authors:
+    - Alex Bendrick
+
+Description
+===========
+This script benchmarks TORO on synthetic systems generated from seeds. One scenario is generated for
+each combination of the given task set sizes and chain lengths, each analysis phase is timed for all
+graph backends. Results are written to a JSON file and optionally compared to the results of a
+previous run (baseline), the script exits with status 1 if any phase has regressed.
+"""
+
+
+import sys
+import json
+import argparse
+
+sys.path.append(sys.path[0] + "/libs/")
+
+from toro import io
+from toro import benchmark
+
+
+
+
+def int_list(value):
+    """ parses a comma-separated list of integers (or a range "first-last")
+
+    :param value: string
+    :rtype: list of ints
+    """
+    if ('-' in value) and (',' not in value):
+        first, last = value.split('-')
+        return list(range(int(first), int(last) + 1))
+    return [int(v) for v in value.split(',')]
+
+
+
+
+##########
+## main ##
+##########
+
+if __name__ == "__main__":
+    bench_parser = argparse.ArgumentParser(description='TORO benchmark suite.')
+    bench_parser.add_argument('--seeds',
+                        type=int_list,
+                        default=[0, 1, 2],
+                        help='seeds of the generated systems, e.g. 0,1,2 or 0-9 (default: 0-2)')
+    bench_parser.add_argument('--resources',
+                        type=int,
+                        default=2,
+                        help='number of resources of each system (default: 2)')
+    bench_parser.add_argument('--tasks',
+                        type=int_list,
+                        default=[10],
+                        help='number(s) of tasks per resource, one scenario per value (default: 10)')
+    bench_parser.add_argument('--utilization',
+                        type=float,
+                        default=0.5,
+                        help='utilization of each resource, at most 1, unschedulable task sets are redrawn (default: 0.5)')
+    bench_parser.add_argument('--chains',
+                        type=int,
+                        default=4,
+                        help='number of cause-effect chains of each system (default: 4)')
+    bench_parser.add_argument('--length',
+                        type=int_list,
+                        default=[4],
+                        help='length(s) of the cause-effect chains, one scenario per value (default: 4)')
+    bench_parser.add_argument('--ratio',
+                        type=int,
+                        default=None,
+                        help='maximum ratio of the periods of consecutive tasks of a chain (default: any ratio)')
+    bench_parser.add_argument('--let',
+                        dest='let_share',
+                        type=float,
+                        default=0.5,
+                        help='share of LET resources and chains, 0: BET only, 1: LET only (default: 0.5)')
+    bench_parser.add_argument('--noOffsets',
+                        dest='offsets',
+                        action='store_false',
+                        help='release all tasks without offsets')
+    bench_parser.add_argument('--computeWCRT',
+                        dest='known_wcrts',
+                        action='store_false',
+                        help='response times of BET tasks are computed by pyCPA instead of the generator')
+    bench_parser.add_argument('--backends',
+                        default=None,
+                        help='comma-separated list of graph backends and/or "streaming" (default: all available backends and streaming)')
+    bench_parser.add_argument('--repetitions',
+                        type=int,
+                        default=3,
+                        help='repetitions of each phase, the fastest run is reported (default: 3)')
+    bench_parser.add_argument('--disableRM',
+                        dest='rm',
+                        action='store_false',
+                        help='do not benchmark the calculation of robustness margins')
+    bench_parser.add_argument('--out',
+                        default='benchmark_results.json',
+                        help='JSON file the results are written to (default: benchmark_results.json)')
+    bench_parser.add_argument('--baseline',
+                        default=None,
+                        help='JSON file with the results of a previous run, regressions are reported')
+    bench_parser.add_argument('--tolerance',
+                        type=float,
+                        default=0.25,
+                        help='relative slowdown of a phase compared to the baseline that is reported as regression (default: 0.25)')
+    bench_args = bench_parser.parse_args()
+
+    io.PrintOuts.banner()
+
+    scenarios = dict()
+    for tasks in bench_args.tasks:
+        for length in bench_args.length:
+            scenarios["r%d_t%d_l%d" % (bench_args.resources, tasks, length)] = benchmark.SystemGenerator(
+                resources=bench_args.resources, tasks=tasks, utilization=bench_args.utilization, chains=bench_args.chains,
+                chain_length=length, max_period_ratio=bench_args.ratio, let_share=bench_args.let_share,
+                offsets=bench_args.offsets, known_wcrts=bench_args.known_wcrts)
+
+    backends = bench_args.backends.split(',') if bench_args.backends is not None else None
+    suite = benchmark.BenchmarkSuite(scenarios, bench_args.seeds, backends=backends, repetitions=bench_args.repetitions,
+                                     margins=bench_args.rm)
+    results = suite.run()
+    suite.write(bench_args.out)
+    print(suite.toString())
+    print("Results written to %s." % bench_args.out)
+
+    if bench_args.baseline is not None:
+        with open(bench_args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = benchmark.BenchmarkSuite.compare(results, baseline, tolerance=bench_args.tolerance)
+        io.PrintOuts.line()
+        for regression in regressions:
+            print("WARNING: regression %s" % regression)
+        print("%d regressions compared to %s." % (len(regressions), bench_args.baseline))
+        if len(regressions) > 0:
+            sys.exit(1)
@@ -22,7 +22,6 @@ console application.
 
 import sys
 import argparse
-# import dill as pickle
 
 sys.path.append(sys.path[0] + "/libs/")
 
@@ -38,10 +37,6 @@ toro_analysis_TT = ChainAnalysis.analysis_LET_BET
 from toro import system_analysis
 
 
-## dict of chain analysis objects for each sub_chain
-analyses = dict()
-
-
 
 
 
@@ -97,6 +92,10 @@ if __name__ == "__main__":
                         dest='rm', 
                         action='store_false',
                         help='disables computation of robustness margins for the given task set')
+    toro_parser.add_argument('--exactRM', 
+                        dest='exact_rm', 
+                        action='store_true',
+                        help='determine exact robustness margins and delta let values by binary search (each margin only holds if all other tasks keep their parameters)')
     toro_parser.add_argument('--test', 
                         dest='test', 
                         action='store_true',
@@ -105,6 +104,82 @@ if __name__ == "__main__":
                         dest='store', 
                         action='store_true',
                         help='write results to csv files')
+    toro_parser.add_argument('--backend', 
+                        dest='backend', 
+                        default='auto',
+                        choices=['auto', 'NX', 'GT', 'DAG', 'NP'],
+                        help='graph backend used for the chain analysis (default: auto, picks the fastest available backend)')
+    toro_parser.add_argument('--jobs', 
+                        dest='jobs', 
+                        type=int,
+                        default=1,
+                        help='number of worker processes used to analyse independent cause-effect chains and to compute the response times of independent resources in parallel (default: 1)')
+    toro_parser.add_argument('--reduceRoots', 
+                        dest='reduce_roots', 
+                        action='store_true',
+                        help='only analyse one representative of each class of equivalent root jobs (reduces the graph size, only used if robustness margins are disabled)')
+    toro_parser.add_argument('--streaming', 
+                        dest='streaming', 
+                        action='store_true',
+                        help='analyse cause-effect chains line by line without building data propagation graphs (peak memory depends on the largest lines of the job matrix instead of the whole graph)')
+    toro_parser.add_argument('--cache', 
+                        dest='cache', 
+                        default=None,
+                        help='directory of a persistent cache of chain analysis results and graphs, only chains that changed since a previous run are analysed again')
+    toro_parser.add_argument('--noModelCache', 
+                        dest='model_cache', 
+                        action='store_false',
+                        help='always parse Amalthea models instead of loading the converted system cached by a previous run')
+    toro_parser.add_argument('--normalizeTime', 
+                        dest='normalize_time', 
+                        action='store_true',
+                        help='analyse systems in the coarsest exact integer time base (all time values divided by their greatest common divisor), results are converted back to the time base of the model')
+    toro_parser.add_argument('--stream', 
+                        dest='stream', 
+                        default=None,
+                        choices=['ndjson', 'csv'],
+                        help='append the results of each cause-effect chain to chain_results_stream.ndjson/.csv (folder of the system) as soon as the chain has been analysed')
+    toro_parser.add_argument('--resume', 
+                        dest='resume', 
+                        action='store_true',
+                        help='resume an aborted analysis: chains whose results are stored in the results stream (--stream) already are not analysed again')
+    toro_parser.add_argument('--headless', 
+                        dest='headless', 
+                        action='store_true',
+                        help='never prompt the user: system properties have to be given by the following arguments or properties files, all systems are analysed unless --systems is given')
+    toro_parser.add_argument('--systems', 
+                        dest='systems', 
+                        default=None,
+                        help='comma-separated list of IDs (as listed, 0: all) or names of the systems to be analysed, replaces the selection prompt')
+    toro_parser.add_argument('--properties', 
+                        dest='properties', 
+                        default=None,
+                        help='csv file of system properties ("property;value" lines) used for all systems without a properties.csv file of their own')
+    toro_parser.add_argument('--clockSync', 
+                        dest='clock_sync', 
+                        default=None,
+                        choices=['global', 'subchain'],
+                        help='system property: clocks of all resources are synchronized (global) or only those of the resources executing a subchain (subchain)')
+    toro_parser.add_argument('--paradigm', 
+                        dest='paradigm', 
+                        default=None,
+                        choices=['LET', 'BET', 'mixed'],
+                        help='system property: programming paradigm of all tasks, mixed: all tasks of a resource follow the same paradigm')
+    toro_parser.add_argument('--periodic', 
+                        dest='periodic', 
+                        action='store_const',
+                        const='y',
+                        help='system property: all tasks are activated periodically')
+    toro_parser.add_argument('--implicitDeadlines', 
+                        dest='implicit_deadlines', 
+                        action='store_const',
+                        const='y',
+                        help='system property: all tasks have implicit deadlines if not specified otherwise')
+    toro_parser.add_argument('--wcrtKnowledge', 
+                        dest='wcrt_knowledge', 
+                        default=None,
+                        choices=['known', 'computable'],
+                        help='system property: WCRTs of all BET tasks are known or can be computed (all tasks, their mapping, schedulers and parameters are specified), answers the property check only (cf. --disableWCRT)')
     toro_args = toro_parser.parse_args()    
     
     io.PrintOuts.banner()
@@ -125,21 +200,22 @@ if __name__ == "__main__":
                 system, chains = parser.parse(d)
                 systems.append((system, chains, d))
 
-                # # dump parsed systems using pickle
+                # # dump parsed systems as snapshots (cf. io.SystemSnapshot)
                 # s = (d.split('/')[3].replace(".", "_"))
-                # file_name = 'test_n'
-                # with open(file_name + str(s) + '.pkl', 'wb') as f:
-                #     pickle.dump((system, chains), f, pickle.HIGHEST_PROTOCOL)
+                # io.SystemSnapshot.store('test_n' + str(s), system, chains)
 
         elif toro_args.model_type == 'amalthea':
             dir = file_manager.get_system_dirs(toro_args)
 
             try:
-                parser = ModelParser.AmaltheaParser(toro_args, dir)
+                if toro_args.model_cache is True:
+                    # converted systems are cached in the cache directory (--cache) or next to the model
+                    system, chains = ModelParser.AmaltheaParser.parse_cached(toro_args, dir, cache_dir=toro_args.cache)
+                else:
+                    system, chains = ModelParser.AmaltheaParser(toro_args, dir).parse()
             except:
-                quit("[ERROR] AmaltheaParser not complete, install Amalthea2PyCPA to use TORO's Amalthea parser.")
-                
-            system, chains = parser.parse()
+                quit("[ERROR] AmaltheaParser not complete or the Amalthea model %s could not be read." % dir)
+
             systems.append((system, chains, dir))
         else:
             raise NotImplementedError("Processing of a model of type %s is not supported! Only \"csv\" and \"amalthea\" will work.")
@@ -151,13 +227,35 @@ if __name__ == "__main__":
 
     # analyse all systems
     for sys_tuple in systems:
-        results = system_analysis.perform_analysis(toro_args, sys_tuple[0], sys_tuple[1])
+        # results are written to the folder of the system
+        if toro_args.model_type == 'amalthea':
+            c = sys_tuple[2].rfind("/")
+            path = sys_tuple[2][0:c]
+        else:
+            path = sys_tuple[2]
+
+        time_base = None
+        if toro_args.normalize_time is True:
+            # exact integer time values (e.g. fractional Amalthea execution times): time values divided by their gcd
+            time_base = ModelParser.TimeBase(sys_tuple[0], sys_tuple[1])
+            if time_base.normalize() is True:
+                print(time_base.toString())
+            else:
+                time_base = None
+
+        if toro_args.stream is not None:
+            # write the results of each chain as soon as it has been analysed
+            with io.ResultsStream(path + '/chain_results_stream.' + toro_args.stream, resume=toro_args.resume, time_base=time_base) as stream:
+                results = system_analysis.perform_analysis(toro_args, sys_tuple[0], sys_tuple[1], stream=stream, time_base=time_base)
+        else:
+            results = system_analysis.perform_analysis(toro_args, sys_tuple[0], sys_tuple[1], time_base=time_base)
+
+        if time_base is not None:
+            time_base.denormalize()
 
         if toro_args.store is True:
             # write result to csv files
-            if toro_args.model_type == 'amalthea':
-                c = sys_tuple[2].rfind("/")
-                path = sys_tuple[2][0:c]
-            else:
-                path = sys_tuple[2]
             results.toCSV(path)   
+
+    if len(systems) > 1:
+        print(system_analysis.analyses.toString())
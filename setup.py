@@ -32,7 +32,7 @@ setup(
     url="https://github.com/IDA-TUBS/TORO",
     license="MIT",
     packages=setuptools.find_packages(),
-    install_requires=['argparse','setuptools', 'dill', 'networkx', 'matplotlib'], # and more
+    install_requires=['argparse','setuptools', 'dill', 'networkx', 'matplotlib', 'numpy'], # and more
     python_requires='>=3.6, <4',
     classifiers=['Programming Language :: Python :: 3.6', 'Operating System :: OS Independent'],
 )
@@ -43,15 +43,11 @@ optional_missing = list()
 try:
     import graph_tool
 except:
-    missing_packages.append('graph_tool')
+    optional_missing.append('graph_tool')
 try:
     import pycpa
 except:
     missing_packages.append('pyCPA')
-try:
-    import Amalthea2PyCPA
-except:
-    optional_missing.append('Amalthea2PyCPA')
 
 if len(optional_missing) > 0:
     print("The following optional packages can to be installed manually: " + str(optional_missing))